@@ -1,5 +1,6 @@
-import tkinter as tk
-from tkinter import scrolledtext, messagebox
+import argparse
+import csv
+import io
 import subprocess
 import threading
 import os
@@ -7,10 +8,28 @@ import re
 import time
 import math
 import statistics
+import random
 import sys
 import shutil
-import urllib.request
 import zipfile
+import concurrent.futures
+import hashlib
+import tempfile
+import json
+import stat
+import zlib
+import struct
+import queue
+import errno
+import signal
+
+# tkinter is imported by load_tk() so the command-line mode starts without it.
+tk = scrolledtext = messagebox = ttk = None
+
+def load_tk():
+    global tk, scrolledtext, messagebox, ttk
+    import tkinter as tk
+    from tkinter import scrolledtext, messagebox, ttk
 
 # --- CONFIGURATION ---
 def get_platform_key():
@@ -49,14 +68,24 @@ WORK_DIR = pick_work_dir()
 os.makedirs(WORK_DIR, exist_ok=True)
 
 LOCAL_COMPILER_DIR = os.path.join(WORK_DIR, "compiler")
+PCH_DIR = os.path.join(LOCAL_COMPILER_DIR, "pch")
+RUNTIME_DIR = os.path.join(LOCAL_COMPILER_DIR, "runtime")
 PROJECTS_DIR = os.path.join(WORK_DIR, "projects")
-TEMP_SOURCE_FILE_CPP = os.path.join(WORK_DIR, "temp_code.cpp")
-TEMP_SOURCE_FILE_C = os.path.join(WORK_DIR, "temp_code.c")
-TEMP_SOURCE_FILE_CPP_RIGHT = os.path.join(WORK_DIR, "temp_code_right.cpp")
-TEMP_SOURCE_FILE_C_RIGHT = os.path.join(WORK_DIR, "temp_code_right.c")
 EXE_SUFFIX = ".exe" if os.name == "nt" else ""
-TEMP_EXE_FILE = os.path.join(WORK_DIR, f"temp_code{EXE_SUFFIX}")
-TEMP_EXE_FILE_RIGHT = os.path.join(WORK_DIR, f"temp_code_right{EXE_SUFFIX}")
+
+def pick_jobs_dir():
+    # Prefer a RAM-backed location for job workspaces, unless it is mounted noexec.
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        try:
+            noexec = bool(os.statvfs(shm).f_flag & getattr(os, "ST_NOEXEC", 0))
+        except OSError:
+            noexec = True
+        if not noexec:
+            return os.path.join(shm, f"AlgoTimerIDE-{os.getuid()}")
+    return os.path.join(WORK_DIR, "jobs")
+
+JOBS_DIR = pick_jobs_dir()
 
 BUNDLED_COMPILER_ZIP_NAMES = {
     "win32": ["w64devkit.zip", "w64devkit-1.20.0.zip"],
@@ -100,8 +129,187 @@ def iter_bundled_compiler_bin_candidates():
             seen.add(path)
             yield path
 
+EXTRACT_MANIFEST_FILE = os.path.join(LOCAL_COMPILER_DIR, ".extract_manifest.json")
+EXTRACT_WORKERS = max(2, min(8, os.cpu_count() or 2))
+EXTRACT_CHUNK_SIZE = 1024 * 1024
+
+def load_extract_manifest():
+    try:
+        with open(EXTRACT_MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def save_extract_manifest(manifest):
+    tmp_path = f"{EXTRACT_MANIFEST_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, EXTRACT_MANIFEST_FILE)
+
+def is_extraction_complete(zip_path=None):
+    manifest = load_extract_manifest()
+    if not manifest or not manifest.get("complete"):
+        return False
+    if zip_path:
+        return manifest.get("zip_stamp") == get_file_stamp(zip_path)
+    return True
+
+def is_partial_extraction_dir(bin_dir):
+    # A bin dir under compiler/ is only usable once its extraction finished.
+    local_root = os.path.abspath(LOCAL_COMPILER_DIR) + os.sep
+    if not os.path.abspath(bin_dir).startswith(local_root):
+        return False
+    manifest = load_extract_manifest()
+    return manifest is not None and not manifest.get("complete")
+
+def safe_extract_path(dest, name):
+    target = os.path.abspath(os.path.join(dest, name))
+    if target != os.path.abspath(dest) and not target.startswith(os.path.abspath(dest) + os.sep):
+        raise ValueError(f"Unsafe path in archive: {name}")
+    return target
+
+def extract_zip_entry(zip_path, info, target, local, opened):
+    if not hasattr(local, "zip"):
+        local.zip = zipfile.ZipFile(zip_path, "r")
+        opened.append(local.zip)
+    mode = (info.external_attr >> 16) & 0xFFFF
+    if stat.S_ISLNK(mode) and os.name != "nt":
+        link = local.zip.read(info).decode("utf-8")
+        if os.path.lexists(target):
+            os.remove(target)
+        os.symlink(link, target)
+        return info.file_size
+
+    part_path = target + ".part"
+    crc = 0
+    with local.zip.open(info, "r") as src, open(part_path, "wb") as dst:
+        while True:
+            chunk = src.read(EXTRACT_CHUNK_SIZE)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            dst.write(chunk)
+    if crc != info.CRC:
+        os.remove(part_path)
+        raise ValueError(f"CRC mismatch for {info.filename}")
+    if mode and os.name != "nt":
+        os.chmod(part_path, stat.S_IMODE(mode))
+    os.replace(part_path, target)
+    return info.file_size
+
+def extract_toolchain_zip(zip_path, dest, on_progress=None):
+    """Extract a toolchain archive across threads, resuming after an interruption.
+
+    Finished entries are recorded (size + CRC32) in EXTRACT_MANIFEST_FILE; a
+    later call skips entries whose file is still on disk with the same size.
+    """
+    zip_stamp = get_file_stamp(zip_path)
+    manifest = load_extract_manifest()
+    if not manifest or manifest.get("zip_stamp") != zip_stamp:
+        manifest = {"zip": os.path.basename(zip_path), "zip_stamp": zip_stamp, "complete": False, "files": {}}
+    if manifest.get("complete"):
+        return manifest
+
+    manifest["complete"] = False
+    os.makedirs(dest, exist_ok=True)
+    save_extract_manifest(manifest)
+    done_files = manifest["files"]
+
+    with zipfile.ZipFile(zip_path, "r") as z:
+        infos = z.infolist()
+
+    pending = []
+    for info in infos:
+        target = safe_extract_path(dest, info.filename)
+        if info.is_dir():
+            os.makedirs(target, exist_ok=True)
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        record = done_files.get(info.filename)
+        if record == [info.file_size, info.CRC] and os.path.lexists(target):
+            if os.path.islink(target) or os.path.getsize(target) == info.file_size:
+                continue
+        pending.append((info, target))
+
+    # Largest entries first keeps the pool busy until the end.
+    pending.sort(key=lambda item: item[0].file_size, reverse=True)
+    total = sum(info.file_size for info, _ in pending)
+    done = 0
+    started = time.time()
+    last_save = started
+    local = threading.local()
+    opened = []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as pool:
+        futures = {
+            pool.submit(extract_zip_entry, zip_path, info, target, local, opened): info
+            for info, target in pending
+        }
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                info = futures[future]
+                done += future.result()
+                done_files[info.filename] = [info.file_size, info.CRC]
+                now = time.time()
+                if now - last_save >= 1.0:
+                    save_extract_manifest(manifest)
+                    last_save = now
+                if on_progress:
+                    on_progress(done, total, now - started)
+        except BaseException:
+            for pending_future in futures:
+                pending_future.cancel()
+            save_extract_manifest(manifest)
+            raise
+        finally:
+            pool.shutdown(wait=True)
+            for handle in opened:
+                handle.close()
+
+    manifest["complete"] = True
+    save_extract_manifest(manifest)
+    return manifest
+
 os.makedirs(PROJECTS_DIR, exist_ok=True)
 BENCHMARK_DEFAULT_RUNS = 10
+COMPLEXITY_DEFAULT_RUNS = 3
+RACE_DEFAULT_RUNS = 3
+BENCHMARK_MODES = ("Serial", "Parallel", "Isolated")
+DEFAULT_BENCHMARK_MODE = "Serial"
+REPEAT_DEFAULT_WARMUP = 2
+REPEAT_DEFAULT_MIN_TIME = 0.2
+ADAPTIVE_DEFAULT_CI = 1.0
+ADAPTIVE_DEFAULT_MIN_RUNS = 5
+ADAPTIVE_DEFAULT_MAX_RUNS = 200
+ADAPTIVE_DEFAULT_BUDGET = 30.0
+JUDGE_DEFAULT_TIME_LIMIT = 2.0
+JUDGE_DEFAULT_MEMORY_MB = 256
+JUDGE_WALL_FACTOR = 2.0
+# Wall-clock cap on each PGO training run when judge mode is off.
+PGO_TRAINING_TIMEOUT = 120.0
+BOOTSTRAP_RESAMPLES = 1000
+BOOTSTRAP_MAX_WORK = 200000
+OUTLIER_IQR_FACTOR = 1.5
+CAPTURE_HEAD_BYTES = 64 * 1024
+CAPTURE_TAIL_BYTES = 64 * 1024
+CAPTURE_CHUNK_BYTES = 64 * 1024
+METRICS_MAGIC = b"IDEM"
+METRICS_VERSION = 1
+METRICS_FILE_NAME = "metrics.bin"
+JOB_WORKERS_DEFAULT = os.cpu_count() or 2
+PREBUILD_DELAY_MS = 1000
+COMPILE_CACHE_DIR = os.path.join(WORK_DIR, "build_cache")
+COMPILE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+COMPILE_CACHE_MAX_ENTRIES = 200
+
+BUILD_PROFILES = {
+    "Debug": ["-O0"],
+    "Release": ["-O2"],
+    "Max": ["-O3", "-march=native"],
+    "LTO": ["-O2", "-flto"],
+}
+DEFAULT_BUILD_PROFILE = "Release"
+COMPILE_HISTORY_LIMIT = 200
 RUN_BUTTON_TEXT = "Run & Measure Algo Time"
 
 THEMES = {
@@ -323,383 +531,465 @@ void dijkstra(int src) {
     },
 }
 
-class AlgoTimerIDE:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("C/C++ Algo IDE (Pure CPU Time)")
-        self.root.geometry("1100x750")
+def hidden_window_kwargs():
+    if os.name == "nt" and hasattr(subprocess, "CREATE_NO_WINDOW"):
+        return {"creationflags": subprocess.CREATE_NO_WINDOW}
+    return {}
+
+def run_compiler(cmd, on_line=None, on_start=None):
+    """Run a compiler command, streaming each diagnostic line to on_line."""
+    use_available_cpus()
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        **hidden_window_kwargs(),
+    )
+    if on_start:
+        on_start(proc)
+    lines = []
+    for line in proc.stdout:
+        lines.append(line)
+        if on_line:
+            on_line(line.rstrip("\n"))
+    proc.stdout.close()
+    return proc.wait(), "".join(lines)
+
+def find_llvm_profdata(compiler):
+    name = "llvm-profdata" + EXE_SUFFIX
+    local = os.path.join(os.path.dirname(compiler), name)
+    if os.path.exists(local):
+        return [local]
+    found = shutil.which("llvm-profdata")
+    if found:
+        return [found]
+    if sys.platform == "darwin" and shutil.which("xcrun"):
+        res = subprocess.run(["xcrun", "--find", "llvm-profdata"], capture_output=True, text=True)
+        if res.returncode == 0 and res.stdout.strip():
+            return [res.stdout.strip()]
+    return None
 
-        self.compiler_cmd_cpp = None
-        self.compiler_cmd_c = None
-        self.c_compiler_is_cpp_driver = False
-        self.running_process = None
-        self.running_processes = []
-        self._autosave_job = None
-        self._highlight_jobs = {}
-        self._complexity_window = None
+TOOLCHAIN_MANIFEST_FILE = os.path.join(WORK_DIR, "toolchains.json")
+TOOLCHAIN_MANIFEST_VERSION = 2
+TOOLCHAIN_STD_LEVELS = {
+    "C": ["c99", "c11", "c17", "c2x"],
+    "C++": ["c++11", "c++14", "c++17", "c++20", "c++23"],
+}
+# Optional flags that some profiles use; probed once so unsupported ones can be dropped.
+TOOLCHAIN_FEATURE_FLAGS = {
+    "lto": ["-flto"],
+    "openmp": ["-fopenmp"],
+    "march_native": ["-march=native"],
+}
 
-        self.benchmark_var = tk.BooleanVar(value=False)
-        self.benchmark_runs_var = tk.IntVar(value=BENCHMARK_DEFAULT_RUNS)
-        self.complexity_runs_var = tk.IntVar(value=3)
-        self.language_var = tk.StringVar(value="C++")
-        self.split_var = tk.BooleanVar(value=False)
-        self.theme_var = tk.StringVar(value="Dark")
-        self.project_name_var = tk.StringVar(value="Untitled")
+def get_file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+def probe_compiler_accepts(compiler, lang, flags, code="int main(void) { return 0; }\n", link=False):
+    """Whether `compiler` accepts `flags`. With link=True a trivial program is
+    really compiled and linked, since codegen/link flags (-flto, -fopenmp,
+    -march=native) can pass a syntax-only check and still fail there."""
+    cmd = [compiler, "-x", "c" if lang == "C" else "c++"]
+    try:
+        with tempfile.TemporaryDirectory(prefix="ide-probe-") as tmp_dir:
+            if link:
+                cmd += ["-"] + flags + ["-o", os.path.join(tmp_dir, "probe" + EXE_SUFFIX)]
+            else:
+                cmd += ["-fsyntax-only"] + flags + ["-"]
+            res = subprocess.run(cmd, input=code, capture_output=True, text=True, timeout=30, cwd=tmp_dir, **hidden_window_kwargs())
+    except Exception:
+        return False
+    return res.returncode == 0
 
-        # --- UI SETUP ---
-        self.toolbar = tk.Frame(root, pady=5)
-        self.toolbar.pack(fill=tk.X)
+def probe_toolchain(compiler):
+    info = {"path": compiler, "stamp": get_file_stamp(compiler), "version": "", "target": ""}
+    for key, args in (("version", ["--version"]), ("target", ["-dumpmachine"])):
+        try:
+            res = subprocess.run([compiler] + args, capture_output=True, text=True, timeout=30, **hidden_window_kwargs())
+            lines = (res.stdout or res.stderr).strip().splitlines()
+            info[key] = lines[0] if lines else ""
+        except Exception:
+            pass
 
-        self.btn_run = tk.Button(
-            self.toolbar,
-            text=RUN_BUTTON_TEXT,
-            command=self.run_thread,
-            bg="#d32f2f",
-            fg="white",
-            font=("Segoe UI", 11, "bold"),
-            width=25,
-        )
-        self.btn_run.pack(side=tk.LEFT, padx=10)
+    info["clang"] = "clang" in os.path.basename(compiler).lower() or "clang" in info["version"].lower()
+    info["std"] = {
+        lang: [level for level in levels if probe_compiler_accepts(compiler, lang, [f"-std={level}"])]
+        for lang, levels in TOOLCHAIN_STD_LEVELS.items()
+    }
+    features = {
+        name: probe_compiler_accepts(compiler, "C++", flags, link=True)
+        for name, flags in TOOLCHAIN_FEATURE_FLAGS.items()
+    }
+    # gcc and clang both precompile headers; only the output format differs.
+    features["pch"] = bool(info["version"])
+    info["features"] = features
+    return info
+
+class ToolchainManifest:
+    """Probed compiler capabilities, persisted so later launches skip the probes."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {"version": TOOLCHAIN_MANIFEST_VERSION, "toolchains": {}, "detected": None}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == TOOLCHAIN_MANIFEST_VERSION:
+                self.data.update(data)
+        except Exception:
+            pass
 
-        self.btn_kill = tk.Button(
-            self.toolbar,
-            text="Kill Process",
-            command=self.kill_process,
-            bg="#616161",
-            fg="white",
-            font=("Segoe UI", 10, "bold"),
-            width=12,
-        )
-        self.btn_kill.pack(side=tk.LEFT, padx=6)
+    def save(self):
+        try:
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            pass
 
-        self.btn_race = tk.Button(
-            self.toolbar,
-            text="Race",
-            command=self.open_race_dialog,
-            font=("Segoe UI", 10, "bold"),
-            width=8,
-        )
-        self.btn_race.pack(side=tk.LEFT, padx=6)
+    def get(self, compiler):
+        stamp = get_file_stamp(compiler)
+        with self.lock:
+            info = self.data["toolchains"].get(compiler)
+            if info and stamp and info.get("stamp") == stamp:
+                return info
+            info = probe_toolchain(compiler)
+            self.data["toolchains"][compiler] = info
+            self.save()
+            return info
+
+    def supports(self, compiler, flag):
+        features = self.get(compiler).get("features", {})
+        for name, flags in TOOLCHAIN_FEATURE_FLAGS.items():
+            if flag in flags:
+                return features.get(name, False)
+        return True
 
-        self.chk_split = tk.Checkbutton(
-            self.toolbar,
-            text="Split View",
-            variable=self.split_var,
-            command=self.toggle_split,
-            font=("Segoe UI", 10),
-        )
-        self.chk_split.pack(side=tk.LEFT, padx=6)
+    def get_detected(self, env_path):
+        detected = self.data.get("detected")
+        if not detected or env_path not in detected.get("env_paths", []):
+            return None
+        for key in ("cpp", "c"):
+            path = detected.get(key)
+            if path and get_file_stamp(path) != detected.get(f"{key}_stamp"):
+                return None
+        return detected
+
+    def set_detected(self, env_paths, cpp, c, c_is_cpp_driver, bin_dir):
+        with self.lock:
+            self.data["detected"] = {
+                "env_paths": env_paths,
+                "cpp": cpp,
+                "cpp_stamp": get_file_stamp(cpp) if cpp else None,
+                "c": c,
+                "c_stamp": get_file_stamp(c) if c else None,
+                "c_is_cpp_driver": c_is_cpp_driver,
+                "bin_dir": bin_dir,
+            }
+            self.save()
+        for compiler in (cpp, c):
+            if compiler:
+                self.get(compiler)
+
+TOOLCHAINS = ToolchainManifest(TOOLCHAIN_MANIFEST_FILE)
+
+def get_compiler_version(compiler):
+    return TOOLCHAINS.get(compiler).get("version", "")
+
+def is_clang_compiler(compiler):
+    return TOOLCHAINS.get(compiler).get("clang", False)
+
+def detect_compilers():
+    cpp = shutil.which("g++") or shutil.which("clang++")
+    c = shutil.which("gcc") or shutil.which("clang")
+    c_is_cpp_driver = False
+    if not c and cpp:
+        c = cpp
+        c_is_cpp_driver = True
+    return {"cpp": cpp, "c": c, "c_is_cpp_driver": c_is_cpp_driver}
+
+def load_detected_compilers():
+    env_path = os.environ.get("PATH", "")
+    detected = TOOLCHAINS.get_detected(env_path)
+    if not detected:
+        return None
+    bin_dir = detected.get("bin_dir")
+    if bin_dir and bin_dir not in env_path.split(os.pathsep):
+        os.environ["PATH"] = bin_dir + os.pathsep + env_path
+    return {
+        "cpp": detected.get("cpp"),
+        "c": detected.get("c"),
+        "c_is_cpp_driver": detected.get("c_is_cpp_driver", False),
+    }
 
-        self.chk_bench = tk.Checkbutton(
-            self.toolbar,
-            text="Benchmark",
-            variable=self.benchmark_var,
-            command=self.on_benchmark_toggle,
-            font=("Segoe UI", 10),
-        )
-        self.chk_bench.pack(side=tk.LEFT, padx=6)
+def active_compiler(compilers, lang):
+    return compilers["c"] if lang == "C" else compilers["cpp"]
 
-        self.entry_runs = tk.Entry(
-            self.toolbar,
-            textvariable=self.benchmark_runs_var,
-            width=4,
-            font=("Segoe UI", 10),
-        )
-        self.entry_runs.pack(side=tk.LEFT, padx=(2, 0))
+def use_bundled_compiler(lang):
+    if os.name == "nt":
+        bin_names = ["g++.exe", "gcc.exe", "clang++.exe", "clang.exe"]
+    else:
+        bin_names = ["g++", "gcc", "clang++", "clang"]
+
+    for bin_dir in iter_bundled_compiler_bin_candidates():
+        if not os.path.isdir(bin_dir) or is_partial_extraction_dir(bin_dir):
+            continue
+        if not any(os.path.exists(os.path.join(bin_dir, name)) for name in bin_names):
+            continue
+        path_parts = os.environ.get("PATH", "").split(os.pathsep)
+        if bin_dir not in path_parts:
+            os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+        found = detect_compilers()
+        if active_compiler(found, lang):
+            found["bin_dir"] = bin_dir
+            return found
+    return None
 
-        self.lbl_runs = tk.Label(self.toolbar, text="runs", font=("Segoe UI", 10))
-        self.lbl_runs.pack(side=tk.LEFT, padx=(2, 10))
+def resolve_compilers(lang):
+    """Find compilers from the toolchain manifest, PATH, or an already
+    extracted bundled toolchain (never downloads or extracts)."""
+    env_path = os.environ.get("PATH", "")
+    found = load_detected_compilers()
+    if found and active_compiler(found, lang):
+        return found
+
+    found = detect_compilers()
+    bin_dir = None
+    if not active_compiler(found, lang):
+        bundled = use_bundled_compiler(lang)
+        if bundled:
+            found = bundled
+            bin_dir = bundled.pop("bin_dir")
+    if found["cpp"] or found["c"]:
+        env_paths = [env_path, os.environ.get("PATH", "")]
+        TOOLCHAINS.set_detected(env_paths, found["cpp"], found["c"], found["c_is_cpp_driver"], bin_dir)
+    return found
+
+# System headers pulled in by the injected timer prelude; kept in the PCH so
+# every compile skips re-parsing them.
+PCH_PRELUDE = {
+    "C": """#include <stdio.h>
+#include <stdlib.h>
+#include <stdarg.h>
+#include <string.h>
+#include <time.h>
+#ifdef _WIN32
+#include <windows.h>
+#include <psapi.h>
+#endif
+""",
+    "C++": """#include <iostream>
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdarg.h>
+#include <string.h>
+#include <time.h>
+#include <new>
+#ifdef _WIN32
+#include <windows.h>
+#include <psapi.h>
+#endif
+""",
+}
 
-        self.btn_complexity = tk.Button(
-            self.toolbar,
-            text="Complexity",
-            command=self.open_complexity_window,
-            font=("Segoe UI", 10, "bold"),
-            width=12,
-        )
-        self.btn_complexity.pack(side=tk.LEFT, padx=6)
+IDE_RUNTIME_DECLS = r"""
+// --- IDE INJECTED TIMER ---
+#ifdef __cplusplus
+extern "C" {
+#endif
+extern unsigned long long _IDE_STEP_COUNT;
+void* _IDE_malloc(size_t size);
+void* _IDE_calloc(size_t n, size_t size);
+void* _IDE_realloc(void* ptr, size_t size);
+void _IDE_free(void* ptr);
+void _IDE_START(void);
+void _IDE_PAUSE(void);
+void _IDE_RESUME(void);
+int _IDE_SCANF(const char* fmt, ...);
+int _IDE_SCANF_S(const char* fmt, ...);
+int _IDE_MAIN(int (*entry)(int, char**), int argc, char** argv);
+#ifdef __cplusplus
+}
+#endif
 
-        self.lbl_complexity = tk.Label(self.toolbar, text="Complexity: N/A", font=("Segoe UI", 10))
-        self.lbl_complexity.pack(side=tk.LEFT, padx=8)
+#ifndef IDE_STEP
+#define IDE_STEP() do { _IDE_STEP_COUNT++; } while (0)
+#endif
+#ifndef IDE_STEPN
+#define IDE_STEPN(n) do { _IDE_STEP_COUNT += (unsigned long long)(n); } while (0)
+#endif
+// --------------------------
 
-        self.lbl_status = tk.Label(self.toolbar, text="Ready", font=("Segoe UI", 10))
-        self.lbl_status.pack(side=tk.RIGHT, padx=10)
+#ifndef __cplusplus
+#define malloc(size) _IDE_malloc(size)
+#define calloc(n, s) _IDE_calloc(n, s)
+#define realloc(p, s) _IDE_realloc(p, s)
+#define free(p) _IDE_free(p)
+#endif
+"""
 
-        self.options_bar = tk.Frame(root, pady=3)
-        self.options_bar.pack(fill=tk.X)
+# Timing/heap runtime, compiled once per toolchain and language (always -O2)
+# and linked into every program instead of being pasted into the source.
+IDE_RUNTIME_SOURCE = r"""
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdarg.h>
+#include <string.h>
+#include <time.h>
+#ifdef __cplusplus
+#include <iostream>
+#include <new>
+#endif
+#ifdef _WIN32
+#include <windows.h>
+#include <psapi.h>
+#include <io.h>
+#define _IDE_DUP _dup
+#define _IDE_DUP2 _dup2
+#define _IDE_CLOSE _close
+#define _IDE_WRITE _write
+#define _IDE_READ(fd, buf, n) _read(fd, buf, (unsigned int)(n))
+#define _IDE_NULL_DEVICE "NUL"
+#else
+#include <unistd.h>
+#include <sys/resource.h>
+#define _IDE_DUP dup
+#define _IDE_DUP2 dup2
+#define _IDE_CLOSE close
+#define _IDE_WRITE write
+#define _IDE_READ read
+#define _IDE_NULL_DEVICE "/dev/null"
+#endif
+#ifdef __linux__
+#include <linux/perf_event.h>
+#include <sys/ioctl.h>
+#include <sys/syscall.h>
+#endif
 
-        self.lbl_project = tk.Label(self.options_bar, text="Project:", font=("Segoe UI", 10))
-        self.lbl_project.pack(side=tk.LEFT, padx=(10, 4))
+#ifdef __cplusplus
+// Serves std::cin straight from the preloaded input once the program has
+// called sync_with_stdio(false), which gives cin its own buffer on fd 0.
+class _IDE_MemoryBuf : public std::streambuf {
+public:
+    void reset(char* data, size_t size, size_t pos) { setg(data, data + pos, data + size); }
+
+protected:
+    pos_type seekoff(off_type off, std::ios_base::seekdir dir, std::ios_base::openmode which) {
+        if (!(which & std::ios_base::in)) return pos_type(off_type(-1));
+        off_type size = egptr() - eback();
+        off_type base = dir == std::ios_base::beg ? 0 : (dir == std::ios_base::cur ? gptr() - eback() : size);
+        if (base + off < 0 || base + off > size) return pos_type(off_type(-1));
+        setg(eback(), eback() + (base + off), egptr());
+        return pos_type(base + off);
+    }
 
-        self.entry_project = tk.Entry(
-            self.options_bar,
-            textvariable=self.project_name_var,
-            width=22,
-            font=("Segoe UI", 10),
-        )
-        self.entry_project.pack(side=tk.LEFT, padx=(0, 12))
+    pos_type seekpos(pos_type pos, std::ios_base::openmode which) {
+        return seekoff(off_type(pos), std::ios_base::beg, which);
+    }
+};
 
-        self.lbl_theme = tk.Label(self.options_bar, text="Theme:", font=("Segoe UI", 10))
-        self.lbl_theme.pack(side=tk.LEFT, padx=(10, 4))
+static _IDE_MemoryBuf _IDE_CIN_MEMORY;
+static std::streambuf* _IDE_CIN_SYNCED = NULL;
+#endif
 
-        self.theme_menu = tk.OptionMenu(self.options_bar, self.theme_var, *THEMES.keys(), command=self.apply_theme)
-        self.theme_menu.config(width=8, font=("Segoe UI", 10))
-        self.theme_menu.pack(side=tk.LEFT, padx=(0, 12))
+#ifdef __cplusplus
+extern "C" {
+#endif
 
-        self.lbl_language = tk.Label(self.options_bar, text="Language:", font=("Segoe UI", 10))
-        self.lbl_language.pack(side=tk.LEFT, padx=(10, 4))
+double _IDE_TOTAL_TIME = 0.0;  // wall time (no input)
+double _IDE_TOTAL_CPU = 0.0;   // cpu time
+int _IDE_IS_RUNNING = 0;
+int _IDE_BENCHMARK = 0;
 
-        self.language_menu = tk.OptionMenu(self.options_bar, self.language_var, "C", "C++", command=self.on_language_change)
-        self.language_menu.config(width=6, font=("Segoe UI", 10))
-        self.language_menu.pack(side=tk.LEFT, padx=(0, 12))
+double _IDE_START_WALL = 0.0;
+double _IDE_START_CPU = 0.0;
 
-        # Instructions
-        self.info_frame = tk.Frame(root, pady=2)
-        self.info_frame.pack(fill=tk.X)
-        self.info_label = tk.Label(
-            self.info_frame,
-            text="Info: Timer pauses during input. Use IDE_STEP() / IDE_STEPN(n) to count steps.",
-        )
-        self.info_label.pack()
+unsigned long long _IDE_STEP_COUNT = 0;
 
-        # Work area (snippet sidebar + editors)
-        self.work_area = tk.Frame(root)
-        self.work_area.pack(fill=tk.BOTH, expand=True)
+// Set by the repeat harness; reported alongside the totals.
+long _IDE_ITERS = 0;
+long _IDE_WARMUP_COUNT = 0;
+double* _IDE_ITER_SAMPLES = NULL;
+long _IDE_ITER_SAMPLE_COUNT = 0;
+double _IDE_PEAK_MEM = -1.0;
+double _IDE_BASE_MEM = -1.0;
+
+// IDE_PERF=1: per-process counters, enabled only while the timer runs.
+enum {
+    _IDE_PERF_CYCLES,
+    _IDE_PERF_INSTRUCTIONS,
+    _IDE_PERF_CACHE_REFS,
+    _IDE_PERF_CACHE_MISSES,
+    _IDE_PERF_BRANCH_MISSES,
+    _IDE_PERF_TASK_CLOCK,
+    _IDE_PERF_PAGE_FAULTS,
+    _IDE_PERF_CONTEXT_SWITCHES,
+    _IDE_PERF_CPU_MIGRATIONS,
+    _IDE_PERF_COUNT
+};
+static const char* _IDE_PERF_NAMES[_IDE_PERF_COUNT] = {
+    "CYCLES", "INSTRUCTIONS", "CACHE_REFS", "CACHE_MISSES", "BRANCH_MISSES",
+    "TASK_CLOCK", "PAGE_FAULTS", "CONTEXT_SWITCHES", "CPU_MIGRATIONS"
+};
+// Pause/resume bookkeeping: how many times input wrappers restarted the timer,
+// and what one pause/resume pair costs (calibrated at startup).
+double _IDE_TRANSITIONS = 0.0;
+double _IDE_TRANSITION_BASE = 0.0;
+double _IDE_OVERHEAD_WALL = 0.0;
+double _IDE_OVERHEAD_CPU = 0.0;
+int _IDE_CALIBRATED = 0;
+int _IDE_FLUSH_ON_PAUSE = 1;
+int _IDE_SUBTRACT_OVERHEAD = 0;
+// Preloaded stdin: all input is in memory before timing starts, so the input
+// wrappers leave the timer running.
+int _IDE_PRELOADED = 0;
+int _IDE_STDIN_BUFFERED = 0;
+char* _IDE_STDIN_DATA = NULL;
+size_t _IDE_STDIN_SIZE = 0;
+
+// Called on every wrapped read while preloaded: if cin no longer uses the
+// stdio-synced buffer, swap in one over the preloaded input, continuing from
+// wherever stdio has got to. Later sync_with_stdio calls are no-ops.
+static void _IDE_USE_MEMORY_CIN(void) {
+#ifdef __cplusplus
+    std::streambuf* buf = std::cin.rdbuf();
+    if (!_IDE_STDIN_DATA || buf == &_IDE_CIN_MEMORY || buf == _IDE_CIN_SYNCED) return;
+    long pos = ftell(stdin);
+    _IDE_CIN_MEMORY.reset(_IDE_STDIN_DATA, _IDE_STDIN_SIZE, pos > 0 && (size_t)pos <= _IDE_STDIN_SIZE ? (size_t)pos : 0);
+    std::cin.rdbuf(&_IDE_CIN_MEMORY);
+#endif
+}
 
-        self.snippet_frame = tk.Frame(self.work_area, width=220)
-        self.snippet_frame.pack(side=tk.LEFT, fill=tk.Y)
+int _IDE_PERF_ON = 0;
+int _IDE_PERF_FDS[_IDE_PERF_COUNT];
+int _IDE_PERF_IS_LEADER[_IDE_PERF_COUNT];
+double _IDE_PERF_OFFSET[_IDE_PERF_COUNT];  // counts before the reported span
+long _IDE_PERF_DIVISOR = 1;                // iterations in the reported span
 
-        # Editors (split view)
-        self.editor_pane = tk.PanedWindow(self.work_area, orient=tk.HORIZONTAL, sashwidth=6)
-        self.editor_pane.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+#define _IDE_MAGIC 0xC0DEC0DEu
+typedef struct { size_t size; unsigned int magic; } _IDE_HDR;
+size_t _IDE_CUR_HEAP = 0;
+size_t _IDE_MAX_HEAP = 0;
+size_t _IDE_HEAP_BASE = 0;
+int _IDE_TRACK_HEAP = 0;
 
-        self.left_frame = tk.Frame(self.editor_pane)
-        self.right_frame = tk.Frame(self.editor_pane)
+#ifdef _WIN32
+SIZE_T _IDE_BASE_WS = 0;
+SIZE_T _IDE_BASE_PRIV = 0;
+#else
+double _IDE_BASE_RSS = -1.0;
+double _IDE_BASE_HWM = -1.0;
+#endif
 
-        self.editor_left = scrolledtext.ScrolledText(
-            self.left_frame,
-            font=("Consolas", 13),
-            undo=True,
-        )
-        self.editor_left.pack(fill=tk.BOTH, expand=True)
-
-        self.editor_right = scrolledtext.ScrolledText(
-            self.right_frame,
-            font=("Consolas", 13),
-            undo=True,
-        )
-        self.editor_right.pack(fill=tk.BOTH, expand=True)
-
-        self.active_editor = self.editor_left
-        self.editor_left.bind("<FocusIn>", lambda e, ed=self.editor_left: self.set_active_editor(ed))
-        self.editor_right.bind("<FocusIn>", lambda e, ed=self.editor_right: self.set_active_editor(ed))
-
-        self.editor_pane.add(self.left_frame, stretch="always")
-
-        default_code = """#include <stdio.h>
-#ifdef _WIN32
-#include <windows.h>
-#else
-#include <unistd.h>
-#endif
-
-int main() {
-    int n;
-    
-    printf("--- Phase 1: Input ---\n");
-    printf("Enter a number (take your time): ");
-    
-    // The timer will PAUSE here automatically!
-    scanf("%d", &n); 
-    
-    printf("\n--- Phase 2: Heavy Work ---\n");
-    printf("Processing... (simulating 2 seconds of work)\n");
-    
-    // This part is timed!
-#ifdef _WIN32
-    Sleep(2000);
-#else
-    usleep(2000 * 1000);
-#endif
-    
-    printf("Done! The complexity timer captured strictly the 2 seconds.\n");
-
-    return 0;
-}"""
-        self.editor_left.insert(tk.END, default_code)
-        self.editor_right.insert(tk.END, default_code)
-
-        self.editor = self.editor_left
-
-        self.editor_left.edit_modified(False)
-        self.editor_right.edit_modified(False)
-        self.editor_left.bind("<<Modified>>", lambda e, ed=self.editor_left: self.on_editor_modified(ed))
-        self.editor_right.bind("<<Modified>>", lambda e, ed=self.editor_right: self.on_editor_modified(ed))
-        self.project_name_var.trace_add("write", self.on_project_name_change)
-
-        self.build_snippet_sidebar()
-
-        os.makedirs(PROJECTS_DIR, exist_ok=True)
-        self.apply_theme()
-        self.schedule_highlight(self.editor_left)
-        self.schedule_highlight(self.editor_right)
-        self.check_compiler()
-
-    # --- INTELLIGENT CODE INJECTION ---
-
-    def _build_code_mask(self, text):
-        mask = [True] * len(text)
-        i = 0
-        in_single = False
-        in_multi = False
-        in_string = False
-        in_char = False
-        escape = False
-
-        while i < len(text):
-            ch = text[i]
-            nxt = text[i + 1] if i + 1 < len(text) else ""
-
-            if in_single:
-                mask[i] = False
-                if ch == "\n":
-                    in_single = False
-                i += 1
-                continue
-
-            if in_multi:
-                mask[i] = False
-                if ch == "*" and nxt == "/":
-                    mask[i + 1] = False
-                    i += 2
-                    in_multi = False
-                else:
-                    i += 1
-                continue
-
-            if in_string:
-                mask[i] = False
-                if escape:
-                    escape = False
-                else:
-                    if ch == "\\":
-                        escape = True
-                    elif ch == '"':
-                        in_string = False
-                i += 1
-                continue
-
-            if in_char:
-                mask[i] = False
-                if escape:
-                    escape = False
-                else:
-                    if ch == "\\":
-                        escape = True
-                    elif ch == "'":
-                        in_char = False
-                i += 1
-                continue
-
-            if ch == "/" and nxt == "/":
-                mask[i] = False
-                mask[i + 1] = False
-                in_single = True
-                i += 2
-                continue
-
-            if ch == "/" and nxt == "*":
-                mask[i] = False
-                mask[i + 1] = False
-                in_multi = True
-                i += 2
-                continue
-
-            if ch == '"':
-                mask[i] = False
-                in_string = True
-                i += 1
-                continue
-
-            if ch == "'":
-                mask[i] = False
-                in_char = True
-                i += 1
-                continue
-
-            i += 1
-
-        return mask
-
-    def _replace_in_code(self, text, pattern, repl, flags=re.DOTALL):
-        mask = self._build_code_mask(text)
-        out = []
-        last = 0
-        for match in re.finditer(pattern, text, flags):
-            if not all(mask[match.start():match.end()]):
-                continue
-            out.append(text[last:match.start()])
-            out.append(repl(match) if callable(repl) else repl)
-            last = match.end()
-        out.append(text[last:])
-        return "".join(out)
-
-    def _find_code_match(self, text, pattern, flags=re.DOTALL):
-        mask = self._build_code_mask(text)
-        for match in re.finditer(pattern, text, flags):
-            if all(mask[match.start():match.end()]):
-                return match
-        return None
-
-    def inject_smart_timer(self, user_code):
-        """
-        1. Injects a Timer Utility.
-        2. Wraps 'main' to start/stop this timer.
-        3. Finds input functions and wraps them to PAUSE the timer.
-        """
-
-        lang = self.language_var.get()
-        if lang == "C":
-            timer_header = r"""
-#include <stdio.h>
-#include <stdlib.h>
-#include <stdarg.h>
-#include <string.h>
-#include <time.h>
-#ifdef _WIN32
-#include <windows.h>
-#include <psapi.h>
-#endif
-
-// --- IDE INJECTED TIMER ---
-double _IDE_TOTAL_TIME = 0.0;  // wall time (no input)
-double _IDE_TOTAL_CPU = 0.0;   // cpu time
-int _IDE_IS_RUNNING = 0;
-int _IDE_BENCHMARK = 0;
-
-double _IDE_START_WALL = 0.0;
-double _IDE_START_CPU = 0.0;
-
-unsigned long long _IDE_STEP_COUNT = 0;
-
-#define _IDE_MAGIC 0xC0DEC0DEu
-typedef struct { size_t size; unsigned int magic; } _IDE_HDR;
-size_t _IDE_CUR_HEAP = 0;
-size_t _IDE_MAX_HEAP = 0;
-size_t _IDE_HEAP_BASE = 0;
-int _IDE_TRACK_HEAP = 0;
-
-#ifndef IDE_STEP
-#define IDE_STEP() do { _IDE_STEP_COUNT++; } while (0)
-#endif
-#ifndef IDE_STEPN
-#define IDE_STEPN(n) do { _IDE_STEP_COUNT += (unsigned long long)(n); } while (0)
-#endif
-
-#ifdef _WIN32
-SIZE_T _IDE_BASE_WS = 0;
-SIZE_T _IDE_BASE_PRIV = 0;
-#endif
+static void _IDE_OUT_OF_MEMORY(void);
 
 static void* _IDE_raw_malloc(size_t size) { return malloc(size); }
 static void* _IDE_raw_realloc(void* ptr, size_t size) { return realloc(ptr, size); }
@@ -708,7 +998,10 @@ static void _IDE_raw_free(void* ptr) { free(ptr); }
 void* _IDE_malloc(size_t size) {
     size_t total = size + sizeof(_IDE_HDR);
     _IDE_HDR* h = (_IDE_HDR*)_IDE_raw_malloc(total);
-    if (!h) return NULL;
+    if (!h) {
+        _IDE_OUT_OF_MEMORY();
+        return NULL;
+    }
     h->size = size;
     h->magic = _IDE_MAGIC;
     _IDE_CUR_HEAP += size;
@@ -733,7 +1026,10 @@ void* _IDE_realloc(void* ptr, size_t size) {
     size_t old = h->size;
     size_t total = size + sizeof(_IDE_HDR);
     _IDE_HDR* nh = (_IDE_HDR*)_IDE_raw_realloc(h, total);
-    if (!nh) return NULL;
+    if (!nh) {
+        _IDE_OUT_OF_MEMORY();
+        return NULL;
+    }
     nh->size = size;
     nh->magic = _IDE_MAGIC;
     if (size > old) _IDE_CUR_HEAP += (size - old);
@@ -755,7 +1051,7 @@ void _IDE_free(void* ptr) {
     _IDE_raw_free(h);
 }
 
-double _IDE_WALL_SECONDS() {
+double _IDE_WALL_SECONDS(void) {
 #ifdef _WIN32
     static LARGE_INTEGER freq;
     static int init = 0;
@@ -777,7 +1073,7 @@ double _IDE_WALL_SECONDS() {
 #endif
 }
 
-double _IDE_CPU_SECONDS() {
+double _IDE_CPU_SECONDS(void) {
 #ifdef _WIN32
     FILETIME create_time, exit_time, kernel_time, user_time;
     if (GetProcessTimes(GetCurrentProcess(), &create_time, &exit_time, &kernel_time, &user_time)) {
@@ -800,8 +1096,159 @@ double _IDE_CPU_SECONDS() {
 #endif
 }
 
-void _IDE_START() {
+#ifndef _WIN32
+// Bytes for a "VmHWM:"/"VmRSS:" line of /proc/self/status, or -1 when there
+// is no procfs (macOS, some containers).
+static double _IDE_PROC_STATUS_BYTES(const char* key) {
+    FILE* f = fopen("/proc/self/status", "r");
+    if (!f) return -1.0;
+    char line[256];
+    size_t key_len = strlen(key);
+    double value = -1.0;
+    while (fgets(line, sizeof(line), f)) {
+        if (strncmp(line, key, key_len) == 0) {
+            value = strtod(line + key_len, NULL) * 1024.0;
+            break;
+        }
+    }
+    fclose(f);
+    return value;
+}
+
+static double _IDE_MAXRSS_BYTES(void) {
+    struct rusage ru;
+    if (getrusage(RUSAGE_SELF, &ru) != 0) return -1.0;
+#ifdef __APPLE__
+    return (double)ru.ru_maxrss;
+#else
+    return (double)ru.ru_maxrss * 1024.0;
+#endif
+}
+
+static double _IDE_PEAK_RSS_BYTES(void) {
+    double hwm = _IDE_PROC_STATUS_BYTES("VmHWM:");
+    return hwm >= 0 ? hwm : _IDE_MAXRSS_BYTES();
+}
+#endif
+
+#ifdef __linux__
+static int _IDE_PERF_OPEN(unsigned int type, unsigned long long config, int group_fd) {
+    struct perf_event_attr attr;
+    memset(&attr, 0, sizeof(attr));
+    attr.size = sizeof(attr);
+    attr.type = type;
+    attr.config = config;
+    attr.disabled = group_fd < 0;
+    attr.exclude_hv = 1;
+    attr.read_format = PERF_FORMAT_TOTAL_TIME_ENABLED | PERF_FORMAT_TOTAL_TIME_RUNNING;
+    int fd = (int)syscall(SYS_perf_event_open, &attr, 0, -1, group_fd, PERF_FLAG_FD_CLOEXEC);
+    if (fd < 0) {
+        // perf_event_paranoid >= 2 only allows user-space counting.
+        attr.exclude_kernel = 1;
+        fd = (int)syscall(SYS_perf_event_open, &attr, 0, -1, group_fd, PERF_FLAG_FD_CLOEXEC);
+    }
+    return fd;
+}
+#endif
+
+// Hardware events go in one group led by cycles so IPC and miss rates come
+// from the same time slices. Software events are opened on their own and
+// remain when there is no PMU (most VMs) or access is denied.
+static void _IDE_PERF_INIT(void) {
+    for (int i = 0; i < _IDE_PERF_COUNT; i++) {
+        _IDE_PERF_FDS[i] = -1;
+        _IDE_PERF_IS_LEADER[i] = 0;
+        _IDE_PERF_OFFSET[i] = 0.0;
+    }
+    const char* perf = getenv("IDE_PERF");
+    if (!perf || perf[0] != '1') return;
+#ifdef __linux__
+    static const unsigned long long hw[] = {
+        PERF_COUNT_HW_CPU_CYCLES, PERF_COUNT_HW_INSTRUCTIONS, PERF_COUNT_HW_CACHE_REFERENCES,
+        PERF_COUNT_HW_CACHE_MISSES, PERF_COUNT_HW_BRANCH_MISSES
+    };
+    static const unsigned long long sw[] = {
+        PERF_COUNT_SW_TASK_CLOCK, PERF_COUNT_SW_PAGE_FAULTS, PERF_COUNT_SW_CONTEXT_SWITCHES,
+        PERF_COUNT_SW_CPU_MIGRATIONS
+    };
+    int leader = _IDE_PERF_OPEN(PERF_TYPE_HARDWARE, hw[0], -1);
+    if (leader >= 0) {
+        _IDE_PERF_FDS[_IDE_PERF_CYCLES] = leader;
+        _IDE_PERF_IS_LEADER[_IDE_PERF_CYCLES] = 1;
+        for (int i = 1; i < 5; i++) {
+            _IDE_PERF_FDS[_IDE_PERF_CYCLES + i] = _IDE_PERF_OPEN(PERF_TYPE_HARDWARE, hw[i], leader);
+        }
+    }
+    for (int i = 0; i < 4; i++) {
+        int fd = _IDE_PERF_OPEN(PERF_TYPE_SOFTWARE, sw[i], -1);
+        _IDE_PERF_FDS[_IDE_PERF_TASK_CLOCK + i] = fd;
+        _IDE_PERF_IS_LEADER[_IDE_PERF_TASK_CLOCK + i] = fd >= 0;
+    }
+    for (int i = 0; i < _IDE_PERF_COUNT; i++) {
+        if (_IDE_PERF_FDS[i] >= 0) _IDE_PERF_ON = 1;
+    }
+#endif
+}
+
+static void _IDE_PERF_ENABLE(int enable) {
+#ifdef __linux__
+    if (!_IDE_PERF_ON) return;
+    for (int i = 0; i < _IDE_PERF_COUNT; i++) {
+        if (_IDE_PERF_IS_LEADER[i]) {
+            ioctl(_IDE_PERF_FDS[i], enable ? PERF_EVENT_IOC_ENABLE : PERF_EVENT_IOC_DISABLE, PERF_IOC_FLAG_GROUP);
+        }
+    }
+#else
+    (void)enable;
+#endif
+}
+
+// Current counts, scaled up when the kernel had to multiplex; -1 if missing.
+static void _IDE_PERF_READ(double* out) {
+    for (int i = 0; i < _IDE_PERF_COUNT; i++) {
+        out[i] = -1.0;
+#ifdef __linux__
+        unsigned long long v[3];
+        if (_IDE_PERF_FDS[i] < 0 || read(_IDE_PERF_FDS[i], v, sizeof(v)) != (ssize_t)sizeof(v)) continue;
+        out[i] = v[2] > 0 ? (double)v[0] * ((double)v[1] / (double)v[2]) : (double)v[0];
+#endif
+    }
+}
+
+// Counts for the reported span: per iteration in repeat mode.
+static void _IDE_PERF_RESULT(double* out) {
+    _IDE_PERF_READ(out);
+    for (int i = 0; i < _IDE_PERF_COUNT; i++) {
+        if (out[i] >= 0) {
+            out[i] = (out[i] - _IDE_PERF_OFFSET[i]) / (double)_IDE_PERF_DIVISOR;
+            if (out[i] < 0) out[i] = 0.0;
+        }
+    }
+}
+
+void _IDE_START(void) {
     if (!_IDE_IS_RUNNING) {
+#ifndef _WIN32
+        // Sampled once, before the clocks are read, so procfs I/O is never
+        // charged to the algorithm (START runs again after every input).
+        if (_IDE_BASE_HWM < 0) {
+#ifdef __linux__
+            // Restart VmHWM from the current RSS, so a peak reached earlier
+            // (reading the preloaded input) does not hide the algorithm's.
+            FILE* clear_refs = fopen("/proc/self/clear_refs", "w");
+            if (clear_refs) {
+                fputs("5", clear_refs);
+                fclose(clear_refs);
+            }
+#endif
+            _IDE_BASE_RSS = _IDE_PROC_STATUS_BYTES("VmRSS:");
+            _IDE_BASE_HWM = _IDE_PEAK_RSS_BYTES();
+            if (_IDE_BASE_RSS < 0) _IDE_BASE_RSS = _IDE_BASE_HWM;
+        }
+#endif
+        // Counters go on before the clocks are read and off after, so the
+        // ioctls stay out of the measured time.
+        _IDE_PERF_ENABLE(1);
         _IDE_START_WALL = _IDE_WALL_SECONDS();
         _IDE_START_CPU = _IDE_CPU_SECONDS();
 #ifdef _WIN32
@@ -818,21 +1265,67 @@ void _IDE_START() {
     }
 }
 
-void _IDE_PAUSE() {
+static void _IDE_FLUSH_STDOUT(void) {
     fflush(stdout);
+#ifdef __cplusplus
+    std::cout.flush();
+#endif
+}
+
+static void _IDE_STOP(void) {
     if (_IDE_IS_RUNNING) {
         double end_wall = _IDE_WALL_SECONDS();
         double end_cpu = _IDE_CPU_SECONDS();
         _IDE_TOTAL_TIME += (end_wall - _IDE_START_WALL);
         _IDE_TOTAL_CPU += (end_cpu - _IDE_START_CPU);
+        _IDE_PERF_ENABLE(0);
         _IDE_IS_RUNNING = 0;
     }
 }
 
-void _IDE_RESUME() {
+// Called around every input read in user code.
+void _IDE_PAUSE(void) {
+    if (_IDE_PRELOADED) {
+        _IDE_USE_MEMORY_CIN();
+        return;
+    }
+    // Interactive runs flush so prompts show up before input is read.
+    if (_IDE_FLUSH_ON_PAUSE) _IDE_FLUSH_STDOUT();
+    _IDE_STOP();
+}
+
+void _IDE_RESUME(void) {
+    if (_IDE_PRELOADED) return;
+    if (!_IDE_IS_RUNNING) _IDE_TRANSITIONS += 1.0;
     _IDE_START();
 }
 
+// Time charged to the algorithm by one PAUSE/RESUME pair with nothing in
+// between; the best of a few batches, so a preemption does not inflate it.
+static void _IDE_CALIBRATE(void) {
+    const int rounds = 200;
+    _IDE_OVERHEAD_WALL = -1.0;
+    for (int batch = 0; batch < 5; batch++) {
+        _IDE_TOTAL_TIME = 0.0;
+        _IDE_TOTAL_CPU = 0.0;
+        _IDE_START();
+        for (int i = 0; i < rounds; i++) {
+            _IDE_PAUSE();
+            _IDE_RESUME();
+        }
+        _IDE_PAUSE();
+        double wall = _IDE_TOTAL_TIME / (double)(rounds + 1);
+        if (_IDE_OVERHEAD_WALL < 0 || wall < _IDE_OVERHEAD_WALL) {
+            _IDE_OVERHEAD_WALL = wall;
+            _IDE_OVERHEAD_CPU = _IDE_TOTAL_CPU / (double)(rounds + 1);
+        }
+    }
+    _IDE_TOTAL_TIME = 0.0;
+    _IDE_TOTAL_CPU = 0.0;
+    _IDE_TRANSITIONS = 0.0;
+    _IDE_CALIBRATED = 1;
+}
+
 int _IDE_SCANF(const char* fmt, ...) {
     _IDE_PAUSE();
     va_list args;
@@ -857,16 +1350,170 @@ int _IDE_SCANF_S(const char* fmt, ...) {
     return r;
 }
 
-void _IDE_PRINT_RESULT() {
-    _IDE_PAUSE();
+// Binary metrics record: "IDEM", version byte, then records of
+// [u8 tag][u32 length][payload] in native byte order.
+enum {
+    _IDE_TAG_TIME = 1,
+    _IDE_TAG_CPU = 2,
+    _IDE_TAG_STEPS = 3,
+    _IDE_TAG_PEAK_MEM = 4,
+    _IDE_TAG_BASE_MEM = 5,
+    _IDE_TAG_ITERS = 6,
+    _IDE_TAG_WARMUP = 7,
+    _IDE_TAG_ITER_SAMPLES = 8,
+    _IDE_TAG_CODE_HEAP = 9,
+    _IDE_TAG_PERF_FIRST = 10,  // one double per _IDE_PERF_* counter, in order
+    _IDE_TAG_ALLOC_FAILED = 19,
+    _IDE_TAG_TRANSITIONS = 20,
+    _IDE_TAG_OVERHEAD = 21,
+    _IDE_TAG_OVERHEAD_CPU = 22,
+    _IDE_TAG_OVERHEAD_SUBTRACTED = 23,
+    _IDE_TAG_PRELOADED = 24
+};
+
+int _IDE_ALLOC_FAILED = 0;
+
+static size_t _IDE_PUT(unsigned char* buf, size_t len, unsigned char tag, const void* data, unsigned int size) {
+    buf[len++] = tag;
+    memcpy(buf + len, &size, sizeof(size));
+    len += sizeof(size);
+    memcpy(buf + len, data, size);
+    return len + size;
+}
+
+static int _IDE_HAS_METRICS_CHANNEL(void) {
+    return getenv("IDE_METRICS_FD") != NULL || getenv("IDE_METRICS_FILE") != NULL;
+}
+
+// Pause/resume transitions and their estimated cost for the reported span.
+double _IDE_REPORT_TRANSITIONS = 0.0;
+double _IDE_REPORT_OVERHEAD = 0.0;
+double _IDE_REPORT_OVERHEAD_CPU = 0.0;
+
+static void _IDE_WRITE_METRICS(size_t code_heap_bytes, const double* perf) {
+    const char* fd_env = getenv("IDE_METRICS_FD");
+    const char* path = getenv("IDE_METRICS_FILE");
+    if (!fd_env && !path) return;
+
+    // Without iteration samples the record fits on the stack, which matters
+    // when this runs because an allocation just failed.
+    unsigned char stack_buf[512];
+    size_t cap = 224 + (size_t)(_IDE_ITER_SAMPLE_COUNT + 2 * _IDE_PERF_COUNT) * sizeof(double);
+    unsigned char* buf = cap <= sizeof(stack_buf) ? stack_buf : (unsigned char*)_IDE_raw_malloc(cap);
+    if (!buf) return;
+    unsigned long long steps = _IDE_STEP_COUNT;
+    unsigned long long heap = (unsigned long long)code_heap_bytes;
+    size_t len = 0;
+    memcpy(buf, "IDEM", 4);
+    len = 4;
+    buf[len++] = 1;
+    len = _IDE_PUT(buf, len, _IDE_TAG_TIME, &_IDE_TOTAL_TIME, sizeof(double));
+    len = _IDE_PUT(buf, len, _IDE_TAG_CPU, &_IDE_TOTAL_CPU, sizeof(double));
+    len = _IDE_PUT(buf, len, _IDE_TAG_STEPS, &steps, sizeof(steps));
+    len = _IDE_PUT(buf, len, _IDE_TAG_CODE_HEAP, &heap, sizeof(heap));
+    if (_IDE_CALIBRATED) {
+        unsigned long long subtracted = (unsigned long long)_IDE_SUBTRACT_OVERHEAD;
+        len = _IDE_PUT(buf, len, _IDE_TAG_TRANSITIONS, &_IDE_REPORT_TRANSITIONS, sizeof(double));
+        len = _IDE_PUT(buf, len, _IDE_TAG_OVERHEAD, &_IDE_REPORT_OVERHEAD, sizeof(double));
+        len = _IDE_PUT(buf, len, _IDE_TAG_OVERHEAD_CPU, &_IDE_REPORT_OVERHEAD_CPU, sizeof(double));
+        len = _IDE_PUT(buf, len, _IDE_TAG_OVERHEAD_SUBTRACTED, &subtracted, sizeof(subtracted));
+    }
+    unsigned long long preloaded = (unsigned long long)_IDE_PRELOADED;
+    len = _IDE_PUT(buf, len, _IDE_TAG_PRELOADED, &preloaded, sizeof(preloaded));
+    if (_IDE_PEAK_MEM >= 0) len = _IDE_PUT(buf, len, _IDE_TAG_PEAK_MEM, &_IDE_PEAK_MEM, sizeof(double));
+    if (_IDE_BASE_MEM >= 0) len = _IDE_PUT(buf, len, _IDE_TAG_BASE_MEM, &_IDE_BASE_MEM, sizeof(double));
+    if (_IDE_ITERS > 0) {
+        unsigned long long iters = (unsigned long long)_IDE_ITERS;
+        unsigned long long warmup = (unsigned long long)_IDE_WARMUP_COUNT;
+        len = _IDE_PUT(buf, len, _IDE_TAG_ITERS, &iters, sizeof(iters));
+        len = _IDE_PUT(buf, len, _IDE_TAG_WARMUP, &warmup, sizeof(warmup));
+    }
+    if (_IDE_ITER_SAMPLE_COUNT > 0) {
+        len = _IDE_PUT(buf, len, _IDE_TAG_ITER_SAMPLES, _IDE_ITER_SAMPLES,
+                       (unsigned int)(_IDE_ITER_SAMPLE_COUNT * sizeof(double)));
+    }
+    for (int i = 0; perf && i < _IDE_PERF_COUNT; i++) {
+        if (perf[i] >= 0) len = _IDE_PUT(buf, len, (unsigned char)(_IDE_TAG_PERF_FIRST + i), &perf[i], sizeof(double));
+    }
+    if (_IDE_ALLOC_FAILED) {
+        unsigned long long failed = 1;
+        len = _IDE_PUT(buf, len, _IDE_TAG_ALLOC_FAILED, &failed, sizeof(failed));
+    }
+
+    if (fd_env) {
+        int fd = atoi(fd_env);
+        size_t off = 0;
+        while (off < len) {
+            int n = (int)_IDE_WRITE(fd, buf + off, (unsigned int)(len - off));
+            if (n <= 0) break;
+            off += (size_t)n;
+        }
+        _IDE_CLOSE(fd);
+    } else {
+        FILE* f = fopen(path, "wb");
+        if (f) {
+            fwrite(buf, 1, len, f);
+            fclose(f);
+        }
+    }
+    if (buf != stack_buf) _IDE_raw_free(buf);
+}
+
+// Judge mode (IDE_JUDGE=1): running out of memory under the address-space
+// limit ends the run right away and is reported as such, instead of surfacing
+// later as a crash on a NULL pointer or an uncaught std::bad_alloc.
+static void _IDE_OUT_OF_MEMORY(void) {
+    const char* judge = getenv("IDE_JUDGE");
+    if (!judge || judge[0] != '1' || _IDE_ALLOC_FAILED) return;
+    _IDE_ALLOC_FAILED = 1;
+    _IDE_STOP();
+    _IDE_FLUSH_STDOUT();
+    _IDE_ITER_SAMPLE_COUNT = 0;
+    fprintf(stderr, "IDE: memory allocation failed (memory limit reached)\n");
+    fflush(stderr);
+    _IDE_WRITE_METRICS(_IDE_MAX_HEAP >= _IDE_HEAP_BASE ? (_IDE_MAX_HEAP - _IDE_HEAP_BASE) : 0, NULL);
+    _exit(1);
+}
+
+void _IDE_PRINT_RESULT(void) {
+    _IDE_STOP();
+    _IDE_FLUSH_STDOUT();
+    // IDE_NO_REPORT=1 keeps stdout to the program's own output (benchmarks
+    // and test cases, whose output is hashed or compared).
+    const char* no_report = getenv("IDE_NO_REPORT");
+    int report = !(no_report && no_report[0] == '1');
+
+    // In-process repeat reports per iteration, so the transitions do too.
+    _IDE_REPORT_TRANSITIONS = (_IDE_TRANSITIONS - _IDE_TRANSITION_BASE) / (double)(_IDE_ITERS > 0 ? _IDE_ITERS : 1);
+    _IDE_REPORT_OVERHEAD = _IDE_REPORT_TRANSITIONS * _IDE_OVERHEAD_WALL;
+    _IDE_REPORT_OVERHEAD_CPU = _IDE_REPORT_TRANSITIONS * _IDE_OVERHEAD_CPU;
+    if (_IDE_SUBTRACT_OVERHEAD) {
+        _IDE_TOTAL_TIME = _IDE_TOTAL_TIME > _IDE_REPORT_OVERHEAD ? _IDE_TOTAL_TIME - _IDE_REPORT_OVERHEAD : 0.0;
+        _IDE_TOTAL_CPU = _IDE_TOTAL_CPU > _IDE_REPORT_OVERHEAD_CPU ? _IDE_TOTAL_CPU - _IDE_REPORT_OVERHEAD_CPU : 0.0;
+        for (long i = 0; i < _IDE_ITER_SAMPLE_COUNT; i++) {
+            double v = _IDE_ITER_SAMPLES[i] - _IDE_REPORT_OVERHEAD;
+            _IDE_ITER_SAMPLES[i] = v > 0 ? v : 0.0;
+        }
+    }
     size_t code_heap_bytes = _IDE_MAX_HEAP >= _IDE_HEAP_BASE ? (_IDE_MAX_HEAP - _IDE_HEAP_BASE) : 0;
     double code_heap_kb = (double)code_heap_bytes / 1024.0;
-    printf("\n==========================================\n");
-    printf("   ALGORITHM TIME: %.9f seconds\n", _IDE_TOTAL_TIME);
-    printf("   CPU TIME:       %.9f seconds\n", _IDE_TOTAL_CPU);
-    printf("   STEPS:          %llu\n", (unsigned long long)_IDE_STEP_COUNT);
-    printf("   CODE HEAP:      %.6f KB (%.0f bytes)\n", code_heap_kb, (double)code_heap_bytes);
-    printf("   (User input time was excluded)\n");
+    if (report) {
+        printf("\n==========================================\n");
+        printf("   ALGORITHM TIME: %.9f seconds\n", _IDE_TOTAL_TIME);
+        printf("   CPU TIME:       %.9f seconds\n", _IDE_TOTAL_CPU);
+        printf("   STEPS:          %llu\n", (unsigned long long)_IDE_STEP_COUNT);
+        printf("   CODE HEAP:      %.6f KB (%.0f bytes)\n", code_heap_kb, (double)code_heap_bytes);
+        if (_IDE_PRELOADED) {
+            printf("   (Input was preloaded into memory; parsing it is included)\n");
+        } else {
+            printf("   (User input time was excluded)\n");
+        }
+        if (_IDE_CALIBRATED && _IDE_REPORT_TRANSITIONS > 0) {
+            printf("   TIMER OVERHEAD: %.9f seconds (%.0f pauses x %.1f ns)%s\n", _IDE_REPORT_OVERHEAD,
+                   _IDE_REPORT_TRANSITIONS, _IDE_OVERHEAD_WALL * 1e9,
+                   _IDE_SUBTRACT_OVERHEAD ? ", subtracted" : ", included above");
+        }
+    }
 #ifdef _WIN32
     PROCESS_MEMORY_COUNTERS_EX pmc;
     SIZE_T peak_ws = 0;
@@ -879,28 +1526,102 @@ void _IDE_PRINT_RESULT() {
         double delta_ws_kb = peak_ws >= base_ws ? (double)(peak_ws - base_ws) / 1024.0 : 0.0;
         double priv_mb = (double)priv / (1024.0 * 1024.0);
         double delta_priv_kb = priv >= base_priv ? (double)(priv - base_priv) / 1024.0 : 0.0;
-        printf("   CODE MEMORY: %.6f KB (%.0f bytes)\n", delta_priv_kb, (double)(priv >= base_priv ? (priv - base_priv) : 0));
-        printf("   PEAK WS:     %.2f MB (delta %.6f KB, %.0f bytes)\n", peak_mb, delta_ws_kb, (double)(peak_ws >= base_ws ? (peak_ws - base_ws) : 0));
-        printf("   PRIVATE:     %.2f MB (delta %.6f KB, %.0f bytes)\n", priv_mb, delta_priv_kb, (double)(priv >= base_priv ? (priv - base_priv) : 0));
-        if (_IDE_BENCHMARK) {
-            printf("IDE_PEAK_MEM=%.0f\n", (double)peak_ws);
-            printf("IDE_BASE_MEM=%.0f\n", (double)base_ws);
+        if (report) {
+            printf("   CODE MEMORY: %.6f KB (%.0f bytes)\n", delta_priv_kb, (double)(priv >= base_priv ? (priv - base_priv) : 0));
+            printf("   PEAK WS:     %.2f MB (delta %.6f KB, %.0f bytes)\n", peak_mb, delta_ws_kb, (double)(peak_ws >= base_ws ? (peak_ws - base_ws) : 0));
+            printf("   PRIVATE:     %.2f MB (delta %.6f KB, %.0f bytes)\n", priv_mb, delta_priv_kb, (double)(priv >= base_priv ? (priv - base_priv) : 0));
         }
-    } else {
+        _IDE_PEAK_MEM = (double)peak_ws;
+        _IDE_BASE_MEM = (double)base_ws;
+    } else if (report) {
         printf("   CODE MEMORY: N/A\n");
         printf("   PEAK WS:     N/A\n");
         printf("   PRIVATE:     N/A\n");
     }
 #else
-    printf("   CODE MEMORY: N/A (non-Windows)\n");
-    printf("   PEAK WS:     N/A (non-Windows)\n");
-    printf("   PRIVATE:     N/A (non-Windows)\n");
+    double peak_rss = _IDE_PEAK_RSS_BYTES();
+    double cur_rss = _IDE_PROC_STATUS_BYTES("VmRSS:");
+    double base_rss = _IDE_BASE_RSS;
+    // Peak is measured against the high-water mark at START: where it cannot
+    // be reset, memory the runtime touched and freed before that (the
+    // preloaded input) is in VmHWM but not VmRSS and must not count.
+    double base_hwm = _IDE_BASE_HWM;
+    if (peak_rss >= 0 && base_hwm >= 0) {
+        double delta_peak = peak_rss >= base_hwm ? peak_rss - base_hwm : 0.0;
+        if (report) {
+            printf("   CODE MEMORY: %.6f KB (%.0f bytes)\n", delta_peak / 1024.0, delta_peak);
+            printf("   PEAK RSS:    %.2f MB (delta %.6f KB, %.0f bytes)\n", peak_rss / (1024.0 * 1024.0), delta_peak / 1024.0, delta_peak);
+            if (cur_rss >= 0 && base_rss >= 0) {
+                double delta_cur = cur_rss >= base_rss ? cur_rss - base_rss : 0.0;
+                printf("   RSS:         %.2f MB (delta %.6f KB, %.0f bytes)\n", cur_rss / (1024.0 * 1024.0), delta_cur / 1024.0, delta_cur);
+            } else {
+                printf("   RSS:         N/A\n");
+            }
+        }
+        _IDE_PEAK_MEM = peak_rss;
+        _IDE_BASE_MEM = base_hwm;
+    } else if (report) {
+        printf("   CODE MEMORY: N/A\n");
+        printf("   PEAK RSS:    N/A\n");
+        printf("   RSS:         N/A\n");
+    }
 #endif
-    printf("==========================================\n");
-    if (_IDE_BENCHMARK) {
+    double perf[_IDE_PERF_COUNT];
+    _IDE_PERF_RESULT(perf);
+    if (report && _IDE_PERF_ON) {
+        double cycles = perf[_IDE_PERF_CYCLES], instructions = perf[_IDE_PERF_INSTRUCTIONS];
+        if (cycles > 0 && instructions >= 0) {
+            printf("   IPC:         %.2f (%.0f instructions / %.0f cycles)\n", instructions / cycles, instructions, cycles);
+        } else {
+            printf("   IPC:         N/A (no hardware counters, software events only)\n");
+        }
+        double refs = perf[_IDE_PERF_CACHE_REFS], misses = perf[_IDE_PERF_CACHE_MISSES];
+        if (refs > 0 && misses >= 0) {
+            printf("   CACHE MISS:  %.2f%% (%.0f of %.0f refs)\n", 100.0 * misses / refs, misses, refs);
+        }
+        if (perf[_IDE_PERF_BRANCH_MISSES] >= 0) {
+            printf("   BRANCH MISS: %.0f\n", perf[_IDE_PERF_BRANCH_MISSES]);
+        }
+        if (perf[_IDE_PERF_TASK_CLOCK] >= 0) {
+            printf("   TASK CLOCK:  %.6f ms, %.0f page faults, %.0f context switches, %.0f migrations\n",
+                   perf[_IDE_PERF_TASK_CLOCK] / 1e6, perf[_IDE_PERF_PAGE_FAULTS],
+                   perf[_IDE_PERF_CONTEXT_SWITCHES], perf[_IDE_PERF_CPU_MIGRATIONS]);
+        }
+    }
+    if (report) {
+        printf("==========================================\n");
+    }
+    if (_IDE_HAS_METRICS_CHANNEL()) {
+        fflush(stdout);
+        _IDE_WRITE_METRICS(code_heap_bytes, perf);
+    } else if (_IDE_BENCHMARK) {
+        // Text fallback for runs started outside the IDE.
         printf("IDE_TIME=%.9f\n", _IDE_TOTAL_TIME);
         printf("IDE_CPU=%.9f\n", _IDE_TOTAL_CPU);
         printf("IDE_STEPS=%llu\n", (unsigned long long)_IDE_STEP_COUNT);
+        if (_IDE_CALIBRATED) {
+            printf("IDE_TRANSITIONS=%.9g\n", _IDE_REPORT_TRANSITIONS);
+            printf("IDE_OVERHEAD=%.9f\n", _IDE_REPORT_OVERHEAD);
+            printf("IDE_OVERHEAD_CPU=%.9f\n", _IDE_REPORT_OVERHEAD_CPU);
+            printf("IDE_OVERHEAD_SUBTRACTED=%d\n", _IDE_SUBTRACT_OVERHEAD);
+        }
+        printf("IDE_PRELOADED=%d\n", _IDE_PRELOADED);
+        if (_IDE_PEAK_MEM >= 0) printf("IDE_PEAK_MEM=%.0f\n", _IDE_PEAK_MEM);
+        if (_IDE_BASE_MEM >= 0) printf("IDE_BASE_MEM=%.0f\n", _IDE_BASE_MEM);
+        if (_IDE_ITERS > 0) {
+            printf("IDE_WARMUP=%ld\n", _IDE_WARMUP_COUNT);
+            printf("IDE_ITERS=%ld\n", _IDE_ITERS);
+        }
+        if (_IDE_ITER_SAMPLE_COUNT > 0) {
+            printf("IDE_ITER_SAMPLES=");
+            for (long i = 0; i < _IDE_ITER_SAMPLE_COUNT; i++) {
+                printf(i ? ",%.9g" : "%.9g", _IDE_ITER_SAMPLES[i]);
+            }
+            printf("\n");
+        }
+        for (int i = 0; i < _IDE_PERF_COUNT; i++) {
+            if (perf[i] >= 0) printf("IDE_PERF_%s=%.0f\n", _IDE_PERF_NAMES[i], perf[i]);
+        }
     }
 #ifdef _WIN32
     if (!_IDE_BENCHMARK) {
@@ -908,111 +1629,231 @@ void _IDE_PRINT_RESULT() {
     }
 #endif
 }
-// --------------------------
 
-#ifndef __cplusplus
-#define malloc(size) _IDE_malloc(size)
-#define calloc(n, s) _IDE_calloc(n, s)
-#define realloc(p, s) _IDE_realloc(p, s)
-#define free(p) _IDE_free(p)
-#endif
-"""
-        else:
-            timer_header = r"""
-#include <iostream>
-#include <stdio.h>
-#include <stdlib.h>
-#include <stdarg.h>
-#include <string.h>
-#include <time.h>
-#include <new>
-#ifdef _WIN32
-#include <windows.h>
-#include <psapi.h>
+static double _IDE_ENV_NUMBER(const char* name, double fallback) {
+    const char* value = getenv(name);
+    if (!value || !value[0]) return fallback;
+    return strtod(value, NULL);
+}
+
+static void _IDE_REWIND_STDIN(void) {
+    clearerr(stdin);
+    fseek(stdin, 0, SEEK_SET);
+    // Refill the whole-input buffer now rather than on the first timed read.
+    // This moves fd 0 to EOF, so it has to come before cin is reseeked.
+    if (_IDE_STDIN_BUFFERED) ungetc(getc(stdin), stdin);
+#ifdef __cplusplus
+    std::cin.clear();
+    std::cin.seekg(0, std::ios::beg);
+    std::cin.clear();
 #endif
+}
 
-// --- IDE INJECTED TIMER ---
-double _IDE_TOTAL_TIME = 0.0;  // wall time (no input)
-double _IDE_TOTAL_CPU = 0.0;   // cpu time
-int _IDE_IS_RUNNING = 0;
-int _IDE_BENCHMARK = 0;
-
-double _IDE_START_WALL = 0.0;
-double _IDE_START_CPU = 0.0;
-
-unsigned long long _IDE_STEP_COUNT = 0;
-
-#define _IDE_MAGIC 0xC0DEC0DEu
-typedef struct { size_t size; unsigned int magic; } _IDE_HDR;
-size_t _IDE_CUR_HEAP = 0;
-size_t _IDE_MAX_HEAP = 0;
-size_t _IDE_HEAP_BASE = 0;
-int _IDE_TRACK_HEAP = 0;
+// Copy all of stdin into a seekable file (a memfd on Linux, a temp file
+// elsewhere) so every iteration can re-read it. With buffer_all, stdin also
+// gets one stdio buffer big enough for the whole input, filled up front, so
+// scanf/getchar/fgets and synced cin never reach a read syscall; in C++ the
+// copy is kept for an unsynced cin (see _IDE_USE_MEMORY_CIN).
+static int _IDE_PREPARE_STDIN(int buffer_all) {
+    size_t size = 0, cap = 65536;
+    char* data = (char*)_IDE_raw_realloc(NULL, cap);
+    if (!data) return 0;
+    for (;;) {
+        if (size == cap) {
+            char* grown = (char*)_IDE_raw_realloc(data, cap * 2);
+            if (!grown) {
+                _IDE_raw_free(data);
+                return 0;
+            }
+            data = grown;
+            cap *= 2;
+        }
+        long n = (long)_IDE_READ(fileno(stdin), data + size, cap - size);
+        if (n <= 0) break;
+        size += (size_t)n;
+    }
 
-#ifndef IDE_STEP
-#define IDE_STEP() do { _IDE_STEP_COUNT++; } while (0)
-#endif
-#ifndef IDE_STEPN
-#define IDE_STEPN(n) do { _IDE_STEP_COUNT += (unsigned long long)(n); } while (0)
+    int fd = -1;
+    FILE* tmp = NULL;
+#if defined(__linux__) && defined(SYS_memfd_create)
+    fd = (int)syscall(SYS_memfd_create, "ide-stdin", 0);
 #endif
-
-#ifdef _WIN32
-SIZE_T _IDE_BASE_WS = 0;
-SIZE_T _IDE_BASE_PRIV = 0;
+    if (fd < 0) {
+        tmp = tmpfile();
+        if (tmp) fd = fileno(tmp);
+    }
+    size_t written = 0;
+    while (fd >= 0 && written < size) {
+        long n = (long)_IDE_WRITE(fd, data + written, (unsigned int)(size - written));
+        if (n <= 0) break;
+        written += (size_t)n;
+    }
+    int keep = 0;
+#ifdef __cplusplus
+    if (buffer_all) {
+        _IDE_STDIN_DATA = data;
+        _IDE_STDIN_SIZE = size;
+        _IDE_CIN_SYNCED = std::cin.rdbuf();
+        keep = 1;
+    }
 #endif
+    if (!keep) _IDE_raw_free(data);
+    if (fd < 0 || written < size || _IDE_DUP2(fd, fileno(stdin)) < 0) return 0;
+    if (!tmp) _IDE_CLOSE(fd);
+    if (buffer_all && setvbuf(stdin, NULL, _IOFBF, size + 1) == 0) {
+        _IDE_STDIN_BUFFERED = 1;
+    }
+    _IDE_REWIND_STDIN();
+    return 1;
+}
 
-static void* _IDE_raw_malloc(size_t size) { return malloc(size); }
-static void* _IDE_raw_realloc(void* ptr, size_t size) { return realloc(ptr, size); }
-static void _IDE_raw_free(void* ptr) { free(ptr); }
+static int _IDE_SILENCE_STDOUT(void) {
+    _IDE_FLUSH_STDOUT();
+    int saved = _IDE_DUP(fileno(stdout));
+    FILE* null_out = fopen(_IDE_NULL_DEVICE, "w");
+    if (saved < 0 || !null_out) return saved;
+    _IDE_DUP2(fileno(null_out), fileno(stdout));
+    fclose(null_out);
+    return saved;
+}
 
-void* _IDE_malloc(size_t size) {
-    size_t total = size + sizeof(_IDE_HDR);
-    _IDE_HDR* h = (_IDE_HDR*)_IDE_raw_malloc(total);
-    if (!h) return NULL;
-    h->size = size;
-    h->magic = _IDE_MAGIC;
-    _IDE_CUR_HEAP += size;
-    if (_IDE_TRACK_HEAP && _IDE_CUR_HEAP > _IDE_MAX_HEAP) _IDE_MAX_HEAP = _IDE_CUR_HEAP;
-    return (void*)(h + 1);
+static void _IDE_RESTORE_STDOUT(int saved) {
+    _IDE_FLUSH_STDOUT();
+    if (saved < 0) return;
+    _IDE_DUP2(saved, fileno(stdout));
+    _IDE_CLOSE(saved);
 }
 
-void* _IDE_calloc(size_t n, size_t size) {
-    size_t bytes = n * size;
-    void* p = _IDE_malloc(bytes);
-    if (p) memset(p, 0, bytes);
-    return p;
+static int _IDE_RUN_ITERATION(int (*entry)(int, char**), int argc, char** argv, double* wall, double* cpu) {
+    double start_wall = _IDE_TOTAL_TIME;
+    double start_cpu = _IDE_TOTAL_CPU;
+    _IDE_REWIND_STDIN();
+    _IDE_START();
+    int ret = entry(argc, argv);
+    _IDE_STOP();
+    *wall = _IDE_TOTAL_TIME - start_wall;
+    *cpu = _IDE_TOTAL_CPU - start_cpu;
+    return ret;
 }
 
-void* _IDE_realloc(void* ptr, size_t size) {
-    if (!ptr) return _IDE_malloc(size);
-    if (size == 0) { _IDE_raw_free(ptr); return NULL; }
-    _IDE_HDR* h = ((_IDE_HDR*)ptr) - 1;
-    if (h->magic != _IDE_MAGIC) {
-        return _IDE_raw_realloc(ptr, size);
+// Benchmark-mode repetition: the first call (with visible output) and K-1
+// further warmups are discarded, then the batch size doubles until one batch
+// takes at least IDE_MIN_TIME seconds. Reported times are per iteration.
+static int _IDE_REPEAT_MAIN(int (*entry)(int, char**), int argc, char** argv) {
+    long warmup = (long)_IDE_ENV_NUMBER("IDE_WARMUP", 2);
+    double min_time = _IDE_ENV_NUMBER("IDE_MIN_TIME", 0.2);
+    long max_iters = (long)_IDE_ENV_NUMBER("IDE_MAX_ITERS", 1000000);
+    long max_samples = (long)_IDE_ENV_NUMBER("IDE_MAX_SAMPLES", 1000);
+    if (warmup < 1) warmup = 1;
+    if (max_iters < 1) max_iters = 1;
+    if (max_samples < 1) max_samples = 1;
+
+    double wall = 0.0, cpu = 0.0;
+    int ret = _IDE_RUN_ITERATION(entry, argc, argv, &wall, &cpu);
+    unsigned long long first_steps = _IDE_STEP_COUNT;
+    size_t first_heap_base = _IDE_HEAP_BASE;
+    size_t first_heap_max = _IDE_MAX_HEAP;
+    if (ret != 0) {
+        _IDE_PRINT_RESULT();
+        return ret;
     }
-    size_t old = h->size;
-    size_t total = size + sizeof(_IDE_HDR);
-    _IDE_HDR* nh = (_IDE_HDR*)_IDE_raw_realloc(h, total);
-    if (!nh) return NULL;
-    nh->size = size;
-    nh->magic = _IDE_MAGIC;
-    if (size > old) _IDE_CUR_HEAP += (size - old);
-    else _IDE_CUR_HEAP -= (old - size);
-    if (_IDE_TRACK_HEAP && _IDE_CUR_HEAP > _IDE_MAX_HEAP) _IDE_MAX_HEAP = _IDE_CUR_HEAP;
-    return (void*)(nh + 1);
+
+    int saved_stdout = _IDE_SILENCE_STDOUT();
+    for (long i = 1; i < warmup && ret == 0; i++) {
+        ret = _IDE_RUN_ITERATION(entry, argc, argv, &wall, &cpu);
+    }
+
+    long batch = 1;
+    long ran = 0;
+    double* walls = NULL;
+    double* cpus = NULL;
+    double batch_wall = 0.0, batch_cpu = 0.0;
+    while (ret == 0) {
+        double* new_walls = (double*)_IDE_raw_realloc(walls, (size_t)batch * sizeof(double));
+        double* new_cpus = (double*)_IDE_raw_realloc(cpus, (size_t)batch * sizeof(double));
+        if (new_walls) walls = new_walls;
+        if (new_cpus) cpus = new_cpus;
+        if (!new_walls || !new_cpus) break;
+        batch_wall = 0.0;
+        batch_cpu = 0.0;
+        _IDE_PERF_READ(_IDE_PERF_OFFSET);
+        _IDE_TRANSITION_BASE = _IDE_TRANSITIONS;
+        for (ran = 0; ran < batch && ret == 0; ran++) {
+            ret = _IDE_RUN_ITERATION(entry, argc, argv, &walls[ran], &cpus[ran]);
+            batch_wall += walls[ran];
+            batch_cpu += cpus[ran];
+        }
+        if (ret != 0 || batch_wall >= min_time || batch >= max_iters) break;
+        batch = batch * 2 > max_iters ? max_iters : batch * 2;
+    }
+    _IDE_RESTORE_STDOUT(saved_stdout);
+
+    _IDE_STEP_COUNT = first_steps;
+    _IDE_HEAP_BASE = first_heap_base;
+    _IDE_MAX_HEAP = first_heap_max;
+    _IDE_WARMUP_COUNT = warmup;
+    _IDE_ITERS = ran;
+    if (ran > 0) {
+        batch = ran;
+        _IDE_PERF_DIVISOR = ran;
+        _IDE_TOTAL_TIME = batch_wall / (double)batch;
+        _IDE_TOTAL_CPU = batch_cpu / (double)batch;
+        // Long batches are folded into at most max_samples per-iteration means;
+        // cpus is no longer needed, so it holds the folded samples.
+        long groups = batch < max_samples ? batch : max_samples;
+        for (long g = 0; g < groups; g++) {
+            long lo = g * batch / groups;
+            long hi = (g + 1) * batch / groups;
+            double sum = 0.0;
+            for (long k = lo; k < hi; k++) sum += walls[k];
+            cpus[g] = sum / (double)(hi - lo);
+        }
+        _IDE_ITER_SAMPLES = cpus;
+        _IDE_ITER_SAMPLE_COUNT = groups;
+    }
+    _IDE_PRINT_RESULT();
+    _IDE_raw_free(walls);
+    _IDE_raw_free(cpus);
+    return ret;
 }
 
-void _IDE_free(void* ptr) {
-    if (!ptr) { _IDE_raw_free(ptr); return; }
-    _IDE_HDR* h = ((_IDE_HDR*)ptr) - 1;
-    if (h->magic != _IDE_MAGIC) {
-        _IDE_raw_free(ptr);
-        return;
+int _IDE_MAIN(int (*entry)(int, char**), int argc, char** argv) {
+    const char* ide_bench = getenv("IDE_BENCHMARK");
+    if (ide_bench && ide_bench[0] == '1') {
+        _IDE_BENCHMARK = 1;
     }
-    if (_IDE_CUR_HEAP >= h->size) _IDE_CUR_HEAP -= h->size;
-    else _IDE_CUR_HEAP = 0;
-    h->magic = 0;
-    _IDE_raw_free(h);
+    // Nobody watches prompts in benchmark runs; IDE_NO_FLUSH=1 drops the
+    // flush every input read would otherwise force.
+    const char* no_flush = getenv("IDE_NO_FLUSH");
+    if (_IDE_BENCHMARK && no_flush && no_flush[0] == '1') {
+        _IDE_FLUSH_ON_PAUSE = 0;
+    }
+    const char* subtract = getenv("IDE_SUBTRACT_OVERHEAD");
+    const char* report_overhead = getenv("IDE_REPORT_OVERHEAD");
+    _IDE_SUBTRACT_OVERHEAD = subtract && subtract[0] == '1';
+    const char* ide_repeat = getenv("IDE_REPEAT");
+    const char* ide_preload = getenv("IDE_PRELOAD_STDIN");
+    int repeat = _IDE_BENCHMARK && ide_repeat && ide_repeat[0] == '1';
+    int preload = _IDE_BENCHMARK && ide_preload && ide_preload[0] == '1';
+    // Input is copied before the first START, which takes the memory baseline.
+    int prepared = (repeat || preload) && _IDE_PREPARE_STDIN(preload);
+    // Only when the overhead is wanted; before the counters open, so
+    // calibration never shows up in them.
+    if (_IDE_SUBTRACT_OVERHEAD || (report_overhead && report_overhead[0] == '1')) {
+        _IDE_CALIBRATE();
+    }
+    _IDE_PERF_INIT();
+    _IDE_PRELOADED = preload && prepared;
+    if (repeat && prepared) {
+        return _IDE_REPEAT_MAIN(entry, argc, argv);
+    }
+    _IDE_START();
+    int ret = entry(argc, argv);
+    _IDE_PRINT_RESULT();
+    return ret;
+}
+
+#ifdef __cplusplus
 }
 
 void* operator new(std::size_t size) {
@@ -1034,376 +1875,2644 @@ void* operator new(std::size_t size, const std::nothrow_t&) noexcept { return _I
 void* operator new[](std::size_t size, const std::nothrow_t&) noexcept { return _IDE_malloc(size); }
 void operator delete(void* p, const std::nothrow_t&) noexcept { _IDE_free(p); }
 void operator delete[](void* p, const std::nothrow_t&) noexcept { _IDE_free(p); }
-
-double _IDE_WALL_SECONDS() {
-#ifdef _WIN32
-    static LARGE_INTEGER freq;
-    static int init = 0;
-    LARGE_INTEGER now;
-    if (!init) {
-        QueryPerformanceFrequency(&freq);
-        init = 1;
-    }
-    QueryPerformanceCounter(&now);
-    return (double)now.QuadPart / (double)freq.QuadPart;
-#elif defined(CLOCK_MONOTONIC)
-    struct timespec ts;
-    if (clock_gettime(CLOCK_MONOTONIC, &ts) == 0) {
-        return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
-    }
-    return 0.0;
-#else
-    return (double)clock() / (double)CLOCKS_PER_SEC;
 #endif
-}
+"""
 
-double _IDE_CPU_SECONDS() {
-#ifdef _WIN32
-    FILETIME create_time, exit_time, kernel_time, user_time;
-    if (GetProcessTimes(GetCurrentProcess(), &create_time, &exit_time, &kernel_time, &user_time)) {
-        ULARGE_INTEGER k, u;
-        k.LowPart = kernel_time.dwLowDateTime;
-        k.HighPart = kernel_time.dwHighDateTime;
-        u.LowPart = user_time.dwLowDateTime;
-        u.HighPart = user_time.dwHighDateTime;
-        return (double)(k.QuadPart + u.QuadPart) / 10000000.0;
-    }
-    return 0.0;
-#elif defined(CLOCK_PROCESS_CPUTIME_ID)
-    struct timespec ts;
-    if (clock_gettime(CLOCK_PROCESS_CPUTIME_ID, &ts) == 0) {
-        return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
-    }
-    return 0.0;
-#else
-    return (double)clock() / (double)CLOCKS_PER_SEC;
-#endif
+_PCH_LOCK = threading.Lock()
+_PCH_BUILDING = set()
+
+def pch_variant_for_code(code, lang):
+    if lang != "C++":
+        return "prelude"
+    match = re.search(r"^[ \t]*#[ \t]*include[ \t]*<bits/stdc\+\+\.h>", code, re.MULTILINE)
+    if not match:
+        return "prelude"
+    # Macros defined ahead of the include could change what it expands to.
+    if re.search(r"^[ \t]*#[ \t]*(define|undef)\b", code[:match.start()], re.MULTILINE):
+        return "prelude"
+    return "stdc++"
+
+def get_pch_paths(compiler, lang, variant, flags):
+    h = hashlib.sha256()
+    for part in (compiler, get_compiler_version(compiler), lang, variant, "\0".join(flags)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    pch_dir = os.path.join(PCH_DIR, h.hexdigest()[:16])
+    header = os.path.join(pch_dir, "ide_pch.h")
+    output = header + (".pch" if is_clang_compiler(compiler) else ".gch")
+    return pch_dir, header, output
+
+def remove_stale_pch_tmp(pch_dir):
+    """Delete `<pch>.<pid>.tmp` files left by builds whose IDE process is gone."""
+    for name in os.listdir(pch_dir):
+        parts = name.split(".")
+        if len(parts) < 3 or parts[-1] != "tmp" or not parts[-2].isdigit():
+            continue
+        pid = int(parts[-2])
+        if pid == os.getpid():
+            continue
+        if os.name != "nt":
+            try:
+                os.kill(pid, 0)
+                continue
+            except ProcessLookupError:
+                pass
+            except OSError:
+                continue
+        try:
+            os.remove(os.path.join(pch_dir, name))
+        except OSError:
+            pass
+
+def build_pch(compiler, lang, variant, flags):
+    pch_dir, header, output = get_pch_paths(compiler, lang, variant, flags)
+    failed_marker = os.path.join(pch_dir, "failed")
+    try:
+        os.makedirs(pch_dir, exist_ok=True)
+        remove_stale_pch_tmp(pch_dir)
+        text = PCH_PRELUDE[lang]
+        if variant == "stdc++":
+            text += "#include <bits/stdc++.h>\n"
+        with open(header, "w", encoding="utf-8") as f:
+            f.write(text)
+
+        tmp_output = f"{output}.{os.getpid()}.tmp"
+        header_lang = "c-header" if lang == "C" else "c++-header"
+        cmd = [compiler, "-x", header_lang, header, "-o", tmp_output] + list(flags)
+        res = subprocess.run(cmd, capture_output=True, text=True, **hidden_window_kwargs())
+        if res.returncode == 0 and os.path.exists(tmp_output):
+            os.replace(tmp_output, output)
+        else:
+            with open(failed_marker, "w", encoding="utf-8") as f:
+                f.write(res.stderr or res.stdout)
+            if os.path.exists(tmp_output):
+                os.remove(tmp_output)
+    except Exception:
+        pass
+    finally:
+        with _PCH_LOCK:
+            _PCH_BUILDING.discard(output)
+
+def get_pch_args(compiler, lang, variant, flags, wait=False):
+    """Return compiler args that use a ready PCH; otherwise start building it and return [].
+
+    Callers that may exit before a background build finishes (the CLI) pass
+    wait=True, so the build never outlives them.
+    """
+    pch_dir, header, output = get_pch_paths(compiler, lang, variant, flags)
+    if not os.path.exists(output):
+        if os.path.exists(os.path.join(pch_dir, "failed")):
+            return []
+        with _PCH_LOCK:
+            start = output not in _PCH_BUILDING
+            if start:
+                _PCH_BUILDING.add(output)
+        if start:
+            if wait:
+                build_pch(compiler, lang, variant, flags)
+            else:
+                threading.Thread(target=build_pch, args=(compiler, lang, variant, flags), daemon=True).start()
+        if not os.path.exists(output):
+            return []
+
+    if output.endswith(".pch"):
+        return ["-include-pch", output]
+    return ["-include", header]
+
+class BuildError(Exception):
+    def __init__(self, status, title, message):
+        super().__init__(message)
+        self.status = status
+        self.title = title
+
+_RUNTIME_LOCK = threading.Lock()
+
+def get_runtime_object(compiler, lang, flags, force_c=False):
+    h = hashlib.sha256()
+    for part in (compiler, get_compiler_version(compiler), lang, "\0".join(flags), IDE_RUNTIME_SOURCE):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    runtime_dir = os.path.join(RUNTIME_DIR, h.hexdigest()[:16])
+    obj_path = os.path.join(runtime_dir, "ide_runtime.o")
+
+    with _RUNTIME_LOCK:
+        if os.path.exists(obj_path):
+            return obj_path
+
+        os.makedirs(runtime_dir, exist_ok=True)
+        src_path = os.path.join(runtime_dir, "ide_runtime.c" if lang == "C" else "ide_runtime.cpp")
+        with open(src_path, "w", encoding="utf-8") as f:
+            f.write(IDE_RUNTIME_SOURCE)
+
+        tmp_path = f"{obj_path}.{os.getpid()}.tmp"
+        cmd = [compiler, "-c", src_path, "-o", tmp_path, "-O2"] + list(flags)
+        if force_c:
+            cmd[1:1] = ["-x", "c"]
+        try:
+            res = subprocess.run(cmd, capture_output=True, text=True, **hidden_window_kwargs())
+        except OSError as e:
+            raise BuildError("Compiler Missing", "Compiler Error", f"Could not run {compiler}: {e}")
+        if res.returncode != 0 or not os.path.exists(tmp_path):
+            raise BuildError(
+                "Runtime Build Failed",
+                "Runtime Build Failed",
+                "Failed to build the IDE timing runtime:\n" + (res.stderr or res.stdout),
+            )
+        os.replace(tmp_path, obj_path)
+    return obj_path
+
+def get_project_settings_path(name):
+    return os.path.join(PROJECTS_DIR, f"{name}.settings.json")
+
+def load_project_settings(name):
+    try:
+        with open(get_project_settings_path(name), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_project_settings(name, settings):
+    with open(get_project_settings_path(name), "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=2, sort_keys=True)
+
+def get_compile_history_path(name):
+    return os.path.join(PROJECTS_DIR, f"{name}.compile_history.json")
+
+def load_compile_history(name):
+    try:
+        with open(get_compile_history_path(name), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else []
+    except (OSError, ValueError):
+        return []
+
+def append_compile_history(name, entry):
+    history = load_compile_history(name)
+    history.append(entry)
+    history = history[-COMPILE_HISTORY_LIMIT:]
+    with open(get_compile_history_path(name), "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=1)
+
+def get_testcase_dir(name):
+    return os.path.join(PROJECTS_DIR, f"{name}_tests")
+
+def natural_sort_key(text):
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", text)]
+
+def list_testcases(name):
+    try:
+        files = os.listdir(get_testcase_dir(name))
+    except OSError:
+        return []
+    return sorted((f[:-3] for f in files if f.endswith(".in")), key=natural_sort_key)
+
+def load_testcase(name, case):
+    """Returns (input text, expected output or None)."""
+    base = os.path.join(get_testcase_dir(name), case)
+    with open(base + ".in", "r", encoding="utf-8") as f:
+        input_text = f.read()
+    try:
+        with open(base + ".out", "r", encoding="utf-8") as f:
+            expected = f.read()
+    except OSError:
+        expected = None
+    return input_text, expected
+
+def save_testcase(name, case, input_text, expected=None):
+    folder = get_testcase_dir(name)
+    os.makedirs(folder, exist_ok=True)
+    base = os.path.join(folder, case)
+    with open(base + ".in", "w", encoding="utf-8") as f:
+        f.write(input_text)
+    if expected is not None and expected.strip():
+        with open(base + ".out", "w", encoding="utf-8") as f:
+            f.write(expected)
+    elif os.path.exists(base + ".out"):
+        os.remove(base + ".out")
+
+def delete_testcase(name, case):
+    base = os.path.join(get_testcase_dir(name), case)
+    for path in (base + ".in", base + ".out"):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+TIME_REPORT_LINE = re.compile(
+    r"^\s*(\|?)(.+?)\s*:\s*([0-9.]+)\s*\(\s*\d+%\)\s*([0-9.]+)\s*\(\s*\d+%\)\s*([0-9.]+)\s*\(\s*\d+%\)"
+)
+TIME_REPORT_TOTAL = re.compile(r"^\s*TOTAL\s*:\s*([0-9.]+)\s+([0-9.]+)\s+([0-9.]+)")
+
+def parse_gcc_time_report(text):
+    phases = []
+    items = []
+    total = None
+    for line in text.splitlines():
+        total_match = TIME_REPORT_TOTAL.match(line)
+        if total_match:
+            total = float(total_match.group(3))
+            continue
+        match = TIME_REPORT_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(2).strip()
+        wall = float(match.group(5))
+        if name.startswith("phase "):
+            phases.append((name[len("phase "):], wall))
+        else:
+            items.append((name, wall))
+    items.sort(key=lambda item: item[1], reverse=True)
+    return {"phases": phases, "items": items[:15], "total": total}
+
+def parse_clang_time_trace(paths):
+    phases = []
+    items = {}
+    total = None
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                events = json.load(f).get("traceEvents", [])
+        except (OSError, ValueError, AttributeError):
+            continue
+        for event in events:
+            name = event.get("name", "")
+            dur = event.get("dur")
+            if dur is None:
+                continue
+            seconds = dur / 1e6
+            if name.startswith("Total "):
+                if name == "Total ExecuteCompiler":
+                    total = seconds
+                elif name in ("Total Frontend", "Total Backend", "Total Source", "Total PerformPendingInstantiations"):
+                    phases.append((name[len("Total "):], seconds))
+            elif name in ("Source", "InstantiateClass", "InstantiateFunction", "ParseClass"):
+                detail = event.get("args", {}).get("detail", "")
+                key = f"{name}: {detail}"
+                items[key] = max(items.get(key, 0.0), seconds)
+    top = sorted(items.items(), key=lambda item: item[1], reverse=True)[:15]
+    return {"phases": phases, "items": top, "total": total}
+
+# CPUs the IDE may use, as it was started, and the ones Isolated benchmarks
+# currently hold for themselves.
+_PROCESS_CPUS = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+_RESERVED_CPUS = set()
+_CPU_LOCK = threading.Lock()
+
+def get_available_cpus():
+    if _PROCESS_CPUS is not None:
+        with _CPU_LOCK:
+            cpus = [cpu for cpu in _PROCESS_CPUS if cpu not in _RESERVED_CPUS]
+        return cpus or list(_PROCESS_CPUS)
+    return list(range(os.cpu_count() or 1))
+
+def reserve_cpu(cpu):
+    with _CPU_LOCK:
+        _RESERVED_CPUS.add(cpu)
+
+def release_cpu(cpu):
+    with _CPU_LOCK:
+        _RESERVED_CPUS.discard(cpu)
+
+def use_available_cpus():
+    """Move the calling thread, and any process or thread it starts from now
+    on, onto the CPUs no Isolated benchmark has reserved. Affinity is per
+    thread, so the rest of the IDE is left alone."""
+    if _PROCESS_CPUS is None:
+        return
+    try:
+        os.sched_setaffinity(0, get_available_cpus())
+    except OSError:
+        pass
+
+def make_benchmark_preexec(limits=None):
+    """preexec_fn that applies judge rlimits, which must be in place before
+    exec. Nothing else goes here: preexec_fn is unsafe with other threads
+    running, so pinning and nice are applied from the parent (see
+    make_benchmark_launcher) and ASLR is disabled with setarch."""
+    if os.name == "nt" or not limits:
+        return None
+    import resource
+
+    def preexec():
+        # SIGXCPU at the limit, SIGKILL a second later if it is ignored.
+        cpu_s = max(1, math.ceil(limits["time"]))
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_s, cpu_s + 1))
+        if limits["memory"]:
+            resource.setrlimit(resource.RLIMIT_AS, (limits["memory"], limits["memory"]))
+
+    return preexec
+
+def make_benchmark_launcher(cpu=None, nice=None):
+    """on_spawn callback for run_captured that pins and renices the child
+    right after it starts, before the runtime's timer does."""
+    if os.name == "nt" or (cpu is None and nice is None):
+        return None
+
+    def on_spawn(proc):
+        try:
+            if cpu is not None and hasattr(os, "sched_setaffinity"):
+                os.sched_setaffinity(proc.pid, {cpu})
+            if nice is not None:
+                os.setpriority(os.PRIO_PROCESS, proc.pid, nice)
+        except OSError:
+            pass
+
+    return on_spawn
+
+def benchmark_command(exe_path, no_aslr=False):
+    # setarch -R execs the program with ADDR_NO_RANDOMIZE set (same pid).
+    if no_aslr:
+        return [shutil.which("setarch"), os.uname().machine, "-R", exe_path]
+    return [exe_path]
+
+def format_cpu_list(cpus):
+    return ",".join(str(cpu) for cpu in cpus)
+
+# Two-sided 95% Student t critical values by degrees of freedom.
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+    9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042,
+    40: 2.021, 60: 2.000, 120: 1.980,
 }
 
-void _IDE_START() {
-    if (!_IDE_IS_RUNNING) {
-        _IDE_START_WALL = _IDE_WALL_SECONDS();
-        _IDE_START_CPU = _IDE_CPU_SECONDS();
-#ifdef _WIN32
-        PROCESS_MEMORY_COUNTERS_EX pmc;
-        if (GetProcessMemoryInfo(GetCurrentProcess(), (PROCESS_MEMORY_COUNTERS*)&pmc, sizeof(pmc))) {
-            _IDE_BASE_WS = pmc.WorkingSetSize;
-            _IDE_BASE_PRIV = pmc.PrivateUsage;
-        }
-#endif
-        _IDE_HEAP_BASE = _IDE_CUR_HEAP;
-        _IDE_MAX_HEAP = _IDE_CUR_HEAP;
-        _IDE_TRACK_HEAP = 1;
-        _IDE_IS_RUNNING = 1;
-    }
+def t_critical_95(df):
+    for limit in sorted(T_CRITICAL_95):
+        if df <= limit:
+            return T_CRITICAL_95[limit]
+    return 1.960
+
+def relative_ci_half_width(samples):
+    if len(samples) < 2:
+        return None
+    mean = statistics.mean(samples)
+    if mean <= 0:
+        return None
+    half = t_critical_95(len(samples) - 1) * statistics.stdev(samples) / math.sqrt(len(samples))
+    return half / mean
+
+class AdaptiveStopper:
+    """Decides when a series of timing samples is precise enough to stop."""
+
+    def __init__(self, target, min_runs, max_runs, budget):
+        self.target = target
+        self.min_runs = min_runs
+        self.max_runs = max_runs
+        self.budget = budget
+        self.started = time.time()
+
+    def start(self):
+        self.started = time.time()
+
+    def check(self, samples):
+        n = len(samples)
+        rel = relative_ci_half_width(samples)
+        if n >= self.min_runs and rel is not None and rel <= self.target:
+            return f"95% CI \u00b1{rel * 100:.2f}% reached target \u00b1{self.target * 100:g}% after {n} runs"
+        if n >= self.max_runs:
+            return f"max runs ({self.max_runs}) reached, 95% CI \u00b1{(rel or 0) * 100:.2f}%"
+        if time.time() - self.started >= self.budget:
+            ci = f"\u00b1{rel * 100:.2f}%" if rel is not None else "n/a"
+            return f"time budget ({self.budget:g} s) used after {n} runs, 95% CI {ci}"
+        return None
+
+# --- OUTPUT CAPTURE ---
+
+# Tag -> (metric name, struct format) for the runtime's binary metrics record.
+METRIC_TAGS = {
+    1: ("IDE_TIME", "d"),
+    2: ("IDE_CPU", "d"),
+    3: ("IDE_STEPS", "Q"),
+    4: ("IDE_PEAK_MEM", "d"),
+    5: ("IDE_BASE_MEM", "d"),
+    6: ("IDE_ITERS", "Q"),
+    7: ("IDE_WARMUP", "Q"),
+    8: ("IDE_ITER_SAMPLES", "d"),
+    9: ("IDE_CODE_HEAP", "Q"),
+    # 10-18 are the PERF_FIELDS counters below.
+    19: ("IDE_ALLOC_FAILED", "Q"),
+    20: ("IDE_TRANSITIONS", "d"),
+    21: ("IDE_OVERHEAD", "d"),
+    22: ("IDE_OVERHEAD_CPU", "d"),
+    23: ("IDE_OVERHEAD_SUBTRACTED", "Q"),
+    24: ("IDE_PRELOADED", "Q"),
 }
 
-void _IDE_PAUSE() {
-    fflush(stdout);
-    std::cout.flush();
-    if (_IDE_IS_RUNNING) {
-        double end_wall = _IDE_WALL_SECONDS();
-        double end_cpu = _IDE_CPU_SECONDS();
-        _IDE_TOTAL_TIME += (end_wall - _IDE_START_WALL);
-        _IDE_TOTAL_CPU += (end_cpu - _IDE_START_CPU);
-        _IDE_IS_RUNNING = 0;
+# Counters from IDE_PERF=1 runs; tags 10.. follow this order. task_clock is
+# in nanoseconds, the rest are counts (per iteration with in-process repeat).
+PERF_FIELDS = [
+    "cycles",
+    "instructions",
+    "cache_refs",
+    "cache_misses",
+    "branch_misses",
+    "task_clock",
+    "page_faults",
+    "context_switches",
+    "cpu_migrations",
+]
+METRIC_TAGS.update({10 + i: ("IDE_PERF_" + field.upper(), "d") for i, field in enumerate(PERF_FIELDS)})
+
+def decode_metrics_record(data):
+    """Decode the runtime's metrics record into {name: value}; array tags
+    become lists. Unknown tags are skipped and a truncated record keeps
+    whatever was complete."""
+    metrics = {}
+    header = len(METRICS_MAGIC) + 1
+    if len(data) < header or not data.startswith(METRICS_MAGIC) or data[header - 1] != METRICS_VERSION:
+        return metrics
+    pos = header
+    while pos + 5 <= len(data):
+        tag = data[pos]
+        (size,) = struct.unpack_from("=I", data, pos + 1)
+        pos += 5
+        payload = data[pos:pos + size]
+        pos += size
+        if len(payload) < size:
+            break
+        if tag not in METRIC_TAGS:
+            continue
+        name, fmt = METRIC_TAGS[tag]
+        width = struct.calcsize("=" + fmt)
+        values = list(struct.unpack(f"={size // width}{fmt}", payload[:size - size % width]))
+        if name == "IDE_ITER_SAMPLES":
+            metrics[name] = values
+        elif values:
+            metrics[name] = values[0]
+    return metrics
+
+def read_metrics_file(path):
+    try:
+        with open(path, "rb") as f:
+            return decode_metrics_record(f.read())
+    except OSError:
+        return {}
+
+class OutputCapture:
+    """Bounded view of a child's output: first/last bytes, and optionally a
+    SHA-256 of (and a spill file with) the full stream."""
+
+    def __init__(self, head_bytes=CAPTURE_HEAD_BYTES, tail_bytes=CAPTURE_TAIL_BYTES, hash_output=False, spill_path=None):
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+        self._hash = hashlib.sha256() if hash_output else None
+        self._spill = open(spill_path, "wb") if spill_path else None
+
+    def feed(self, chunk):
+        self.total += len(chunk)
+        if self._hash:
+            self._hash.update(chunk)
+        if self._spill:
+            self._spill.write(chunk)
+
+        room = self.head_bytes - len(self.head)
+        if room > 0:
+            self.head += chunk[:room]
+            rest = chunk[room:]
+        else:
+            rest = chunk
+        if rest:
+            self.tail += rest
+            if len(self.tail) > 2 * self.tail_bytes:
+                del self.tail[:-self.tail_bytes]
+
+    def close(self):
+        if self._spill:
+            self._spill.close()
+            self._spill = None
+
+    @property
+    def digest(self):
+        return self._hash.hexdigest() if self._hash else None
+
+    @property
+    def truncated(self):
+        return self.total > len(self.head) + min(len(self.tail), self.tail_bytes)
+
+    def text(self):
+        tail = bytes(self.tail[-self.tail_bytes:])
+        if not self.truncated:
+            data = bytes(self.head) + tail
+            return data.decode("utf-8", "replace")
+        omitted = self.total - len(self.head) - len(tail)
+        return (
+            bytes(self.head).decode("utf-8", "replace")
+            + f"\n... [{omitted} bytes of output omitted] ...\n"
+            + tail.decode("utf-8", "replace")
+        )
+
+# Parent-side accounting of one reaped child (os.wait4). CPU in seconds,
+# max_rss in bytes, the rest are counts.
+RUSAGE_FIELDS = ["user", "sys", "max_rss", "minflt", "majflt", "nvcsw", "nivcsw"]
+
+def rusage_to_dict(ru):
+    import resource  # POSIX only, like os.wait4 itself
+
+    # ru_maxrss is kilobytes on Linux/BSD but bytes on macOS.
+    rss_scale = 1 if sys.platform == "darwin" else 1024
+    # Linux carries the peak RSS of the forking process across exec, so a
+    # child that stays below the IDE's own peak cannot be measured this way;
+    # run_captured fills those in from the runtime's VmHWM.
+    max_rss = ru.ru_maxrss * rss_scale
+    if ru.ru_maxrss <= resource.getrusage(resource.RUSAGE_SELF).ru_maxrss:
+        max_rss = None
+    return {
+        "user": ru.ru_utime,
+        "sys": ru.ru_stime,
+        "max_rss": max_rss,
+        "minflt": ru.ru_minflt,
+        "majflt": ru.ru_majflt,
+        "nvcsw": ru.ru_nvcsw,
+        "nivcsw": ru.ru_nivcsw,
     }
-}
 
-void _IDE_RESUME() {
-    _IDE_START();
-}
+def reap_process(proc):
+    """Wait for `proc` and return (returncode, usage). Where os.wait4 exists
+    the child is reaped with it so its rusage comes back too; otherwise usage
+    is None."""
+    if not hasattr(os, "wait4"):
+        return proc.wait(), None
+    try:
+        _, status, ru = os.wait4(proc.pid, 0)
+    except ChildProcessError:
+        # Someone else already reaped it; the exit code is still known.
+        return proc.wait(), None
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return proc.returncode, rusage_to_dict(ru)
+
+def format_usage(usages):
+    """One line of per-run medians for a list of rusage dicts, or None."""
+    usages = [u for u in usages if u]
+    if not usages:
+        return None
 
-int _IDE_SCANF(const char* fmt, ...) {
-    _IDE_PAUSE();
-    va_list args;
-    va_start(args, fmt);
-    int r = vscanf(fmt, args);
-    va_end(args);
-    _IDE_RESUME();
-    return r;
-}
+    def med(key):
+        return statistics.median(u[key] for u in usages)
+
+    rss = [u["max_rss"] for u in usages if u["max_rss"] is not None]
+    rss_text = f"{statistics.median(rss) / (1024.0 * 1024.0):.2f} MB" if rss else "n/a"
+    return (
+        f"user {med('user'):.6f} s, sys {med('sys'):.6f} s, "
+        f"max RSS {rss_text}, "
+        f"page faults {med('minflt'):.0f} minor / {med('majflt'):.0f} major, "
+        f"context switches {med('nvcsw'):.0f} voluntary / {med('nivcsw'):.0f} involuntary"
+    )
+
+def parse_perf_counters(metrics):
+    """{field: value} for the counters a run reported, or None."""
+    counters = {}
+    for field in PERF_FIELDS:
+        value = parse_metric(metrics, "IDE_PERF_" + field.upper())
+        if value is not None:
+            counters[field] = value
+    return counters or None
+
+def format_perf(counter_sets):
+    """One line of per-run medians (IPC and miss rates per run first), or None."""
+    counter_sets = [c for c in counter_sets if c]
+    if not counter_sets:
+        return None
+
+    def med(values):
+        values = [v for v in values if v is not None]
+        return statistics.median(values) if values else None
+
+    def ratio(c, num, den):
+        return c[num] / c[den] if c.get(num) is not None and c.get(den) else None
+
+    parts = []
+    ipc = med(ratio(c, "instructions", "cycles") for c in counter_sets)
+    if ipc is not None:
+        parts.append(f"IPC {ipc:.2f}")
+    miss_rate = med(ratio(c, "cache_misses", "cache_refs") for c in counter_sets)
+    if miss_rate is not None:
+        parts.append(f"cache misses {miss_rate * 100.0:.2f}% of refs")
+    labels = [
+        ("cycles", "cycles"),
+        ("instructions", "instructions"),
+        ("branch_misses", "branch misses"),
+        ("page_faults", "page faults"),
+        ("context_switches", "context switches"),
+        ("cpu_migrations", "migrations"),
+    ]
+    for field, label in labels:
+        value = med(c.get(field) for c in counter_sets)
+        if value is not None:
+            parts.append(f"{label} {value:.0f}")
+    task_clock = med(c.get("task_clock") for c in counter_sets)
+    if task_clock is not None:
+        parts.append(f"task-clock {task_clock / 1e6:.6f} ms")
+    text = ", ".join(parts)
+    if ipc is None:
+        text += " (no hardware counters, software events only)"
+    return text
+
+class CapturedRun:
+    def __init__(self, returncode, capture, metrics, usage=None, timed_out=False):
+        self.returncode = returncode
+        self.capture = capture
+        self.metrics = metrics
+        self.usage = usage
+        self.timed_out = timed_out
+        self.verdict = None
+        self.output = capture.text()
+
+def run_captured(cmd, input_data="", env=None, preexec_fn=None, hash_output=False, spill_path=None, stderr_path=None, timeout=None, on_spawn=None):
+    """Run `cmd` with stdout+stderr streamed through an OutputCapture (stderr
+    goes to `stderr_path` instead when given). Metrics come back over a
+    separate channel (an inherited pipe, or a temp file on Windows) so program
+    output can never be mistaken for them. After `timeout` seconds of wall
+    time the child is killed and the result is marked timed_out. `on_spawn`
+    gets the Popen object as soon as the child exists."""
+    capture = OutputCapture(hash_output=hash_output, spill_path=spill_path)
+    env = dict(os.environ if env is None else env)
+    env.pop("IDE_METRICS_FD", None)
+    env.pop("IDE_METRICS_FILE", None)
+    popen_kwargs = hidden_window_kwargs()
+    metrics_read = metrics_write = metrics_path = None
+    if os.name == "nt":
+        fd, metrics_path = tempfile.mkstemp(prefix="ide_metrics_", suffix=".bin")
+        os.close(fd)
+        env["IDE_METRICS_FILE"] = metrics_path
+    else:
+        metrics_read, metrics_write = os.pipe()
+        env["IDE_METRICS_FD"] = str(metrics_write)
+        popen_kwargs["pass_fds"] = (metrics_write,)
+
+    stderr_file = open(stderr_path, "wb") if stderr_path else None
+    use_available_cpus()
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file or subprocess.STDOUT,
+            env=env,
+            bufsize=0,
+            preexec_fn=preexec_fn,
+            **popen_kwargs,
+        )
+    except Exception:
+        capture.close()
+        if metrics_read is not None:
+            os.close(metrics_read)
+        if metrics_path:
+            os.remove(metrics_path)
+        raise
+    finally:
+        if metrics_write is not None:
+            os.close(metrics_write)
+        if stderr_file:
+            stderr_file.close()
+    if on_spawn:
+        on_spawn(proc)
+
+    metrics_data = []
+
+    def drain_metrics():
+        with os.fdopen(metrics_read, "rb") as f:
+            metrics_data.append(f.read())
+
+    def feed_stdin():
+        try:
+            if input_data:
+                proc.stdin.write(input_data.encode("utf-8") if isinstance(input_data, str) else input_data)
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+    timed_out = []
+
+    def expire():
+        timed_out.append(True)
+        try:
+            proc.kill()
+        except OSError:
+            pass
+
+    timer = None
+    if timeout:
+        timer = threading.Timer(timeout, expire)
+        timer.daemon = True
+        timer.start()
+
+    writer = threading.Thread(target=feed_stdin, daemon=True)
+    writer.start()
+    reader = None
+    if metrics_read is not None:
+        reader = threading.Thread(target=drain_metrics, daemon=True)
+        reader.start()
+    try:
+        while True:
+            chunk = proc.stdout.read(CAPTURE_CHUNK_BYTES)
+            if not chunk:
+                break
+            capture.feed(chunk)
+    finally:
+        proc.stdout.close()
+        returncode, usage = reap_process(proc)
+        if timer is not None:
+            timer.cancel()
+        writer.join()
+        capture.close()
+        if reader is not None:
+            reader.join()
+    if metrics_path:
+        metrics = read_metrics_file(metrics_path)
+        try:
+            os.remove(metrics_path)
+        except OSError:
+            pass
+    else:
+        metrics = decode_metrics_record(b"".join(metrics_data))
+    if usage is not None and usage["max_rss"] is None:
+        peak = parse_metric(metrics, "IDE_PEAK_MEM")
+        usage["max_rss"] = peak if peak and peak > 0 else None
+    return CapturedRun(returncode, capture, metrics, usage, bool(timed_out))
+
+def make_judge_limits(time_limit=JUDGE_DEFAULT_TIME_LIMIT, memory_mb=JUDGE_DEFAULT_MEMORY_MB):
+    if time_limit <= 0:
+        raise ValueError("The judge time limit must be positive.")
+    if memory_mb is not None and memory_mb < 0:
+        raise ValueError("The judge memory limit cannot be negative.")
+    return {"time": float(time_limit), "memory": int(memory_mb * 1024 * 1024) if memory_mb else None}
+
+def describe_limits(limits):
+    text = f"judge: {limits['time']:g} s"
+    if limits["memory"]:
+        text += f", {limits['memory'] // (1024 * 1024)} MB"
+    return text
+
+def judge_verdict(res, limits):
+    """OK, TLE, MLE, or RE with the signal or exit code, for one judged run."""
+    if res.timed_out:
+        return "TLE"
+    if parse_metric(res.metrics, "IDE_ALLOC_FAILED", int):
+        return "MLE"
+    rc = res.returncode
+    cpu_used = res.usage["user"] + res.usage["sys"] if res.usage else None
+    if rc is not None and rc < 0:
+        sig = -rc
+        if sig == getattr(signal, "SIGXCPU", None):
+            return "TLE"
+        if sig == signal.SIGKILL and cpu_used is not None and cpu_used >= limits["time"]:
+            return "TLE"
+        try:
+            name = signal.Signals(sig).name
+        except ValueError:
+            name = f"signal {sig}"
+        return f"RE ({name})"
+    if rc:
+        return f"RE (exit code {rc})"
+    t, _, _, _ = parse_ide_metrics(res.metrics)
+    if t is not None and t > limits["time"]:
+        return "TLE"
+    peak = parse_metric(res.metrics, "IDE_PEAK_MEM")
+    if limits["memory"] and peak is not None and peak > limits["memory"]:
+        return "MLE"
+    return "OK"
+
+def run_judged(cmd, input_data, env, limits, preexec_fn=None, **kwargs):
+    """run_captured under judge limits (RLIMIT_* come from `preexec_fn`, see
+    make_benchmark_preexec); the result carries a verdict."""
+    env = dict(env, IDE_JUDGE="1")
+    # Verdicts do not use the timer overhead, so skip calibrating it.
+    env.pop("IDE_REPORT_OVERHEAD", None)
+    timeout = limits["time"] * JUDGE_WALL_FACTOR + 1.0
+    try:
+        res = run_captured(cmd, input_data, env=env, preexec_fn=preexec_fn, timeout=timeout, **kwargs)
+    except OSError as e:
+        if e.errno != errno.ENOMEM:
+            raise
+        # exec itself did not fit under RLIMIT_AS (e.g. huge static arrays).
+        res = CapturedRun(None, OutputCapture(), {})
+        res.output = str(e)
+        res.verdict = "MLE"
+        return res
+    res.verdict = judge_verdict(res, limits)
+    return res
+
+def count_verdicts(verdicts):
+    """ "3 OK, 1 TLE" for a list of verdicts (RE variants are counted together)."""
+    counts = {}
+    for verdict in verdicts:
+        key = verdict.split()[0]
+        counts[key] = counts.get(key, 0) + 1
+    return ", ".join(f"{n} {key}" for key, n in counts.items())
+
+# --- STATISTICS ---
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    pos = (len(sorted_values) - 1) * q / 100.0
+    lo = int(math.floor(pos))
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+def bootstrap_ci(samples, estimator=statistics.median, confidence=0.95, seed=0):
+    if len(samples) < 2:
+        value = estimator(samples) if samples else None
+        return value, value
+    # Fewer resamples for long series keep the cost bounded.
+    resamples = max(200, min(BOOTSTRAP_RESAMPLES, BOOTSTRAP_MAX_WORK // len(samples)))
+    rng = random.Random(seed)
+    n = len(samples)
+    estimates = sorted(estimator([samples[rng.randrange(n)] for _ in range(n)]) for _ in range(resamples))
+    tail = (1.0 - confidence) * 50.0
+    return percentile(estimates, tail), percentile(estimates, 100.0 - tail)
+
+class SampleStats:
+    """Robust summary of one series of samples; the raw samples are kept."""
+
+    def __init__(self, samples):
+        self.samples = list(samples)
+        values = sorted(self.samples)
+        self.count = len(values)
+        self.mean = statistics.mean(values) if values else None
+        self.stdev = statistics.pstdev(values) if len(values) > 1 else 0.0
+        self.median = statistics.median(values) if values else None
+        self.min = values[0] if values else None
+        self.max = values[-1] if values else None
+        self.p90 = percentile(values, 90)
+        self.p99 = percentile(values, 99)
+        self.mad = statistics.median([abs(v - self.median) for v in values]) if values else None
+        self.ci_low, self.ci_high = bootstrap_ci(values)
+
+        q1 = percentile(values, 25)
+        q3 = percentile(values, 75)
+        self.outliers = []
+        if values:
+            spread = OUTLIER_IQR_FACTOR * (q3 - q1)
+            low, high = q1 - spread, q3 + spread
+            self.outliers = [i for i, v in enumerate(self.samples) if v < low or v > high]
+
+    def to_dict(self):
+        keys = ["count", "mean", "stdev", "median", "min", "max", "p90", "p99", "mad", "ci_low", "ci_high", "outliers"]
+        return {key: getattr(self, key) for key in keys}
+
+    def describe(self, label, unit="s", scale=1.0, fmt=".9f"):
+        if not self.count:
+            return [f"{label}: no samples"]
+
+        suffix = f" {unit}" if unit else ""
+
+        def f(value):
+            return f"{value / scale:{fmt}}"
+
+        lines = [
+            f"{label}: median {f(self.median)}{suffix}, mean {f(self.mean)}{suffix}, "
+            f"min {f(self.min)}{suffix}, max {f(self.max)}{suffix}",
+            f"  p90 {f(self.p90)}, p99 {f(self.p99)}, MAD {f(self.mad)}, std dev {f(self.stdev)}",
+        ]
+        if self.count > 1:
+            lines.append(f"  95% CI of median (bootstrap): [{f(self.ci_low)}, {f(self.ci_high)}]{suffix}")
+        if self.outliers:
+            runs = ", ".join(str(i + 1) for i in self.outliers[:10])
+            more = "..." if len(self.outliers) > 10 else ""
+            lines.append(f"  Outliers (outside {OUTLIER_IQR_FACTOR:g} IQR): {len(self.outliers)} (samples {runs}{more})")
+        return lines
+
+class BenchmarkResult:
+    """All raw measurements of one benchmark, plus how they were collected."""
+
+    def __init__(self, profile, mode, stop_reason=None, warmup=None):
+        self.profile = profile
+        self.mode = mode
+        self.stop_reason = stop_reason
+        self.warmup = warmup
+        self.output_path = None
+        self.runs = []
+        self.iteration_samples = []
+        self._stats = {}
+
+    def add_run(self, core, time_s, cpu=None, mem=None, steps=None, iters=None, iter_samples=None, usage=None, perf=None, verdict=None):
+        run = {
+            "run": len(self.runs) + 1,
+            "core": core,
+            "verdict": verdict,
+            "time": time_s,
+            "cpu": cpu,
+            "mem": mem,
+            "steps": steps,
+            "iters": iters,
+        }
+        for key in RUSAGE_FIELDS:
+            run[key] = usage[key] if usage else None
+        for key in PERF_FIELDS:
+            run[key] = perf.get(key) if perf else None
+        self.runs.append(run)
+        self.iteration_samples.extend(iter_samples or [])
+        self._stats = {}
+
+    def series(self, key):
+        return [run[key] for run in self.runs if run[key] is not None]
+
+    def stats(self, key):
+        if key not in self._stats:
+            values = self.iteration_samples if key == "iteration" else self.series(key)
+            self._stats[key] = SampleStats(values)
+        return self._stats[key]
+
+    def to_dict(self):
+        stats = {"time": self.stats("time").to_dict()}
+        for key in ["cpu", "mem", "steps"] + RUSAGE_FIELDS + PERF_FIELDS:
+            if self.series(key):
+                stats[key] = self.stats(key).to_dict()
+        if len(self.iteration_samples) > 1:
+            stats["iteration"] = self.stats("iteration").to_dict()
+        return {
+            "profile": self.profile,
+            "mode": self.mode,
+            "stop_reason": self.stop_reason,
+            "warmup": self.warmup,
+            "output_path": self.output_path,
+            "runs": self.runs,
+            "stats": stats,
+        }
+
+    def to_text(self):
+        lines = [f"Profile: {self.profile}", f"Mode: {self.mode}", f"Runs: {len(self.runs)}"]
+        if self.stop_reason:
+            lines.append(f"Stopped: {self.stop_reason}")
+        verdicts = [run["verdict"] for run in self.runs if run["verdict"]]
+        if verdicts:
+            lines.append(f"Verdicts: {count_verdicts(verdicts)}")
+            for run in self.runs:
+                if run["verdict"] != "OK":
+                    lines.append(f"  Run {run['run']}: {run['verdict']}")
+        lines.extend(self.stats("time").describe("Time"))
+        overhead = format_overhead(self.runs)
+        if overhead:
+            lines.append(f"Timer overhead (median per run): {overhead}")
+        if self.series("cpu"):
+            lines.extend(self.stats("cpu").describe("CPU time"))
+        usage = format_usage([run for run in self.runs if run["user"] is not None])
+        if usage:
+            lines.append(f"Rusage (median per run, whole process): {usage}")
+        perf = format_perf([{key: run[key] for key in PERF_FIELDS if run[key] is not None} for run in self.runs])
+        if perf:
+            lines.append(f"Counters (median per run, timed region): {perf}")
+        if self.series("mem"):
+            lines.extend(self.stats("mem").describe("Memory delta", unit="MB", scale=1024.0 * 1024.0, fmt=".2f"))
+        if self.series("steps"):
+            lines.extend(self.stats("steps").describe("Steps", unit="", fmt=".0f"))
+        iters = self.series("iters")
+        if iters:
+            lines.append(
+                f"In-process repeat: {min(iters)}-{max(iters)} iterations/run after {self.warmup} warmup "
+                "(times are per iteration)"
+            )
+        if len(self.iteration_samples) > 1:
+            lines.extend(self.stats("iteration").describe("Per-iteration"))
+        sizes = [run["output_bytes"] for run in self.runs if run.get("output_bytes") is not None]
+        if sizes:
+            digest = self.runs[0].get("output_sha256")
+            lines.append(
+                f"Output: {min(sizes)}-{max(sizes)} bytes/run"
+                + (f", run 1 sha256 {digest[:16]}" if digest else "")
+            )
+        if self.output_path:
+            lines.append(f"Full output of run 1 saved to: {self.output_path}")
+        cores = sorted({run["core"] for run in self.runs if run["core"] is not None})
+        if len(cores) > 1:
+            for core in cores:
+                values = [run["time"] for run in self.runs if run["core"] == core and run["time"] is not None]
+                if not values:
+                    continue
+                lines.append(f"Core {core}: {len(values)} runs, median {statistics.median(values):.9f} s")
+        return "\n".join(lines)
+
+class ComplexityPoint:
+    def __init__(self, n, times, mems, steps, note=None, usages=None, perfs=None, verdicts=None, overheads=None):
+        self.n = n
+        self.times = times
+        self.mems = mems
+        self.steps = steps
+        self.note = note
+        self.usages = usages or []
+        self.perfs = perfs or []
+        self.verdicts = verdicts or []
+        self.overheads = overheads or []
+        self.time_stats = SampleStats(times)
+
+class ComplexityResult:
+    """Raw per-N samples of a complexity sweep; fits and plots use per-N medians."""
+
+    def __init__(self, profile, points, best_fit=None):
+        self.profile = profile
+        self.points = points
+        self.best_fit = best_fit
+
+    @property
+    def n_values(self):
+        return [point.n for point in self.points if point.times]
+
+    @property
+    def times(self):
+        return [point.time_stats.median for point in self.points if point.times]
+
+    def to_text(self):
+        lines = [f"Profile: {self.profile}", "Timing by N (fit uses medians):"]
+        if any(point.steps for point in self.points):
+            lines.append("(steps shown are worst observed per N)")
+        for point in self.points:
+            st = point.time_stats
+            if not st.count:
+                lines.append(f"N={point.n}: no successful runs ({count_verdicts(point.verdicts)})")
+                continue
+            row = (
+                f"N={point.n}: median {st.median:.9f}s (mean {st.mean:.9f}s, MAD {st.mad:.9f}s, "
+                f"{st.count} runs"
+            )
+            if st.outliers:
+                row += f", {len(st.outliers)} outliers"
+            if any(verdict != "OK" for verdict in point.verdicts):
+                row += f"; {count_verdicts(point.verdicts)}"
+            row += ")"
+            if point.mems:
+                row += f", mem delta {statistics.median(point.mems) / (1024.0 * 1024.0):.2f} MB"
+            if point.steps:
+                row += f", worst steps {max(point.steps)}"
+            lines.append(row)
+            overhead = format_overhead(point.overheads)
+            if overhead:
+                lines.append(f"  timer overhead: {overhead}")
+            usage = format_usage(point.usages)
+            if usage:
+                lines.append(f"  rusage: {usage}")
+            perf = format_perf(point.perfs)
+            if perf:
+                lines.append(f"  counters: {perf}")
+        notes = [f"N={point.n}: {point.note}" for point in self.points if point.note]
+        if notes:
+            lines.append("")
+            lines.append("Stop reasons:")
+            lines.extend(notes)
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {
+            "profile": self.profile,
+            "best_fit": self.best_fit,
+            "points": [
+                {
+                    "n": point.n,
+                    "stop_reason": point.note,
+                    "time": point.time_stats.to_dict(),
+                    "times": point.times,
+                    "mems": point.mems,
+                    "steps": point.steps,
+                    "usage": point.usages,
+                    "counters": point.perfs,
+                    "verdicts": point.verdicts,
+                    "overheads": point.overheads,
+                }
+                for point in self.points
+            ],
+        }
+
+class JobWorkspace:
+    def __init__(self, path):
+        self.path = path
+
+    def source_path(self, side, ext):
+        return os.path.join(self.path, f"{side}{ext}")
+
+    def exe_path(self, side):
+        return os.path.join(self.path, f"{side}{EXE_SUFFIX}")
+
+    def metrics_path(self):
+        return os.path.join(self.path, METRICS_FILE_NAME)
+
+    def cleanup(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+class JobScheduler:
+    """Runs compile/run jobs in private workspaces, at most `workers` at a time."""
+
+    def __init__(self, jobs_dir, workers=JOB_WORKERS_DEFAULT, on_change=None):
+        self.root = os.path.join(jobs_dir, str(os.getpid()))
+        self.workers = max(1, workers)
+        self.on_change = on_change
+        self.running = 0
+        self.queued = 0
+        self._cond = threading.Condition()
+        self._remove_stale(jobs_dir)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _remove_stale(self, jobs_dir):
+        if not os.path.isdir(jobs_dir):
+            return
+        for name in os.listdir(jobs_dir):
+            if not name.isdigit() or int(name) == os.getpid():
+                continue
+            if os.name != "nt":
+                try:
+                    os.kill(int(name), 0)
+                    continue
+                except ProcessLookupError:
+                    pass
+                except OSError:
+                    continue
+            shutil.rmtree(os.path.join(jobs_dir, name), ignore_errors=True)
+
+    def set_workers(self, workers):
+        with self._cond:
+            self.workers = max(1, workers)
+            self._cond.notify_all()
+
+    def create_workspace(self, name):
+        os.makedirs(self.root, exist_ok=True)
+        return JobWorkspace(tempfile.mkdtemp(prefix=f"{name}-", dir=self.root))
+
+    def submit(self, name, fn, *args):
+        thread = threading.Thread(target=self._run, args=(name, fn, args), daemon=True)
+        thread.start()
+        return thread
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change(self.running, self.queued)
+
+    def _run(self, name, fn, args):
+        with self._cond:
+            self.queued += 1
+            self._notify()
+            while self.running >= self.workers:
+                self._cond.wait()
+            self.queued -= 1
+            self.running += 1
+            self._notify()
+
+        workspace = self.create_workspace(name)
+        use_available_cpus()
+        try:
+            fn(workspace, *args)
+        finally:
+            workspace.cleanup()
+            with self._cond:
+                self.running -= 1
+                self._cond.notify()
+                self._notify()
+
+class CompileCache:
+    """Content-addressed store of compiled binaries, evicted by size/LRU."""
+
+    def __init__(self, root, max_bytes=COMPILE_CACHE_MAX_BYTES, max_entries=COMPILE_CACHE_MAX_ENTRIES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def make_key(self, final_code, compiler, cmd, source_path, exe_path):
+        # Temp paths differ between sides/jobs, so they are normalized out of the argv.
+        # PCH arguments do not change the produced binary and are skipped.
+        argv = []
+        skip_next = False
+        for i, arg in enumerate(cmd):
+            if skip_next:
+                skip_next = False
+                continue
+            if arg in ("-include", "-include-pch") and i + 1 < len(cmd) and cmd[i + 1].startswith(PCH_DIR):
+                skip_next = True
+                continue
+            if arg == source_path:
+                argv.append("<source>")
+            elif arg == exe_path:
+                argv.append("<output>")
+            else:
+                argv.append(arg)
+        h = hashlib.sha256()
+        for part in (final_code, compiler, get_compiler_version(compiler), "\0".join(argv)):
+            h.update(part.encode("utf-8", "surrogatepass"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.root, key + EXE_SUFFIX)
+
+    def fetch(self, key, dest):
+        path = self.entry_path(key)
+        with self._lock:
+            if not os.path.exists(path):
+                return False
+            try:
+                os.utime(path, None)
+                shutil.copy2(path, dest)
+            except OSError:
+                return False
+        return True
+
+    def store(self, key, exe_path):
+        path = self.entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                shutil.copy2(exe_path, tmp_path)
+                os.replace(tmp_path, path)
+            except OSError:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                return
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        while entries and (total > self.max_bytes or len(entries) > self.max_entries):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+# --- CODE INJECTION ---
+
+def build_code_mask(text):
+    mask = [True] * len(text)
+    i = 0
+    in_single = False
+    in_multi = False
+    in_string = False
+    in_char = False
+    escape = False
+
+    while i < len(text):
+        ch = text[i]
+        nxt = text[i + 1] if i + 1 < len(text) else ""
+
+        if in_single:
+            mask[i] = False
+            if ch == "\n":
+                in_single = False
+            i += 1
+            continue
+
+        if in_multi:
+            mask[i] = False
+            if ch == "*" and nxt == "/":
+                mask[i + 1] = False
+                i += 2
+                in_multi = False
+            else:
+                i += 1
+            continue
+
+        if in_string:
+            mask[i] = False
+            if escape:
+                escape = False
+            else:
+                if ch == "\\":
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+            i += 1
+            continue
+
+        if in_char:
+            mask[i] = False
+            if escape:
+                escape = False
+            else:
+                if ch == "\\":
+                    escape = True
+                elif ch == "'":
+                    in_char = False
+            i += 1
+            continue
+
+        if ch == "/" and nxt == "/":
+            mask[i] = False
+            mask[i + 1] = False
+            in_single = True
+            i += 2
+            continue
+
+        if ch == "/" and nxt == "*":
+            mask[i] = False
+            mask[i + 1] = False
+            in_multi = True
+            i += 2
+            continue
+
+        if ch == '"':
+            mask[i] = False
+            in_string = True
+            i += 1
+            continue
+
+        if ch == "'":
+            mask[i] = False
+            in_char = True
+            i += 1
+            continue
+
+        i += 1
+
+    return mask
+
+def replace_in_code(text, pattern, repl, flags=re.DOTALL):
+    mask = build_code_mask(text)
+    out = []
+    last = 0
+    for match in re.finditer(pattern, text, flags):
+        if not all(mask[match.start():match.end()]):
+            continue
+        out.append(text[last:match.start()])
+        out.append(repl(match) if callable(repl) else repl)
+        last = match.end()
+    out.append(text[last:])
+    return "".join(out)
+
+def find_code_match(text, pattern, flags=re.DOTALL):
+    mask = build_code_mask(text)
+    for match in re.finditer(pattern, text, flags):
+        if all(mask[match.start():match.end()]):
+            return match
+    return None
+
+def find_body_end(text, start):
+    mask = build_code_mask(text)
+    depth = 0
+    for i in range(start, len(text)):
+        if not mask[i]:
+            continue
+        ch = text[i]
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        elif ch == ";" and depth == 0:
+            return None
+    return None
+
+def inject_smart_timer(user_code, lang):
+    """
+    1. Injects the timer runtime header (the runtime itself is linked in).
+    2. Wraps 'main' to start/stop this timer.
+    3. Finds input functions and wraps them to PAUSE the timer.
+    """
+
+    timer_header = PCH_PRELUDE[lang] + IDE_RUNTIME_DECLS
+
+    code = user_code
+    wrap = lambda m: f"_IDE_PAUSE(); {m.group(0)} _IDE_RESUME();"
+
+    code = replace_in_code(code, r"\bscanf_s\b", "_IDE_SCANF_S", flags=0)
+    code = replace_in_code(code, r"\bscanf\b", "_IDE_SCANF", flags=0)
+
+    patterns = [
+        r"\bstd::cin\s*>>.*?;|\bcin\s*>>.*?;",
+        r"\bstd::getline\s*\(.*?\)\s*;|\bgetline\s*\(.*?\)\s*;",
+        r"\bfgets\s*\(.*?\)\s*;",
+        r"\bgetchar\s*\(\s*\)\s*;",
+        r"\bgetc\s*\(.*?\)\s*;",
+        r"\bstd::cin\s*\.\s*get\s*\(.*?\)\s*;|\bcin\s*\.\s*get\s*\(.*?\)\s*;",
+        r"\bstd::cin\s*\.\s*getline\s*\(.*?\)\s*;|\bcin\s*\.\s*getline\s*\(.*?\)\s*;",
+    ]
+
+    for pattern in patterns:
+        code = replace_in_code(code, pattern, wrap, flags=re.DOTALL)
+
+    pattern = r"\b(int|void)\s+main\s*\((.*?)\)"
+    match = find_code_match(code, pattern, flags=re.DOTALL)
+    if not match:
+        return None
+
+    return_type = match.group(1)
+    params = match.group(2).strip()
+    has_args = bool(params) and params != "void"
+    call_expr = "user_logic(argc, argv)" if has_args else "user_logic()"
+    signature = code[match.start():match.end()]
+    new_signature = re.sub(pattern, r"\1 user_logic(\2)", signature, count=1, flags=re.DOTALL)
+
+    # main() implicitly returns 0; user_logic() would not, so make it explicit.
+    if return_type == "int":
+        body_end = find_body_end(code, match.end())
+        if body_end is not None:
+            code = code[:body_end] + "    return 0;\n" + code[body_end:]
+
+    code = code[:match.start()] + new_signature + code[match.end():]
+
+    if return_type == "void":
+        body = f"{call_expr};\n    return 0;"
+    else:
+        body = f"return {call_expr};"
+    wrapper_main = """
+static int _IDE_ENTRY(int argc, char** argv) {{
+    (void)argc;
+    (void)argv;
+    {body}
+}}
+
+int main(int argc, char** argv) {{
+    return _IDE_MAIN(_IDE_ENTRY, argc, argv);
+}}
+""".format(body=body)
+
+    return timer_header + code + wrapper_main
+
+def code_uses_input(code):
+    patterns = [
+        r"\bscanf_s\s*\(",
+        r"\bscanf\s*\(",
+        r"\bstd::cin\s*>>",
+        r"\bcin\s*>>",
+        r"\bstd::getline\s*\(",
+        r"\bgetline\s*\(",
+        r"\bfgets\s*\(",
+        r"\bgetchar\s*\(",
+        r"\bgetc\s*\(",
+        r"\bstd::cin\s*\.\s*get",
+        r"\bcin\s*\.\s*get",
+        r"\bstd::cin\s*\.\s*getline",
+        r"\bcin\s*\.\s*getline",
+    ]
+    for pattern in patterns:
+        if find_code_match(code, pattern, flags=re.DOTALL):
+            return True
+    return False
+
+# --- PIPELINE ---
+
+def get_source_extension(lang):
+    return ".c" if lang == "C" else ".cpp"
+
+def build_compile_command(compiler, lang, source_path, exe_path, profile, c_is_cpp_driver=False, pch_variant=None, extra_flags=None, pch_wait=False):
+    if not compiler:
+        raise BuildError("Compiler Missing", "Compiler Error", "Compiler not available for selected language.")
+
+    std_flags = ["-std=c11"] if lang == "C" else ["-std=c++17"]
+    profile_flags = [flag for flag in BUILD_PROFILES[profile] if TOOLCHAINS.supports(compiler, flag)]
+    flags = std_flags + profile_flags
+    pch_args = get_pch_args(compiler, lang, pch_variant, flags, wait=pch_wait) if pch_variant else []
+    flags = flags + list(extra_flags or [])
+
+    force_c = lang == "C" and c_is_cpp_driver
+    runtime_obj = get_runtime_object(compiler, lang, std_flags, force_c=force_c)
+
+    if lang == "C":
+        cmd = [compiler] + pch_args + [source_path, "-o", exe_path] + flags
+        if force_c:
+            cmd.insert(1, "-x")
+            cmd.insert(2, "c")
+            # Switch back so the runtime object is treated as an object file.
+            cmd.append("-x")
+            cmd.append("none")
+        cmd.append(runtime_obj)
+        if os.name != "nt":
+            cmd.append("-lm")
+    else:
+        cmd = [compiler] + pch_args + [source_path, "-o", exe_path] + flags + [runtime_obj]
+
+    if os.name == "nt":
+        cmd.append("-lpsapi")
+
+    return cmd
+
+def compile_program(raw_code, lang, side, workspace, compiler, profile, c_is_cpp_driver=False, cache=None, use_cache=True, extra_flags=None, on_line=None, on_start=None, on_compile=None, pch_wait=False):
+    """Inject the runtime into `raw_code` and build workspace.exe_path(side).
+
+    Returns (compile seconds, or None for a cache hit; compiler output; whether
+    a PCH was used). Raises BuildError on failure.
+    """
+    final_code = inject_smart_timer(raw_code, lang)
+
+    if not final_code:
+        raise BuildError("Parse Failed", "Error", f"Could not parse main() function in {side} editor.")
+
+    source_path = workspace.source_path(side, get_source_extension(lang))
+    exe_path = workspace.exe_path(side)
+    with open(source_path, "w", encoding="utf-8") as f:
+        f.write(final_code)
+
+    cmd = build_compile_command(
+        compiler,
+        lang,
+        source_path,
+        exe_path,
+        profile,
+        c_is_cpp_driver=c_is_cpp_driver,
+        pch_variant=pch_variant_for_code(raw_code, lang),
+        extra_flags=extra_flags,
+        pch_wait=pch_wait,
+    )
+
+    pch_used = any(arg in ("-include", "-include-pch") for arg in cmd)
+    cache_key = cache.make_key(final_code, compiler, cmd, source_path, exe_path) if cache else None
+    if cache_key and use_cache and cache.fetch(cache_key, exe_path):
+        return None, "", pch_used
+
+    if on_compile:
+        on_compile()
+    start = time.perf_counter()
+    returncode, output = run_compiler(cmd, on_line=on_line, on_start=on_start)
+    elapsed = time.perf_counter() - start
+
+    if returncode != 0:
+        raise BuildError("Compilation Failed", f"Compilation Error ({side})", output)
+
+    if cache_key:
+        cache.store(cache_key, exe_path)
+    return elapsed, output, pch_used
+
+
+class RunError(Exception):
+    def __init__(self, status, title, message):
+        super().__init__(message)
+        self.status = status
+        self.title = title
+
+def parse_metric(metrics, name, kind=float):
+    try:
+        return kind(metrics[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def parse_iteration_samples(metrics):
+    iters = parse_metric(metrics, "IDE_ITERS", int)
+    return iters, [float(value) for value in metrics.get("IDE_ITER_SAMPLES", [])]
+
+def parse_ide_metrics(metrics):
+    time_val = parse_metric(metrics, "IDE_TIME")
+    cpu_val = parse_metric(metrics, "IDE_CPU")
+    steps_val = parse_metric(metrics, "IDE_STEPS", int)
+    peak_val = parse_metric(metrics, "IDE_PEAK_MEM")
+    base_val = parse_metric(metrics, "IDE_BASE_MEM")
+    if peak_val is not None:
+        if base_val is not None:
+            mem_val = max(0.0, peak_val - base_val)
+        else:
+            mem_val = peak_val
+    else:
+        mem_val = None
+    return time_val, mem_val, cpu_val, steps_val
+
+def parse_overhead(metrics):
+    """(pause/resume transitions, estimated timer overhead in seconds, whether
+    it was subtracted) for one run; transitions are per iteration with repeat."""
+    transitions = parse_metric(metrics, "IDE_TRANSITIONS")
+    overhead = parse_metric(metrics, "IDE_OVERHEAD")
+    subtracted = bool(parse_metric(metrics, "IDE_OVERHEAD_SUBTRACTED", int))
+    return transitions, overhead, subtracted
+
+def format_overhead(runs):
+    """Median timer overhead over run dicts with transitions/overhead keys, or None."""
+    runs = [run for run in runs if run.get("transitions")]
+    if not runs:
+        return None
+    overhead = statistics.median(run["overhead"] for run in runs)
+    transitions = statistics.median(run["transitions"] for run in runs)
+    how = "subtracted from" if runs[0].get("overhead_subtracted") else "included in"
+    return f"{overhead:.9f} s for {transitions:.0f} input pauses, {how} the times"
+
+def parse_n_values(n_text):
+    """Positive sizes from "1000, 1e4 100000"-style text."""
+    n_values = []
+    for v in re.split(r"[ ,]+", n_text.strip()):
+        try:
+            n = float(v)
+        except ValueError:
+            continue
+        if n.is_integer() and n > 0:
+            n_values.append(int(n))
+    return n_values
+
+def estimate_complexity(n_values, times):
+    if not n_values or not times or len(n_values) != len(times):
+        return None
+
+    models = {
+        "O(1)": [1.0 for _ in n_values],
+        "O(n)": [float(n) for n in n_values],
+        "O(n log n)": [float(n) * math.log2(n) if n > 1 else 0.0 for n in n_values],
+        "O(n^2)": [float(n * n) for n in n_values],
+    }
+
+    best_fit = None
+    best_sse = None
+
+    for name, values in models.items():
+        denom = sum(v * v for v in values)
+        if denom <= 0:
+            sse = float("inf")
+        else:
+            scale = sum(t * v for t, v in zip(times, values)) / denom
+            preds = [scale * v for v in values]
+            sse = sum((t - p) ** 2 for t, p in zip(times, preds))
+
+        if best_sse is None or sse < best_sse:
+            best_sse = sse
+            best_fit = name
+
+    return best_fit
+
+def make_benchmark_env(repeat=False, warmup=REPEAT_DEFAULT_WARMUP, min_time=REPEAT_DEFAULT_MIN_TIME, perf=False, flush=False, subtract_overhead=False, preload=False, report_overhead=True):
+    env = os.environ.copy()
+    env["IDE_BENCHMARK"] = "1"
+    # Output size and hash must cover the program's output, not the timing banner.
+    env["IDE_NO_REPORT"] = "1"
+    if report_overhead:
+        env["IDE_REPORT_OVERHEAD"] = "1"
+    if perf:
+        env["IDE_PERF"] = "1"
+    if not flush:
+        env["IDE_NO_FLUSH"] = "1"
+    if subtract_overhead:
+        env["IDE_SUBTRACT_OVERHEAD"] = "1"
+    if preload:
+        env["IDE_PRELOAD_STDIN"] = "1"
+    if repeat:
+        env["IDE_REPEAT"] = "1"
+        env["IDE_WARMUP"] = str(max(1, int(warmup)))
+        env["IDE_MIN_TIME"] = str(max(0.0, float(min_time)))
+    return env
+
+def make_benchmark_settings(mode=DEFAULT_BENCHMARK_MODE, nice=None, no_aslr=False, limits=None):
+    if mode not in BENCHMARK_MODES:
+        mode = DEFAULT_BENCHMARK_MODE
+    if os.name == "nt":
+        nice = None
+    if nice is not None and nice < os.getpriority(os.PRIO_PROCESS, 0) and os.geteuid() != 0:
+        raise ValueError(f"Lowering the nice level to {nice} requires root privileges.")
+    no_aslr = bool(no_aslr) and sys.platform.startswith("linux")
+    if no_aslr and not shutil.which("setarch"):
+        raise ValueError("Disabling ASLR needs the setarch tool (util-linux).")
+    return {"mode": mode, "nice": nice, "no_aslr": no_aslr, "limits": limits}
+
+def make_adaptive_stopper(ci_percent, min_runs, max_runs, budget):
+    target = ci_percent / 100.0
+    if target <= 0 or min_runs < 2 or max_runs < min_runs or budget <= 0:
+        raise ValueError("Adaptive stopping needs CI > 0, 2 <= min runs <= max runs and a positive budget.")
+    return AdaptiveStopper(target, min_runs, max_runs, budget)
+
+def collect_benchmark_samples(exe_path, env, runs, settings, input_data="", stopper=None, label="Benchmark", spill_path=None, on_progress=None):
+    """Run the benchmark binary up to `runs` times.
+
+    Returns ([(core, result)], mode note, stop reason). With a stopper,
+    sampling ends as soon as it reports a reason (runs is then its max).
+    """
+    mode = settings["mode"]
+    nice = settings["nice"]
+    no_aslr = settings["no_aslr"]
+    limits = settings.get("limits")
+    cpus = get_available_cpus() if hasattr(os, "sched_setaffinity") else []
+    if stopper:
+        runs = stopper.max_runs
+        stopper.start()
+
+    cmd = benchmark_command(exe_path, no_aslr)
+
+    def run_sample(core, index):
+        on_spawn = make_benchmark_launcher(core, nice)
+        spill = spill_path if index == 0 else None
+        if limits:
+            return run_judged(cmd, input_data, env, limits, make_benchmark_preexec(limits), hash_output=True, spill_path=spill, on_spawn=on_spawn)
+        return run_captured(cmd, input_data, env=env, hash_output=True, spill_path=spill, on_spawn=on_spawn)
+
+    def check_stop(samples):
+        times = []
+        for _, res in samples:
+            if res.verdict not in (None, "OK"):
+                return f"verdict {res.verdict}"
+            t = parse_ide_metrics(res.metrics)[0] if res.returncode == 0 else None
+            if t is None:
+                return "run failed"
+            times.append(t)
+        return stopper.check(times) if stopper else None
+
+    samples = []
+    reason = None
+    if mode == "Parallel" and len(cpus) > 1:
+        free_cpus = queue.Queue()
+        for core in cpus:
+            free_cpus.put(core)
+
+        def pinned_sample(index):
+            core = free_cpus.get()
+            try:
+                return core, run_sample(core, index)
+            finally:
+                free_cpus.put(core)
+
+        note = f"Parallel on cores {format_cpu_list(cpus)}"
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(cpus)) as pool:
+            futures = [pool.submit(pinned_sample, i) for i in range(runs)]
+            for future in concurrent.futures.as_completed(futures):
+                samples.append(future.result())
+                if on_progress:
+                    on_progress(label, len(samples), runs, len(cpus))
+                reason = check_stop(samples)
+                if reason:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+    else:
+        core = None
+        note = "Serial"
+        reserved = None
+        if mode == "Isolated" and len(cpus) > 1:
+            # Reserve the core: while the runs last, get_available_cpus leaves
+            # it out, so Parallel runs do not queue it, and scheduler jobs,
+            # compiles and other runs (use_available_cpus) start off it.
+            core = reserved = cpus[-1]
+            reserve_cpu(core)
+            use_available_cpus()
+            note = f"Isolated on core {core}"
+        elif mode != "Serial" and cpus:
+            core = cpus[0]
+            note = f"{mode} requested, only core {core} available (ran serially)"
+
+        try:
+            for i in range(runs):
+                if on_progress:
+                    on_progress(label, i + 1, runs, 1)
+                samples.append((core, run_sample(core, i)))
+                reason = check_stop(samples)
+                if reason:
+                    break
+        finally:
+            if reserved is not None:
+                release_cpu(reserved)
+                use_available_cpus()
+
+    if nice is not None:
+        note += f", nice {nice}"
+    if no_aslr:
+        note += ", ASLR off"
+    if limits:
+        note += f", {describe_limits(limits)}"
+    if stopper and not reason:
+        reason = f"max runs ({runs}) reached"
+    return samples, note, reason
+
+def benchmark_result_from_samples(samples, profile, mode_note, stop_reason=None, warmup=None):
+    """Judged runs that fail are kept with their verdict; otherwise a failed
+    run raises RunError."""
+    result = BenchmarkResult(profile, mode_note, stop_reason, warmup)
+    for core, res in samples:
+        if res.verdict not in (None, "OK"):
+            result.add_run(core, None, usage=res.usage, verdict=res.verdict)
+            result.runs[-1]["output_bytes"] = res.capture.total
+            result.runs[-1]["output_sha256"] = res.capture.digest
+            continue
+        if res.returncode != 0:
+            raise RunError("Benchmark Failed", "Runtime Error", res.output)
+
+        t, mem, cpu, step_count = parse_ide_metrics(res.metrics)
+        if t is None:
+            raise RunError(
+                "Benchmark Failed",
+                "Benchmark Error",
+                "Could not parse timing output. Ensure the program runs correctly.",
+            )
+
+        iters, iter_samples = parse_iteration_samples(res.metrics)
+        transitions, overhead, subtracted = parse_overhead(res.metrics)
+        result.add_run(core, t, cpu, mem, step_count, iters, iter_samples, res.usage, parse_perf_counters(res.metrics), res.verdict)
+        result.runs[-1]["output_bytes"] = res.capture.total
+        result.runs[-1]["output_sha256"] = res.capture.digest
+        result.runs[-1]["transitions"] = transitions
+        result.runs[-1]["overhead"] = overhead
+        result.runs[-1]["overhead_subtracted"] = subtracted
+    return result
+
+def measure_complexity(exe_path, env, n_values, template_text, runs_per_n, settings, profile, make_stopper=None, on_progress=None):
+    """Time `exe_path` on the template expanded for each N and fit a model.
+
+    `make_stopper` is called once per N so every size gets a fresh stopper.
+    """
+    points = []
+    for n in n_values:
+        per_times = []
+        per_mems = []
+        per_steps = []
+        per_usages = []
+        per_perfs = []
+        per_verdicts = []
+        per_overheads = []
+        input_data = template_text.replace("{N}", str(n))
+        samples, _, stop_reason = collect_benchmark_samples(
+            exe_path,
+            env,
+            runs_per_n,
+            settings,
+            input_data=input_data,
+            stopper=make_stopper() if make_stopper else None,
+            label=f"Complexity N={n}",
+            on_progress=on_progress,
+        )
+        for _, res in samples:
+            if res.verdict:
+                per_verdicts.append(res.verdict)
+                if res.verdict != "OK":
+                    continue
+            if res.returncode != 0:
+                raise RunError("Complexity Failed", "Runtime Error", res.output)
+
+            t, mem, _, step_count = parse_ide_metrics(res.metrics)
+            if t is None:
+                raise RunError(
+                    "Complexity Failed",
+                    "Complexity Error",
+                    "Could not parse timing output. Ensure the program runs correctly.",
+                )
+
+            per_times.append(t)
+            if mem is not None:
+                per_mems.append(mem)
+            if step_count is not None:
+                per_steps.append(step_count)
+            if res.usage:
+                per_usages.append(res.usage)
+            perf = parse_perf_counters(res.metrics)
+            if perf:
+                per_perfs.append(perf)
+            transitions, overhead, subtracted = parse_overhead(res.metrics)
+            if transitions is not None:
+                per_overheads.append({"transitions": transitions, "overhead": overhead, "overhead_subtracted": subtracted})
+
+        points.append(ComplexityPoint(n, per_times, per_mems, per_steps, stop_reason, per_usages, per_perfs, per_verdicts, per_overheads))
+
+    result = ComplexityResult(profile, points)
+    result.best_fit = estimate_complexity(result.n_values, result.times)
+    return result
+
+class RaceResult:
+    """Alternating left/right timings of a race and the verdict on their medians."""
+
+    def __init__(self, profile, left_times, right_times, left_usages=None, right_usages=None, left_perfs=None, right_perfs=None):
+        self.profile = profile
+        self.runs = len(left_times)
+        self.left_usages = left_usages or []
+        self.right_usages = right_usages or []
+        self.left_perfs = left_perfs or []
+        self.right_perfs = right_perfs or []
+        self.left = SampleStats(left_times)
+        self.right = SampleStats(right_times)
+
+        left, right = self.left, self.right
+        self.winner = "Tie"
+        self.ratio = None
+        self.overlap = self.runs > 1 and left.ci_low <= right.ci_high and right.ci_low <= left.ci_high
+        if left.median > 0 and right.median > 0 and not self.overlap:
+            if left.median < right.median:
+                self.winner = "Left"
+                self.ratio = right.median / left.median
+            elif right.median < left.median:
+                self.winner = "Right"
+                self.ratio = left.median / right.median
+
+    def to_text(self):
+        msg = (
+            f"Profile: {self.profile}\n"
+            f"Left median:  {self.left.median:.9f} s (MAD {self.left.mad:.9f})\n"
+            f"Right median: {self.right.median:.9f} s (MAD {self.right.mad:.9f})\n"
+            f"Runs per side: {self.runs}\n"
+        )
+        for side, usages in (("Left", self.left_usages), ("Right", self.right_usages)):
+            usage = format_usage(usages)
+            if usage:
+                msg += f"{side} rusage: {usage}\n"
+        for side, perfs in (("Left", self.left_perfs), ("Right", self.right_perfs)):
+            perf = format_perf(perfs)
+            if perf:
+                msg += f"{side} counters: {perf}\n"
+
+        if self.winner == "Tie" and self.overlap:
+            msg += "Result: Tie (95% confidence intervals of the medians overlap)."
+        elif self.winner == "Tie":
+            msg += "Result: Tie (too close to call)."
+        elif self.ratio is None:
+            msg += f"Winner: {self.winner} (too fast to compute ratio)."
+        else:
+            msg += f"Winner: {self.winner} side is {self.ratio:.2f}x faster."
+        return msg
+
+    def to_dict(self):
+        return {
+            "profile": self.profile,
+            "runs": self.runs,
+            "winner": self.winner,
+            "ratio": self.ratio,
+            "ci_overlap": self.overlap,
+            "left": self.left.to_dict(),
+            "right": self.right.to_dict(),
+            "left_times": self.left.samples,
+            "right_times": self.right.samples,
+            "left_usage": self.left_usages,
+            "right_usage": self.right_usages,
+            "left_counters": self.left_perfs,
+            "right_counters": self.right_perfs,
+        }
+
+def measure_race(left_exe, right_exe, input_data, runs, env, profile, limits=None):
+    left_times = []
+    right_times = []
+    left_usages = []
+    right_usages = []
+    left_perfs = []
+    right_perfs = []
+
+    def run_side(exe, side):
+        if not limits:
+            return run_captured([exe], input_data, env=env)
+        res = run_judged([exe], input_data, env, limits, make_benchmark_preexec(limits=limits))
+        if res.verdict != "OK":
+            raise RunError("Race Failed", f"Race Verdict ({side})", f"{side} side: {res.verdict}\n\n{res.output}")
+        return res
+
+    for i in range(runs):
+        res_left = run_side(left_exe, "Left")
+        if res_left.returncode != 0:
+            raise RunError("Race Failed", "Race Error (Left)", res_left.output)
+
+        t_left, _, _, _ = parse_ide_metrics(res_left.metrics)
+        if t_left is None:
+            raise RunError("Race Failed", "Race Error", "Could not parse timing output for left.")
+
+        res_right = run_side(right_exe, "Right")
+        if res_right.returncode != 0:
+            raise RunError("Race Failed", "Race Error (Right)", res_right.output)
+
+        t_right, _, _, _ = parse_ide_metrics(res_right.metrics)
+        if t_right is None:
+            raise RunError("Race Failed", "Race Error", "Could not parse timing output for right.")
+
+        left_times.append(t_left)
+        right_times.append(t_right)
+        if res_left.usage and res_right.usage:
+            left_usages.append(res_left.usage)
+            right_usages.append(res_right.usage)
+        perf_left = parse_perf_counters(res_left.metrics)
+        perf_right = parse_perf_counters(res_right.metrics)
+        if perf_left and perf_right:
+            left_perfs.append(perf_left)
+            right_perfs.append(perf_right)
+
+    return RaceResult(profile, left_times, right_times, left_usages, right_usages, left_perfs, right_perfs)
+
+def read_file_tail(path, limit=CAPTURE_TAIL_BYTES):
+    try:
+        with open(path, "rb") as f:
+            f.seek(max(0, os.path.getsize(path) - limit))
+            return f.read().decode("utf-8", "replace")
+    except OSError:
+        return ""
+
+def outputs_match(actual_path, expected):
+    """Whitespace-insensitive comparison, like most judges."""
+    with open(actual_path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read().split() == expected.split()
+
+def run_testcases(exe_path, env, cases, workers, workspace, on_result=None, limits=None):
+    """Run every (case, input, expected) with up to `workers` at a time.
+
+    Status is PASS/FAIL against the expected output, OK when there is none,
+    RE for a non-zero exit and ERROR when no timing came back; with judge
+    `limits` it can also be TLE or MLE. `on_result` is called from the worker
+    threads as each case finishes.
+    """
+    env = dict(env, IDE_NO_REPORT="1")
+
+    def run_one(index, case, input_text, expected):
+        out_path = os.path.join(workspace.path, f"case{index}.out") if expected is not None else None
+        err_path = os.path.join(workspace.path, f"case{index}.err")
+        if limits:
+            res = run_judged([exe_path], input_text, env, limits, make_benchmark_preexec(limits=limits), spill_path=out_path, stderr_path=err_path)
+        else:
+            res = run_captured([exe_path], input_text, env=env, spill_path=out_path, stderr_path=err_path)
+        t, mem, cpu, steps = parse_ide_metrics(res.metrics)
+        if res.verdict not in (None, "OK"):
+            status = res.verdict
+        elif res.returncode != 0:
+            status = "RE"
+        elif t is None:
+            status = "ERROR"
+        elif expected is None:
+            status = "OK"
+        else:
+            status = "PASS" if outputs_match(out_path, expected) else "FAIL"
+        result = {
+            "index": index,
+            "case": case,
+            "status": status,
+            "returncode": res.returncode,
+            "time": t,
+            "cpu": cpu,
+            "steps": steps,
+            "mem": mem,
+            "usage": res.usage,
+            "output": res.output,
+            "stderr": read_file_tail(err_path),
+        }
+        if on_result:
+            on_result(result)
+        return result
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(run_one, i, *case) for i, case in enumerate(cases)]
+        return [future.result() for future in futures]
+
+class AlgoTimerIDE:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("C/C++ Algo IDE (Pure CPU Time)")
+        self.root.geometry("1100x750")
+
+        self.compiler_cmd_cpp = None
+        self.compiler_cmd_c = None
+        self.c_compiler_is_cpp_driver = False
+        self.running_process = None
+        self.running_processes = []
+        self._autosave_job = None
+        self._highlight_jobs = {}
+        self._complexity_window = None
+        self._prebuild_jobs = {}
+        self._prebuilds = {}
+        self._prebuild_lock = threading.Lock()
+        self.compile_cache = CompileCache(COMPILE_CACHE_DIR)
+        self.scheduler = JobScheduler(JOBS_DIR, on_change=self.on_jobs_change)
+
+        self.benchmark_var = tk.BooleanVar(value=False)
+        self.benchmark_runs_var = tk.IntVar(value=BENCHMARK_DEFAULT_RUNS)
+        self.bench_mode_var = tk.StringVar(value=DEFAULT_BENCHMARK_MODE)
+        self.bench_nice_var = tk.StringVar(value="")
+        self.bench_no_aslr_var = tk.BooleanVar(value=False)
+        self.bench_repeat_var = tk.BooleanVar(value=False)
+        self.bench_warmup_var = tk.StringVar(value=str(REPEAT_DEFAULT_WARMUP))
+        self.bench_min_time_var = tk.StringVar(value=str(REPEAT_DEFAULT_MIN_TIME))
+        self.bench_adaptive_var = tk.BooleanVar(value=False)
+        self.bench_ci_var = tk.StringVar(value=str(ADAPTIVE_DEFAULT_CI))
+        self.bench_min_runs_var = tk.StringVar(value=str(ADAPTIVE_DEFAULT_MIN_RUNS))
+        self.bench_max_runs_var = tk.StringVar(value=str(ADAPTIVE_DEFAULT_MAX_RUNS))
+        self.bench_budget_var = tk.StringVar(value=str(ADAPTIVE_DEFAULT_BUDGET))
+        self.bench_save_output_var = tk.BooleanVar(value=False)
+        self.bench_perf_var = tk.BooleanVar(value=False)
+        self.bench_judge_var = tk.BooleanVar(value=False)
+        self.bench_flush_var = tk.BooleanVar(value=False)
+        self.bench_subtract_overhead_var = tk.BooleanVar(value=False)
+        self.bench_preload_var = tk.BooleanVar(value=False)
+        self.bench_time_limit_var = tk.StringVar(value=str(JUDGE_DEFAULT_TIME_LIMIT))
+        self.bench_memory_limit_var = tk.StringVar(value=str(JUDGE_DEFAULT_MEMORY_MB))
+        self.last_benchmark_result = None
+        self.last_complexity_result = None
+        self.complexity_runs_var = tk.IntVar(value=COMPLEXITY_DEFAULT_RUNS)
+        self.job_workers_var = tk.IntVar(value=JOB_WORKERS_DEFAULT)
+        self.language_var = tk.StringVar(value="C++")
+        self.split_var = tk.BooleanVar(value=False)
+        self.theme_var = tk.StringVar(value="Dark")
+        self.prebuild_var = tk.BooleanVar(value=True)
+        self.time_report_var = tk.BooleanVar(value=False)
+        self.last_compile_report = None
+        self._compile_stats_window = None
+        self._testcase_window = None
+        self.testcase_results = []
+        self.project_name_var = tk.StringVar(value="Untitled")
+        self.profile_var = tk.StringVar(value=DEFAULT_BUILD_PROFILE)
+
+        # --- UI SETUP ---
+        self.toolbar = tk.Frame(root, pady=5)
+        self.toolbar.pack(fill=tk.X)
+
+        self.btn_run = tk.Button(
+            self.toolbar,
+            text=RUN_BUTTON_TEXT,
+            command=self.run_thread,
+            bg="#d32f2f",
+            fg="white",
+            font=("Segoe UI", 11, "bold"),
+            width=25,
+        )
+        self.btn_run.pack(side=tk.LEFT, padx=10)
+
+        self.btn_kill = tk.Button(
+            self.toolbar,
+            text="Kill Process",
+            command=self.kill_process,
+            bg="#616161",
+            fg="white",
+            font=("Segoe UI", 10, "bold"),
+            width=12,
+        )
+        self.btn_kill.pack(side=tk.LEFT, padx=6)
+
+        self.btn_race = tk.Button(
+            self.toolbar,
+            text="Race",
+            command=self.open_race_dialog,
+            font=("Segoe UI", 10, "bold"),
+            width=8,
+        )
+        self.btn_race.pack(side=tk.LEFT, padx=6)
+
+        self.chk_split = tk.Checkbutton(
+            self.toolbar,
+            text="Split View",
+            variable=self.split_var,
+            command=self.toggle_split,
+            font=("Segoe UI", 10),
+        )
+        self.chk_split.pack(side=tk.LEFT, padx=6)
+
+        self.chk_bench = tk.Checkbutton(
+            self.toolbar,
+            text="Benchmark",
+            variable=self.benchmark_var,
+            command=self.on_benchmark_toggle,
+            font=("Segoe UI", 10),
+        )
+        self.chk_bench.pack(side=tk.LEFT, padx=6)
+
+        self.entry_runs = tk.Entry(
+            self.toolbar,
+            textvariable=self.benchmark_runs_var,
+            width=4,
+            font=("Segoe UI", 10),
+        )
+        self.entry_runs.pack(side=tk.LEFT, padx=(2, 0))
+
+        self.lbl_runs = tk.Label(self.toolbar, text="runs", font=("Segoe UI", 10))
+        self.lbl_runs.pack(side=tk.LEFT, padx=(2, 4))
+
+        self.btn_bench_options = tk.Button(
+            self.toolbar,
+            text="Bench Options",
+            command=self.open_benchmark_options,
+            font=("Segoe UI", 9, "bold"),
+        )
+        self.btn_bench_options.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.btn_complexity = tk.Button(
+            self.toolbar,
+            text="Complexity",
+            command=self.open_complexity_window,
+            font=("Segoe UI", 10, "bold"),
+            width=12,
+        )
+        self.btn_complexity.pack(side=tk.LEFT, padx=6)
+
+        self.btn_testcases = tk.Button(
+            self.toolbar,
+            text="Test Cases",
+            command=self.open_testcase_window,
+            font=("Segoe UI", 9, "bold"),
+        )
+        self.btn_testcases.pack(side=tk.LEFT, padx=(0, 6))
+
+        self.lbl_complexity = tk.Label(self.toolbar, text="Complexity: N/A", font=("Segoe UI", 10))
+        self.lbl_complexity.pack(side=tk.LEFT, padx=8)
+
+        self.lbl_status = tk.Label(self.toolbar, text="Ready", font=("Segoe UI", 10))
+        self.lbl_status.pack(side=tk.RIGHT, padx=10)
+
+        self.options_bar = tk.Frame(root, pady=3)
+        self.options_bar.pack(fill=tk.X)
+
+        self.lbl_project = tk.Label(self.options_bar, text="Project:", font=("Segoe UI", 10))
+        self.lbl_project.pack(side=tk.LEFT, padx=(10, 4))
+
+        self.entry_project = tk.Entry(
+            self.options_bar,
+            textvariable=self.project_name_var,
+            width=22,
+            font=("Segoe UI", 10),
+        )
+        self.entry_project.pack(side=tk.LEFT, padx=(0, 12))
+
+        self.lbl_theme = tk.Label(self.options_bar, text="Theme:", font=("Segoe UI", 10))
+        self.lbl_theme.pack(side=tk.LEFT, padx=(10, 4))
+
+        self.theme_menu = tk.OptionMenu(self.options_bar, self.theme_var, *THEMES.keys(), command=self.apply_theme)
+        self.theme_menu.config(width=8, font=("Segoe UI", 10))
+        self.theme_menu.pack(side=tk.LEFT, padx=(0, 12))
+
+        self.lbl_language = tk.Label(self.options_bar, text="Language:", font=("Segoe UI", 10))
+        self.lbl_language.pack(side=tk.LEFT, padx=(10, 4))
+
+        self.language_menu = tk.OptionMenu(self.options_bar, self.language_var, "C", "C++", command=self.on_language_change)
+        self.language_menu.config(width=6, font=("Segoe UI", 10))
+        self.language_menu.pack(side=tk.LEFT, padx=(0, 12))
+
+        self.lbl_profile = tk.Label(self.options_bar, text="Profile:", font=("Segoe UI", 10))
+        self.lbl_profile.pack(side=tk.LEFT, padx=(10, 4))
+
+        self.profile_menu = tk.OptionMenu(self.options_bar, self.profile_var, *BUILD_PROFILES.keys(), command=self.on_profile_change)
+        self.profile_menu.config(width=8, font=("Segoe UI", 10))
+        self.profile_menu.pack(side=tk.LEFT, padx=(0, 6))
+
+        self.btn_compare_profiles = tk.Button(
+            self.options_bar,
+            text="Compare Profiles",
+            command=self.run_profile_comparison_thread,
+            font=("Segoe UI", 9, "bold"),
+        )
+        self.btn_compare_profiles.pack(side=tk.LEFT, padx=(0, 12))
+
+        self.chk_prebuild = tk.Checkbutton(
+            self.options_bar,
+            text="Background Build",
+            variable=self.prebuild_var,
+            command=self.on_prebuild_toggle,
+            font=("Segoe UI", 10),
+        )
+        self.chk_prebuild.pack(side=tk.LEFT, padx=6)
+
+        self.chk_time_report = tk.Checkbutton(
+            self.options_bar,
+            text="Compile Timing",
+            variable=self.time_report_var,
+            font=("Segoe UI", 10),
+        )
+        self.chk_time_report.pack(side=tk.LEFT, padx=6)
+
+        self.btn_compile_stats = tk.Button(
+            self.options_bar,
+            text="Compile Stats",
+            command=self.open_compile_stats_window,
+            font=("Segoe UI", 9, "bold"),
+        )
+        self.btn_compile_stats.pack(side=tk.LEFT, padx=(0, 12))
+
+        self.lbl_workers = tk.Label(self.options_bar, text="Workers:", font=("Segoe UI", 10))
+        self.lbl_workers.pack(side=tk.LEFT, padx=(10, 4))
+
+        self.entry_workers = tk.Entry(
+            self.options_bar,
+            textvariable=self.job_workers_var,
+            width=3,
+            font=("Segoe UI", 10),
+        )
+        self.entry_workers.pack(side=tk.LEFT, padx=(0, 12))
+        self.job_workers_var.trace_add("write", self.on_workers_change)
+
+        # Instructions
+        self.info_frame = tk.Frame(root, pady=2)
+        self.info_frame.pack(fill=tk.X)
+        self.info_label = tk.Label(
+            self.info_frame,
+            text="Info: Timer pauses during input. Use IDE_STEP() / IDE_STEPN(n) to count steps.",
+        )
+        self.info_label.pack()
+
+        # Work area (snippet sidebar + editors)
+        self.work_area = tk.Frame(root)
+        self.work_area.pack(fill=tk.BOTH, expand=True)
+
+        self.snippet_frame = tk.Frame(self.work_area, width=220)
+        self.snippet_frame.pack(side=tk.LEFT, fill=tk.Y)
+
+        # Editors (split view)
+        self.editor_pane = tk.PanedWindow(self.work_area, orient=tk.HORIZONTAL, sashwidth=6)
+        self.editor_pane.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.left_frame = tk.Frame(self.editor_pane)
+        self.right_frame = tk.Frame(self.editor_pane)
+
+        self.editor_left = scrolledtext.ScrolledText(
+            self.left_frame,
+            font=("Consolas", 13),
+            undo=True,
+        )
+        self.editor_left.pack(fill=tk.BOTH, expand=True)
+
+        self.editor_right = scrolledtext.ScrolledText(
+            self.right_frame,
+            font=("Consolas", 13),
+            undo=True,
+        )
+        self.editor_right.pack(fill=tk.BOTH, expand=True)
 
-int _IDE_SCANF_S(const char* fmt, ...) {
-    _IDE_PAUSE();
-    va_list args;
-    va_start(args, fmt);
-#ifdef _MSC_VER
-    int r = vscanf_s(fmt, args);
-#else
-    int r = vscanf(fmt, args);
-#endif
-    va_end(args);
-    _IDE_RESUME();
-    return r;
-}
+        self.active_editor = self.editor_left
+        self.editor_left.bind("<FocusIn>", lambda e, ed=self.editor_left: self.set_active_editor(ed))
+        self.editor_right.bind("<FocusIn>", lambda e, ed=self.editor_right: self.set_active_editor(ed))
 
-void _IDE_PRINT_RESULT() {
-    _IDE_PAUSE();
-    size_t code_heap_bytes = _IDE_MAX_HEAP >= _IDE_HEAP_BASE ? (_IDE_MAX_HEAP - _IDE_HEAP_BASE) : 0;
-    double code_heap_kb = (double)code_heap_bytes / 1024.0;
-    printf("\n==========================================\n");
-    printf("   ALGORITHM TIME: %.9f seconds\n", _IDE_TOTAL_TIME);
-    printf("   CPU TIME:       %.9f seconds\n", _IDE_TOTAL_CPU);
-    printf("   STEPS:          %llu\n", (unsigned long long)_IDE_STEP_COUNT);
-    printf("   CODE HEAP:      %.6f KB (%.0f bytes)\n", code_heap_kb, (double)code_heap_bytes);
-    printf("   (User input time was excluded)\n");
+        self.editor_pane.add(self.left_frame, stretch="always")
+
+        default_code = """#include <stdio.h>
 #ifdef _WIN32
-    PROCESS_MEMORY_COUNTERS_EX pmc;
-    SIZE_T peak_ws = 0;
-    SIZE_T base_ws = _IDE_BASE_WS;
-    SIZE_T base_priv = _IDE_BASE_PRIV;
-    if (GetProcessMemoryInfo(GetCurrentProcess(), (PROCESS_MEMORY_COUNTERS*)&pmc, sizeof(pmc))) {
-        peak_ws = pmc.PeakWorkingSetSize;
-        SIZE_T priv = pmc.PrivateUsage;
-        double peak_mb = (double)peak_ws / (1024.0 * 1024.0);
-        double delta_ws_kb = peak_ws >= base_ws ? (double)(peak_ws - base_ws) / 1024.0 : 0.0;
-        double priv_mb = (double)priv / (1024.0 * 1024.0);
-        double delta_priv_kb = priv >= base_priv ? (double)(priv - base_priv) / 1024.0 : 0.0;
-        printf("   CODE MEMORY: %.6f KB (%.0f bytes)\n", delta_priv_kb, (double)(priv >= base_priv ? (priv - base_priv) : 0));
-        printf("   PEAK WS:     %.2f MB (delta %.6f KB, %.0f bytes)\n", peak_mb, delta_ws_kb, (double)(peak_ws >= base_ws ? (peak_ws - base_ws) : 0));
-        printf("   PRIVATE:     %.2f MB (delta %.6f KB, %.0f bytes)\n", priv_mb, delta_priv_kb, (double)(priv >= base_priv ? (priv - base_priv) : 0));
-        if (_IDE_BENCHMARK) {
-            printf("IDE_PEAK_MEM=%.0f\n", (double)peak_ws);
-            printf("IDE_BASE_MEM=%.0f\n", (double)base_ws);
-        }
-    } else {
-        printf("   CODE MEMORY: N/A\n");
-        printf("   PEAK WS:     N/A\n");
-        printf("   PRIVATE:     N/A\n");
-    }
+#include <windows.h>
 #else
-    printf("   CODE MEMORY: N/A (non-Windows)\n");
-    printf("   PEAK WS:     N/A (non-Windows)\n");
-    printf("   PRIVATE:     N/A (non-Windows)\n");
+#include <unistd.h>
 #endif
-    printf("==========================================\n");
-    if (_IDE_BENCHMARK) {
-        printf("IDE_TIME=%.9f\n", _IDE_TOTAL_TIME);
-        printf("IDE_CPU=%.9f\n", _IDE_TOTAL_CPU);
-        printf("IDE_STEPS=%llu\n", (unsigned long long)_IDE_STEP_COUNT);
-    }
+
+int main() {
+    int n;
+    
+    printf("--- Phase 1: Input ---\n");
+    printf("Enter a number (take your time): ");
+    
+    // The timer will PAUSE here automatically!
+    scanf("%d", &n); 
+    
+    printf("\n--- Phase 2: Heavy Work ---\n");
+    printf("Processing... (simulating 2 seconds of work)\n");
+    
+    // This part is timed!
 #ifdef _WIN32
-    if (!_IDE_BENCHMARK) {
-        system("pause");
-    }
+    Sleep(2000);
+#else
+    usleep(2000 * 1000);
 #endif
-}
-// --------------------------
-"""
+    
+    printf("Done! The complexity timer captured strictly the 2 seconds.\n");
 
-        code = user_code
-        wrap = lambda m: f"_IDE_PAUSE(); {m.group(0)} _IDE_RESUME();"
+    return 0;
+}"""
+        self.editor_left.insert(tk.END, default_code)
+        self.editor_right.insert(tk.END, default_code)
 
-        code = self._replace_in_code(code, r"\bscanf_s\b", "_IDE_SCANF_S", flags=0)
-        code = self._replace_in_code(code, r"\bscanf\b", "_IDE_SCANF", flags=0)
+        self.editor = self.editor_left
 
-        patterns = [
-            r"\bstd::cin\s*>>.*?;|\bcin\s*>>.*?;",
-            r"\bstd::getline\s*\(.*?\)\s*;|\bgetline\s*\(.*?\)\s*;",
-            r"\bfgets\s*\(.*?\)\s*;",
-            r"\bgetchar\s*\(\s*\)\s*;",
-            r"\bgetc\s*\(.*?\)\s*;",
-            r"\bstd::cin\s*\.\s*get\s*\(.*?\)\s*;|\bcin\s*\.\s*get\s*\(.*?\)\s*;",
-            r"\bstd::cin\s*\.\s*getline\s*\(.*?\)\s*;|\bcin\s*\.\s*getline\s*\(.*?\)\s*;",
-        ]
+        self.editor_left.edit_modified(False)
+        self.editor_right.edit_modified(False)
+        self.editor_left.bind("<<Modified>>", lambda e, ed=self.editor_left: self.on_editor_modified(ed))
+        self.editor_right.bind("<<Modified>>", lambda e, ed=self.editor_right: self.on_editor_modified(ed))
+        self.project_name_var.trace_add("write", self.on_project_name_change)
 
-        for pattern in patterns:
-            code = self._replace_in_code(code, pattern, wrap, flags=re.DOTALL)
+        self.build_snippet_sidebar()
 
-        pattern = r"\b(int|void)\s+main\s*\((.*?)\)"
-        match = self._find_code_match(code, pattern, flags=re.DOTALL)
-        if not match:
-            return None
+        os.makedirs(PROJECTS_DIR, exist_ok=True)
+        self.load_project_settings()
+        self.apply_theme()
+        self.schedule_highlight(self.editor_left)
+        self.schedule_highlight(self.editor_right)
+        self.check_compiler()
 
-        return_type = match.group(1)
-        params = match.group(2).strip()
-        has_args = bool(params) and params != "void"
-        wrapper_sig = "int main(int argc, char** argv)" if has_args else "int main()"
-        call_expr = "user_logic(argc, argv)" if has_args else "user_logic()"
-        signature = code[match.start():match.end()]
-        new_signature = re.sub(pattern, r"\1 user_logic(\2)", signature, count=1, flags=re.DOTALL)
-        code = code[:match.start()] + new_signature + code[match.end():]
-
-        if return_type == "void":
-            wrapper_main = """
-{sig} {{
-    const char* ide_bench = getenv("IDE_BENCHMARK");
-    if (ide_bench && ide_bench[0] == '1') {{
-        _IDE_BENCHMARK = 1;
-    }}
-    _IDE_START();
-    {call};
-    _IDE_PRINT_RESULT();
-    return 0;
-}}
-""".format(sig=wrapper_sig, call=call_expr)
-        else:
-            wrapper_main = """
-{sig} {{
-    const char* ide_bench = getenv("IDE_BENCHMARK");
-    if (ide_bench && ide_bench[0] == '1') {{
-        _IDE_BENCHMARK = 1;
-    }}
-    _IDE_START();
-    int ret = {call};
-    _IDE_PRINT_RESULT();
-    return ret;
-}}
-""".format(sig=wrapper_sig, call=call_expr)
+    # --- INTELLIGENT CODE INJECTION ---
 
-        return timer_header + code + wrapper_main
+    def inject_smart_timer(self, user_code):
+        return inject_smart_timer(user_code, self.language_var.get())
 
     # --- EXECUTION ---
 
     def run_thread(self):
-        threading.Thread(target=self.compile_and_run, daemon=True).start()
+        self.scheduler.submit("run", self.compile_and_run)
+
+    def on_jobs_change(self, running, queued):
+        if queued:
+            self.lbl_status.config(text=f"Jobs: {running} running, {queued} queued")
+
+    def on_workers_change(self, *args):
+        try:
+            workers = int(self.job_workers_var.get())
+        except Exception:
+            return
+        if workers >= 1:
+            self.scheduler.set_workers(workers)
 
-    def compile_and_run(self):
+    def compile_and_run(self, workspace):
         if not self.check_compiler():
             return
 
+        proc = None
         self.btn_run.config(state=tk.DISABLED, text="Compiling...")
         try:
-            if not self.compile_code():
+            if not self.compile_code(workspace):
                 return
 
             if self.benchmark_var.get():
-                self.run_benchmark()
+                self.run_benchmark(workspace)
             else:
-                self.run_once()
+                proc = self.run_once(workspace)
         finally:
             self.btn_run.config(state=tk.NORMAL, text=RUN_BUTTON_TEXT)
 
-    def compile_code(self):
+        # Keep the job (and its workspace) alive until the interactive run exits.
+        if proc is not None:
+            try:
+                proc.wait()
+            except Exception:
+                return
+            status = "Done"
+            metrics = read_metrics_file(workspace.metrics_path())
+            t, mem, _, step_count = parse_ide_metrics(metrics)
+            if t is not None:
+                status += f" ({t * 1000:.3f} ms"
+                if step_count:
+                    status += f", {step_count} steps"
+                status += ")"
+            self.root.after(0, lambda: self.lbl_status.config(text=status))
+
+    def compile_code(self, workspace):
         raw_code = self.editor_left.get(1.0, tk.END)
-        return self.compile_code_from_text(raw_code, "left")
-
-    def compile_code_from_text(self, raw_code, side):
-        final_code = self.inject_smart_timer(raw_code)
-
-        if not final_code:
-            messagebox.showerror("Error", f"Could not parse main() function in {side} editor.")
-            self.lbl_status.config(text="Parse Failed")
-            return False
+        return self.compile_code_from_text(raw_code, "left", workspace)
 
+    def compile_code_from_text(self, raw_code, side, workspace, profile=None):
         try:
             self.autosave()
         except Exception:
             pass
 
-        source_path = self.get_temp_source_path(side)
-        with open(source_path, "w", encoding="utf-8") as f:
-            f.write(final_code)
+        self.wait_for_prebuild(raw_code, side, profile)
 
         try:
-            cmd = self.build_compile_command(source_path, self.get_temp_exe_path(side))
-        except Exception as e:
-            self.lbl_status.config(text="Compiler Missing")
-            messagebox.showerror("Compiler Error", str(e))
-            return False
-        self.lbl_status.config(text=f"Compiling {side}...")
-        run_kwargs = {"capture_output": True, "text": True}
-        if os.name == "nt" and hasattr(subprocess, "CREATE_NO_WINDOW"):
-            run_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
-        res = subprocess.run(cmd, **run_kwargs)
-
-        if res.returncode != 0:
-            self.lbl_status.config(text="Compilation Failed")
-            messagebox.showerror(f"Compilation Error ({side})", res.stderr or res.stdout)
+            self.build_executable(raw_code, side, workspace, profile=profile)
+        except BuildError as e:
+            self.lbl_status.config(text=e.status)
+            messagebox.showerror(e.title, str(e))
             return False
-
         return True
 
-    def build_compile_command(self, source_path, exe_path):
+    def build_executable(self, raw_code, side, workspace, profile=None, use_cache=True, on_line=None, on_start=None, quiet=False):
         compiler = self.get_active_compiler()
-        if not compiler:
-            raise RuntimeError("Compiler not available for selected language.")
+        time_report = self.time_report_var.get() and not quiet
+        trace_dir = os.path.join(workspace.path, f"time_trace_{side}")
+        extra_flags = self.get_time_report_flags(compiler, trace_dir) if time_report and compiler else []
+
+        def on_compile():
+            if not quiet:
+                self.lbl_status.config(text=f"Compiling {side}...")
+
+        elapsed, output, pch_used = compile_program(
+            raw_code,
+            self.language_var.get(),
+            side,
+            workspace,
+            compiler,
+            profile or self.get_build_profile(),
+            c_is_cpp_driver=self.c_compiler_is_cpp_driver,
+            cache=self.compile_cache,
+            use_cache=use_cache and not time_report,
+            extra_flags=extra_flags,
+            on_line=on_line,
+            on_start=on_start,
+            on_compile=on_compile,
+        )
+        if elapsed is None:
+            if not quiet:
+                self.lbl_status.config(text=f"Using cached build ({side})")
+            self.record_compile(side, profile, 0.0, cached=True, pch=pch_used, background=quiet)
+            return
 
-        lang = self.language_var.get()
-        if lang == "C":
-            cmd = [compiler, source_path, "-o", exe_path, "-std=c11"]
-            if self.c_compiler_is_cpp_driver:
-                cmd.insert(1, "-x")
-                cmd.insert(2, "c")
-            if os.name != "nt":
-                cmd.append("-lm")
+        self.record_compile(side, profile, elapsed, cached=False, pch=pch_used, background=quiet)
+        if time_report:
+            self.collect_time_report(side, compiler, output, trace_dir, elapsed)
+
+    def get_time_report_flags(self, compiler, trace_dir):
+        if is_clang_compiler(compiler):
+            shutil.rmtree(trace_dir, ignore_errors=True)
+            os.makedirs(trace_dir, exist_ok=True)
+            return [f"-ftime-trace={trace_dir}"]
+        return ["-ftime-report"]
+
+    def collect_time_report(self, side, compiler, output, trace_dir, elapsed):
+        if is_clang_compiler(compiler):
+            paths = []
+            for root_dir, _, names in os.walk(trace_dir):
+                paths.extend(os.path.join(root_dir, n) for n in names if n.endswith(".json"))
+            report = parse_clang_time_trace(paths)
         else:
-            cmd = [compiler, source_path, "-o", exe_path, "-std=c++17"]
-
-        if os.name == "nt":
-            cmd.append("-lpsapi")
+            report = parse_gcc_time_report(output)
+        report["side"] = side
+        report["elapsed"] = elapsed
+        report["profile"] = self.describe_profile()
+        self.last_compile_report = report
+        self.root.after(0, self.open_compile_stats_window)
+
+    def record_compile(self, side, profile, seconds, cached, pch, background=False):
+        entry = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "side": side,
+            "profile": profile or self.get_build_profile(),
+            "seconds": round(seconds, 4),
+            "cached": cached,
+            "pch": pch,
+            "background": background,
+        }
+        try:
+            append_compile_history(self.sanitize_project_name(self.project_name_var.get()), entry)
+        except OSError:
+            pass
 
-        return cmd
+    def open_compile_stats_window(self):
+        win = self._compile_stats_window
+        if not (win and win.winfo_exists()):
+            win = tk.Toplevel(self.root)
+            win.title("Compile Stats")
+            win.geometry("760x560")
+            self._compile_stats_window = win
+            win.info = scrolledtext.ScrolledText(win, font=("Consolas", 10))
+            win.info.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        win.lift()
 
-    def get_temp_source_path(self, side):
-        if self.language_var.get() == "C":
-            return TEMP_SOURCE_FILE_C if side == "left" else TEMP_SOURCE_FILE_C_RIGHT
-        return TEMP_SOURCE_FILE_CPP if side == "left" else TEMP_SOURCE_FILE_CPP_RIGHT
+        lines = []
+        report = self.last_compile_report
+        if report:
+            lines.append(f"Last timed compile ({report['side']}, {report['profile']}): {report['elapsed']:.3f} s wall")
+            if report.get("total") is not None:
+                lines.append(f"Compiler-reported total: {report['total']:.3f} s")
+            lines.append("")
+            lines.append(f"{'Phase':<44}{'Wall (s)':>12}")
+            for name, wall in report["phases"]:
+                lines.append(f"{name[:43]:<44}{wall:>12.3f}")
+            lines.append("")
+            lines.append(f"{'Top items':<44}{'Wall (s)':>12}")
+            for name, wall in report["items"]:
+                lines.append(f"{name[:43]:<44}{wall:>12.3f}")
+        else:
+            lines.append("Enable 'Compile Timing' and run to see a per-phase breakdown.")
 
-    def get_temp_exe_path(self, side):
-        return TEMP_EXE_FILE if side == "left" else TEMP_EXE_FILE_RIGHT
+        name = self.sanitize_project_name(self.project_name_var.get())
+        history = load_compile_history(name)
+        lines.append("")
+        lines.append(f"Compile history for {name} (latest {min(len(history), 30)} of {len(history)}):")
+        lines.append(f"{'When':<21}{'Side':<16}{'Profile':<10}{'Result':<12}{'PCH':<6}{'Seconds':>9}")
+        for entry in history[-30:][::-1]:
+            result = "cache hit" if entry.get("cached") else "compiled"
+            if entry.get("background"):
+                result += "*"
+            lines.append(
+                f"{entry.get('time', ''):<21}{entry.get('side', ''):<16}{entry.get('profile', ''):<10}"
+                f"{result:<12}{'yes' if entry.get('pch') else 'no':<6}{entry.get('seconds', 0.0):>9.3f}"
+            )
+        compiled = [e["seconds"] for e in history if not e.get("cached")]
+        if compiled:
+            lines.append("")
+            lines.append(f"Compiles: {len(compiled)}, mean {statistics.mean(compiled):.3f} s, "
+                         f"cache hits: {len(history) - len(compiled)}  (* = background build)")
+
+        win.info.configure(state=tk.NORMAL)
+        win.info.delete("1.0", tk.END)
+        win.info.insert(tk.END, "\n".join(lines))
+        win.info.configure(state=tk.DISABLED)
+
+    def build_compile_command(self, source_path, exe_path, pch_variant=None, profile=None, extra_flags=None):
+        return build_compile_command(
+            self.get_active_compiler(),
+            self.language_var.get(),
+            source_path,
+            exe_path,
+            profile or self.get_build_profile(),
+            c_is_cpp_driver=self.c_compiler_is_cpp_driver,
+            pch_variant=pch_variant,
+            extra_flags=extra_flags,
+        )
 
     def get_source_extension(self):
-        return ".c" if self.language_var.get() == "C" else ".cpp"
+        return get_source_extension(self.language_var.get())
 
     def get_active_compiler(self):
         if self.language_var.get() == "C":
             return self.compiler_cmd_c
         return self.compiler_cmd_cpp
 
-    def run_once(self):
+    def run_once(self, workspace):
         self.lbl_status.config(text="Running...")
-        proc = self.launch_process(self.get_temp_exe_path("left"))
+        env = os.environ.copy()
+        env.pop("IDE_METRICS_FD", None)
+        env["IDE_METRICS_FILE"] = workspace.metrics_path()
+        proc = self.launch_process(workspace.exe_path("left"), env)
         if proc is None:
             self.lbl_status.config(text="Run Failed")
-            return
+            return None
 
         self.running_process = proc
+        return proc
 
-        def wait_for_exit():
-            try:
-                proc.wait()
-            except Exception:
-                return
-            self.root.after(0, lambda: self.lbl_status.config(text="Done"))
-
-        threading.Thread(target=wait_for_exit, daemon=True).start()
-
-    def launch_process(self, exe_path):
+    def launch_process(self, exe_path, env=None):
+        use_available_cpus()
         try:
             if os.name == "nt":
                 flags = subprocess.CREATE_NEW_CONSOLE if hasattr(subprocess, "CREATE_NEW_CONSOLE") else 0
-                return subprocess.Popen([exe_path], creationflags=flags)
+                return subprocess.Popen([exe_path], creationflags=flags, env=env)
             if shutil.which("xterm"):
-                return subprocess.Popen(["xterm", "-e", exe_path])
-            return subprocess.Popen([exe_path])
+                return subprocess.Popen(["xterm", "-e", exe_path], env=env)
+            return subprocess.Popen([exe_path], env=env)
         except Exception as e:
             messagebox.showerror("Run Error", str(e))
             return None
 
     def code_uses_input(self, code):
-        patterns = [
-            r"\bscanf_s\s*\(",
-            r"\bscanf\s*\(",
-            r"\bstd::cin\s*>>",
-            r"\bcin\s*>>",
-            r"\bstd::getline\s*\(",
-            r"\bgetline\s*\(",
-            r"\bfgets\s*\(",
-            r"\bgetchar\s*\(",
-            r"\bgetc\s*\(",
-            r"\bstd::cin\s*\.\s*get",
-            r"\bcin\s*\.\s*get",
-            r"\bstd::cin\s*\.\s*getline",
-            r"\bcin\s*\.\s*getline",
-        ]
-        for pattern in patterns:
-            if self._find_code_match(code, pattern, flags=re.DOTALL):
-                return True
-        return False
+        return code_uses_input(code)
 
-    def run_benchmark(self):
+    def run_benchmark(self, workspace):
         raw_code = self.editor_left.get(1.0, tk.END)
         if self.code_uses_input(raw_code):
             proceed = messagebox.askyesno(
@@ -1414,112 +4523,554 @@ void _IDE_PRINT_RESULT() {
                 self.lbl_status.config(text="Benchmark Canceled")
                 return
 
-        try:
-            runs = int(self.benchmark_runs_var.get())
-        except Exception:
-            runs = BENCHMARK_DEFAULT_RUNS
+        runs = self.get_benchmark_runs()
+
+        env = self.get_benchmark_env()
+
+        try:
+            settings = self.get_benchmark_settings()
+            stopper = self.get_adaptive_stopper()
+        except ValueError as e:
+            self.lbl_status.config(text="Benchmark Canceled")
+            messagebox.showerror("Benchmark Options", str(e))
+            return
+        spill_path = None
+        if self.bench_save_output_var.get():
+            name = self.sanitize_project_name(self.project_name_var.get())
+            spill_path = os.path.join(PROJECTS_DIR, f"{name}.bench_output.txt")
+        samples, mode_note, stop_reason = self.collect_benchmark_samples(
+            workspace.exe_path("left"), env, runs, settings, stopper=stopper, spill_path=spill_path
+        )
+        try:
+            result = benchmark_result_from_samples(samples, self.describe_profile(), mode_note, stop_reason, env.get("IDE_WARMUP"))
+        except RunError as e:
+            self.lbl_status.config(text=e.status)
+            messagebox.showerror(e.title, str(e))
+            return
+        result.output_path = spill_path
+
+        self.last_benchmark_result = result
+        text = result.to_text()
+        self.root.after(0, lambda: self.show_text_result("Benchmark Results", text))
+        self.lbl_status.config(text="Benchmark Done")
+
+    def get_benchmark_env(self):
+        options = {
+            "perf": self.bench_perf_var.get(),
+            "flush": self.bench_flush_var.get(),
+            "subtract_overhead": self.bench_subtract_overhead_var.get(),
+            "preload": self.bench_preload_var.get(),
+        }
+        if not self.bench_repeat_var.get():
+            return make_benchmark_env(**options)
+        try:
+            warmup = int(self.bench_warmup_var.get())
+        except ValueError:
+            warmup = REPEAT_DEFAULT_WARMUP
+        try:
+            min_time = float(self.bench_min_time_var.get())
+        except ValueError:
+            min_time = REPEAT_DEFAULT_MIN_TIME
+        return make_benchmark_env(True, warmup, min_time, **options)
+
+    def get_benchmark_settings(self):
+        nice = None
+        nice_text = self.bench_nice_var.get().strip()
+        if nice_text and os.name != "nt":
+            try:
+                nice = int(nice_text)
+            except ValueError:
+                raise ValueError(f"Nice level must be an integer, got '{nice_text}'.")
+        return make_benchmark_settings(self.bench_mode_var.get(), nice, self.bench_no_aslr_var.get(), self.get_judge_limits())
+
+    def get_judge_limits(self):
+        if not self.bench_judge_var.get():
+            return None
+        try:
+            time_limit = float(self.bench_time_limit_var.get())
+            memory_text = self.bench_memory_limit_var.get().strip()
+            memory_mb = float(memory_text) if memory_text else None
+        except ValueError:
+            raise ValueError("Judge mode needs a numeric time limit and memory limit (MB, blank = none).")
+        return make_judge_limits(time_limit, memory_mb)
+
+    def collect_benchmark_samples(self, exe_path, env, runs, settings, input_data="", stopper=None, label="Benchmark", spill_path=None):
+        return collect_benchmark_samples(
+            exe_path,
+            env,
+            runs,
+            settings,
+            input_data=input_data,
+            stopper=stopper,
+            label=label,
+            spill_path=spill_path,
+            on_progress=self.report_sample_progress,
+        )
+
+    def report_sample_progress(self, label, done, total, cores):
+        if cores > 1:
+            self.lbl_status.config(text=f"{label} {done}/{total} ({cores} cores)...")
+        else:
+            self.lbl_status.config(text=f"{label} {done}/{total}...")
+
+    def get_adaptive_stopper(self):
+        if not self.bench_adaptive_var.get():
+            return None
+        try:
+            ci_percent = float(self.bench_ci_var.get())
+            min_runs = int(self.bench_min_runs_var.get())
+            max_runs = int(self.bench_max_runs_var.get())
+            budget = float(self.bench_budget_var.get())
+        except ValueError:
+            raise ValueError("Adaptive stopping needs a numeric CI target, min/max runs and time budget.")
+        return make_adaptive_stopper(ci_percent, min_runs, max_runs, budget)
+
+    def open_benchmark_options(self):
+        win = tk.Toplevel(self.root)
+        win.title("Benchmark Options")
+        win.geometry("560x610")
+
+        cpus = get_available_cpus()
+        tk.Label(win, text=f"Available cores: {format_cpu_list(cpus)}").pack(anchor="w", padx=10, pady=(10, 6))
+
+        mode_frame = tk.Frame(win)
+        mode_frame.pack(fill=tk.X, padx=10)
+        tk.Label(mode_frame, text="Mode:").pack(side=tk.LEFT)
+        tk.OptionMenu(mode_frame, self.bench_mode_var, *BENCHMARK_MODES).pack(side=tk.LEFT, padx=(6, 0))
+
+        tk.Label(
+            win,
+            text="Serial: back to back, unpinned. Parallel: one run per core, each pinned.\n"
+                 "Isolated: serial runs pinned to a core reserved for them; other jobs start off it.",
+            justify=tk.LEFT,
+        ).pack(anchor="w", padx=10, pady=(4, 8))
+
+        nice_frame = tk.Frame(win)
+        nice_frame.pack(fill=tk.X, padx=10)
+        tk.Label(nice_frame, text="Nice level (blank = unchanged):").pack(side=tk.LEFT)
+        tk.Entry(nice_frame, textvariable=self.bench_nice_var, width=6).pack(side=tk.LEFT, padx=(6, 0))
+
+        chk_aslr = tk.Checkbutton(win, text="Disable ASLR (Linux)", variable=self.bench_no_aslr_var)
+        chk_aslr.pack(anchor="w", padx=10, pady=(6, 0))
+        if not sys.platform.startswith("linux") or not shutil.which("setarch"):
+            chk_aslr.configure(state=tk.DISABLED)
+
+        tk.Checkbutton(
+            win,
+            text="In-process repeat (replays stdin; globals are not reset between iterations)",
+            variable=self.bench_repeat_var,
+        ).pack(anchor="w", padx=10, pady=(6, 0))
+
+        repeat_frame = tk.Frame(win)
+        repeat_frame.pack(fill=tk.X, padx=10)
+        tk.Label(repeat_frame, text="Warmup iterations:").pack(side=tk.LEFT)
+        tk.Entry(repeat_frame, textvariable=self.bench_warmup_var, width=4).pack(side=tk.LEFT, padx=(6, 12))
+        tk.Label(repeat_frame, text="Min batch time (s):").pack(side=tk.LEFT)
+        tk.Entry(repeat_frame, textvariable=self.bench_min_time_var, width=6).pack(side=tk.LEFT, padx=(6, 0))
+
+        tk.Checkbutton(
+            win,
+            text="Adaptive stopping (ignores the runs box; also used per N in complexity)",
+            variable=self.bench_adaptive_var,
+        ).pack(anchor="w", padx=10, pady=(6, 0))
+
+        adaptive_frame = tk.Frame(win)
+        adaptive_frame.pack(fill=tk.X, padx=10)
+        for text, var in [
+            ("CI \u00b1%:", self.bench_ci_var),
+            ("Min runs:", self.bench_min_runs_var),
+            ("Max runs:", self.bench_max_runs_var),
+            ("Budget (s):", self.bench_budget_var),
+        ]:
+            tk.Label(adaptive_frame, text=text).pack(side=tk.LEFT)
+            tk.Entry(adaptive_frame, textvariable=var, width=5).pack(side=tk.LEFT, padx=(4, 10))
+
+        tk.Checkbutton(
+            win,
+            text="Save full output of the first run to projects/<name>.bench_output.txt",
+            variable=self.bench_save_output_var,
+        ).pack(anchor="w", padx=10, pady=(6, 0))
+
+        tk.Checkbutton(
+            win,
+            text="Flush output before every input read (as in interactive runs; slower)",
+            variable=self.bench_flush_var,
+        ).pack(anchor="w", padx=10, pady=(6, 0))
+
+        tk.Checkbutton(
+            win,
+            text="Subtract the calibrated timer overhead of input pauses from reported times",
+            variable=self.bench_subtract_overhead_var,
+        ).pack(anchor="w", padx=10, pady=(6, 0))
+
+        tk.Checkbutton(
+            win,
+            text="Preload input into memory (reads are timed, but never pause the timer)",
+            variable=self.bench_preload_var,
+        ).pack(anchor="w", padx=10, pady=(6, 0))
+
+        chk_perf = tk.Checkbutton(
+            win,
+            text="Performance counters: IPC, cache and branch misses (Linux perf_event_open)",
+            variable=self.bench_perf_var,
+        )
+        chk_perf.pack(anchor="w", padx=10, pady=(6, 0))
+        if not sys.platform.startswith("linux"):
+            chk_perf.configure(state=tk.DISABLED)
+
+        tk.Checkbutton(
+            win,
+            text="Judge mode: enforce limits, record OK/TLE/MLE/RE per run (also races and test cases)",
+            variable=self.bench_judge_var,
+        ).pack(anchor="w", padx=10, pady=(6, 0))
+
+        judge_frame = tk.Frame(win)
+        judge_frame.pack(fill=tk.X, padx=10)
+        tk.Label(judge_frame, text="Time limit (s):").pack(side=tk.LEFT)
+        tk.Entry(judge_frame, textvariable=self.bench_time_limit_var, width=6).pack(side=tk.LEFT, padx=(6, 12))
+        tk.Label(judge_frame, text="Memory limit (MB):").pack(side=tk.LEFT)
+        tk.Entry(judge_frame, textvariable=self.bench_memory_limit_var, width=6).pack(side=tk.LEFT, padx=(6, 0))
+
+        def close():
+            self.save_project_settings()
+            win.destroy()
+
+        tk.Button(win, text="Save", command=close, width=10).pack(pady=10)
+
+    def get_benchmark_runs(self):
+        try:
+            runs = int(self.benchmark_runs_var.get())
+        except Exception:
+            runs = BENCHMARK_DEFAULT_RUNS
+
+        if runs < 1:
+            runs = BENCHMARK_DEFAULT_RUNS
+        return runs
+
+    def run_profile_comparison_thread(self):
+        self.scheduler.submit("profiles", self.run_profile_comparison)
+
+    def run_profile_comparison(self, workspace):
+        if not self.check_compiler():
+            return
+
+        raw_code = self.editor_left.get(1.0, tk.END)
+        if self.code_uses_input(raw_code):
+            proceed = messagebox.askyesno(
+                "Profile Comparison Warning",
+                "Profile comparison runs non-interactively. Programs waiting for input may hang. Continue?",
+            )
+            if not proceed:
+                self.lbl_status.config(text="Profile Comparison Canceled")
+                return
+
+        runs = self.get_benchmark_runs()
+        env = self.get_benchmark_env()
+
+        rows = []
+        self.btn_run.config(state=tk.DISABLED, text="Comparing Profiles...")
+        try:
+            for profile in BUILD_PROFILES:
+                self.lbl_status.config(text=f"Compiling ({profile})...")
+                start = time.perf_counter()
+                try:
+                    self.build_executable(raw_code, "left", workspace, profile=profile, use_cache=False)
+                except BuildError as e:
+                    rows.append((profile, None, None, e.status))
+                    continue
+                compile_s = time.perf_counter() - start
+
+                times = []
+                note = ""
+                for i in range(runs):
+                    self.lbl_status.config(text=f"Profile {profile} {i + 1}/{runs}...")
+                    res = run_captured([workspace.exe_path("left")], "", env=env)
+                    t, _, _, _ = parse_ide_metrics(res.metrics)
+                    if res.returncode != 0 or t is None:
+                        note = "Runtime Error"
+                        break
+                    times.append(t)
+
+                rows.append((profile, compile_s, SampleStats(times) if times else None, note))
+        finally:
+            self.btn_run.config(state=tk.NORMAL, text=RUN_BUTTON_TEXT)
+
+        lines = [
+            f"Runs per profile: {runs}",
+            "",
+            f"{'Profile':<10}{'Flags':<22}{'Compile (s)':>13}{'Median run (s)':>16}{'MAD (s)':>15}",
+        ]
+        for profile, compile_s, stats, note in rows:
+            flags = " ".join(BUILD_PROFILES[profile])
+            compile_txt = f"{compile_s:.3f}" if compile_s is not None else "-"
+            median_txt = f"{stats.median:.9f}" if stats else "-"
+            mad_txt = f"{stats.mad:.9f}" if stats else "-"
+            row = f"{profile:<10}{flags:<22}{compile_txt:>13}{median_txt:>16}{mad_txt:>15}"
+            if note:
+                row += f"  {note}"
+            lines.append(row)
+
+        self.root.after(0, lambda: self.show_text_result("Profile Comparison", "\n".join(lines)))
+        self.lbl_status.config(text="Profile Comparison Done")
+
+    def show_text_result(self, title, text):
+        win = tk.Toplevel(self.root)
+        win.title(title)
+        win.geometry("760x320")
+        info = scrolledtext.ScrolledText(win, font=("Consolas", 10))
+        info.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        info.insert(tk.END, text)
+        info.configure(state=tk.DISABLED)
+
+    # --- TEST CASES ---
+
+    def open_testcase_window(self):
+        win = self._testcase_window
+        if win and win.winfo_exists():
+            win.lift()
+            return
+
+        win = tk.Toplevel(self.root)
+        win.title("Test Cases")
+        win.geometry("1100x640")
+        self._testcase_window = win
+        win.sort_column = "index"
+        win.sort_reverse = False
+
+        pane = tk.PanedWindow(win, orient=tk.HORIZONTAL, sashwidth=6)
+        pane.pack(fill=tk.BOTH, expand=True)
+        left = tk.Frame(pane)
+        right = tk.Frame(pane)
+        pane.add(left, stretch="always")
+        pane.add(right, stretch="always")
+
+        folder = get_testcase_dir(self.sanitize_project_name(self.project_name_var.get()))
+        tk.Label(left, text=f"Cases (stored in {folder}):").pack(anchor="w", padx=10, pady=(10, 2))
+        win.case_list = tk.Listbox(left, height=8, exportselection=False)
+        win.case_list.pack(fill=tk.X, padx=10)
+        win.case_list.bind("<<ListboxSelect>>", lambda e: self.load_selected_testcase())
+
+        name_frame = tk.Frame(left)
+        name_frame.pack(fill=tk.X, padx=10, pady=6)
+        tk.Label(name_frame, text="Name:").pack(side=tk.LEFT)
+        win.case_name_var = tk.StringVar(value="case1")
+        tk.Entry(name_frame, textvariable=win.case_name_var, width=20).pack(side=tk.LEFT, padx=(4, 8))
+        tk.Button(name_frame, text="New", command=self.new_testcase).pack(side=tk.LEFT, padx=2)
+        tk.Button(name_frame, text="Save", command=self.save_current_testcase).pack(side=tk.LEFT, padx=2)
+        tk.Button(name_frame, text="Delete", command=self.delete_current_testcase).pack(side=tk.LEFT, padx=2)
+
+        tk.Label(left, text="Input:").pack(anchor="w", padx=10)
+        win.input_text = scrolledtext.ScrolledText(left, font=("Consolas", 10), height=10, width=50)
+        win.input_text.pack(fill=tk.BOTH, expand=True, padx=10)
+        tk.Label(left, text="Expected output (optional, whitespace-insensitive):").pack(anchor="w", padx=10, pady=(6, 0))
+        win.expected_text = scrolledtext.ScrolledText(left, font=("Consolas", 10), height=6, width=50)
+        win.expected_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        top = tk.Frame(right)
+        top.pack(fill=tk.X, padx=10, pady=(10, 4))
+        win.btn_run_all = tk.Button(top, text="Run All", command=self.run_testcases_thread, font=("Segoe UI", 9, "bold"))
+        win.btn_run_all.pack(side=tk.LEFT)
+        win.summary = tk.Label(top, text="Double-click a row to see its output.")
+        win.summary.pack(side=tk.LEFT, padx=10)
+
+        columns = [
+            ("case", "Case", 160),
+            ("status", "Status", 70),
+            ("time", "Algo time (ms)", 110),
+            ("cpu", "CPU time (ms)", 110),
+            ("steps", "Steps", 100),
+            ("mem", "Memory (MB)", 100),
+        ]
+        win.table = ttk.Treeview(right, columns=[c[0] for c in columns], show="headings")
+        for key, heading, width in columns:
+            win.table.heading(key, text=heading, command=lambda k=key: self.sort_testcase_table(k))
+            win.table.column(key, width=width, anchor="w" if key == "case" else "e")
+        win.table.tag_configure("slowest", background="#ffe08a")
+        win.table.tag_configure("failed", foreground="#c62828")
+        win.table.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        win.table.bind("<Double-1>", lambda e: self.show_testcase_output())
+
+        self.refresh_testcase_list()
+        self.fill_testcase_table()
+
+    def refresh_testcase_list(self, select=None):
+        win = self._testcase_window
+        cases = list_testcases(self.sanitize_project_name(self.project_name_var.get()))
+        win.case_list.delete(0, tk.END)
+        for case in cases:
+            win.case_list.insert(tk.END, case)
+        if select in cases:
+            win.case_list.selection_set(cases.index(select))
+
+    def load_selected_testcase(self):
+        win = self._testcase_window
+        selection = win.case_list.curselection()
+        if not selection:
+            return
+        case = win.case_list.get(selection[0])
+        try:
+            input_text, expected = load_testcase(self.sanitize_project_name(self.project_name_var.get()), case)
+        except OSError as e:
+            messagebox.showerror("Test Cases", str(e))
+            return
+        win.case_name_var.set(case)
+        win.input_text.delete("1.0", tk.END)
+        win.input_text.insert(tk.END, input_text)
+        win.expected_text.delete("1.0", tk.END)
+        win.expected_text.insert(tk.END, expected or "")
+
+    def new_testcase(self):
+        win = self._testcase_window
+        existing = set(list_testcases(self.sanitize_project_name(self.project_name_var.get())))
+        index = len(existing) + 1
+        while f"case{index}" in existing:
+            index += 1
+        win.case_name_var.set(f"case{index}")
+        win.case_list.selection_clear(0, tk.END)
+        win.input_text.delete("1.0", tk.END)
+        win.expected_text.delete("1.0", tk.END)
+
+    def save_current_testcase(self):
+        win = self._testcase_window
+        case = re.sub(r"[^A-Za-z0-9 _.-]", "", win.case_name_var.get()).strip()
+        if not case:
+            messagebox.showerror("Test Cases", "Give the test case a name (letters, digits, space, _ . -).")
+            return
+        # Tk adds a trailing newline to Text contents; drop just that one.
+        input_text = win.input_text.get("1.0", "end-1c")
+        expected = win.expected_text.get("1.0", "end-1c")
+        try:
+            save_testcase(self.sanitize_project_name(self.project_name_var.get()), case, input_text, expected)
+        except OSError as e:
+            messagebox.showerror("Test Cases", str(e))
+            return
+        win.case_name_var.set(case)
+        self.refresh_testcase_list(select=case)
+
+    def delete_current_testcase(self):
+        win = self._testcase_window
+        case = win.case_name_var.get().strip()
+        if not case or not messagebox.askyesno("Test Cases", f"Delete test case '{case}'?"):
+            return
+        delete_testcase(self.sanitize_project_name(self.project_name_var.get()), case)
+        self.refresh_testcase_list()
+        self.new_testcase()
+
+    def sort_testcase_table(self, column):
+        win = self._testcase_window
+        win.sort_reverse = win.sort_column == column and not win.sort_reverse
+        win.sort_column = column
+        self.fill_testcase_table()
+
+    def fill_testcase_table(self):
+        win = self._testcase_window
+        if not (win and win.winfo_exists()):
+            return
+        column = win.sort_column
+        # Missing values (e.g. no memory reading, failed runs) always sort last.
+        present = [r for r in self.testcase_results if r.get(column) is not None]
+        missing = [r for r in self.testcase_results if r.get(column) is None]
+        present.sort(key=lambda r: natural_sort_key(r[column]) if column == "case" else r[column], reverse=win.sort_reverse)
+
+        timed = [r for r in self.testcase_results if r["time"] is not None]
+        slowest = max(timed, key=lambda r: r["time"])["index"] if timed else None
+
+        def ms(value):
+            return "-" if value is None else f"{value * 1000:.3f}"
+
+        win.table.delete(*win.table.get_children())
+        for r in present + missing:
+            tags = []
+            if r["index"] == slowest:
+                tags.append("slowest")
+            if r["status"] not in ("PASS", "OK"):
+                tags.append("failed")
+            values = (
+                r["case"],
+                r["status"],
+                ms(r["time"]),
+                ms(r["cpu"]),
+                "-" if r["steps"] is None else r["steps"],
+                "-" if r["mem"] is None else f"{r['mem'] / (1024.0 * 1024.0):.2f}",
+            )
+            win.table.insert("", tk.END, iid=str(r["index"]), values=values, tags=tags)
+
+    def show_testcase_output(self):
+        win = self._testcase_window
+        selection = win.table.selection()
+        if not selection:
+            return
+        index = int(selection[0])
+        for r in self.testcase_results:
+            if r["index"] == index:
+                text = f"Case: {r['case']}\nStatus: {r['status']} (exit code {r['returncode']})\n\n{r['output']}"
+                if r["stderr"]:
+                    text += f"\n--- stderr ---\n{r['stderr']}"
+                self.show_text_result(f"Output: {r['case']}", text)
+                return
+
+    def run_testcases_thread(self):
+        self.save_current_testcase_if_named()
+        self.scheduler.submit("tests", self.run_testcases)
+
+    def save_current_testcase_if_named(self):
+        win = self._testcase_window
+        if win and win.winfo_exists() and win.input_text.get("1.0", "end-1c"):
+            self.save_current_testcase()
 
-        if runs < 1:
-            runs = BENCHMARK_DEFAULT_RUNS
+    def run_testcases(self, workspace):
+        if not self.check_compiler():
+            return
 
-        env = os.environ.copy()
-        env["IDE_BENCHMARK"] = "1"
+        name = self.sanitize_project_name(self.project_name_var.get())
+        cases = list_testcases(name)
+        if not cases:
+            messagebox.showerror("Test Cases", "Add at least one test case first.")
+            return
 
-        times = []
-        cpu_times = []
-        mems = []
-        steps = []
-
-        for i in range(runs):
-            self.lbl_status.config(text=f"Benchmark {i + 1}/{runs}...")
-            res = subprocess.run(
-                [self.get_temp_exe_path("left")],
-                input="",
-                capture_output=True,
-                text=True,
-                env=env,
-            )
+        try:
+            limits = self.get_judge_limits()
+        except ValueError as e:
+            messagebox.showerror("Benchmark Options", str(e))
+            return
 
-            if res.returncode != 0:
-                self.lbl_status.config(text="Benchmark Failed")
-                messagebox.showerror("Runtime Error", res.stderr or res.stdout)
+        win = self._testcase_window
+        win.btn_run_all.config(state=tk.DISABLED)
+        try:
+            if not self.compile_code(workspace):
                 return
 
-            t, mem, cpu, step_count = self.parse_ide_metrics(res.stdout + res.stderr)
-            if t is None:
-                self.lbl_status.config(text="Benchmark Failed")
-                messagebox.showerror(
-                    "Benchmark Error",
-                    "Could not parse timing output. Ensure the program runs correctly.",
-                )
+            try:
+                data = [(case,) + load_testcase(name, case) for case in cases]
+            except OSError as e:
+                messagebox.showerror("Test Cases", str(e))
                 return
 
-            times.append(t)
-            if cpu is not None:
-                cpu_times.append(cpu)
-            if mem is not None:
-                mems.append(mem)
-            if step_count is not None:
-                steps.append(step_count)
-
-        mean_t = statistics.mean(times)
-        stdev_t = statistics.pstdev(times) if len(times) > 1 else 0.0
-
-        msg = f"Runs: {runs}\nMean time: {mean_t:.9f} s\nStd dev: {stdev_t:.9f} s"
-        if cpu_times:
-            mean_cpu = statistics.mean(cpu_times)
-            stdev_cpu = statistics.pstdev(cpu_times) if len(cpu_times) > 1 else 0.0
-            msg += f"\nMean CPU time: {mean_cpu:.9f} s\nStd dev CPU: {stdev_cpu:.9f} s"
-        if mems:
-            mean_mem = statistics.mean(mems) / (1024.0 * 1024.0)
-            stdev_mem = statistics.pstdev(mems) / (1024.0 * 1024.0) if len(mems) > 1 else 0.0
-            msg += f"\nMean memory delta: {mean_mem:.2f} MB\nStd dev memory delta: {stdev_mem:.2f} MB"
-        if steps:
-            mean_steps = statistics.mean(steps)
-            stdev_steps = statistics.pstdev(steps) if len(steps) > 1 else 0.0
-            msg += f"\nMean steps: {mean_steps:.0f}\nMax steps: {max(steps)}\nStd dev steps: {stdev_steps:.0f}"
-
-        messagebox.showinfo("Benchmark Results", msg)
-        self.lbl_status.config(text="Benchmark Done")
+            self.testcase_results = []
+            self.root.after(0, self.fill_testcase_table)
 
-    def parse_ide_metrics(self, output):
-        time_match = re.search(r"IDE_TIME=([0-9.]+)", output)
-        cpu_match = re.search(r"IDE_CPU=([0-9.]+)", output)
-        mem_match = re.search(r"IDE_PEAK_MEM=([0-9.]+)", output)
-        base_match = re.search(r"IDE_BASE_MEM=([0-9.]+)", output)
-        steps_match = re.search(r"IDE_STEPS=([0-9]+)", output)
-        time_val = float(time_match.group(1)) if time_match else None
-        cpu_val = float(cpu_match.group(1)) if cpu_match else None
-        steps_val = int(steps_match.group(1)) if steps_match else None
-        if mem_match:
-            peak_val = float(mem_match.group(1))
-            if base_match:
-                base_val = float(base_match.group(1))
-                mem_val = max(0.0, peak_val - base_val)
-            else:
-                mem_val = peak_val
-        else:
-            mem_val = None
-        return time_val, mem_val, cpu_val, steps_val
+            def on_result(result):
+                self.testcase_results.append(result)
+                self.lbl_status.config(text=f"Test cases {len(self.testcase_results)}/{len(data)}...")
+                self.root.after(0, self.fill_testcase_table)
+
+            results = run_testcases(
+                workspace.exe_path("left"), make_benchmark_env(report_overhead=False), data, self.scheduler.workers, workspace, on_result, limits
+            )
+            summary = count_verdicts([r["status"] for r in results])
+            self.root.after(0, lambda: win.summary.config(text=f"{len(results)} cases: {summary}"))
+            self.lbl_status.config(text="Test Cases Done")
+        finally:
+            win.btn_run_all.config(state=tk.NORMAL)
 
     def run_complexity_thread(self, n_text, template_text):
-        threading.Thread(
-            target=self.run_complexity,
-            args=(n_text, template_text),
-            daemon=True,
-        ).start()
+        self.scheduler.submit("complexity", self.run_complexity, n_text, template_text)
 
-    def run_complexity(self, n_text, template_text):
+    def run_complexity(self, workspace, n_text, template_text):
         if not self.check_compiler():
             return
 
-        n_values = [
-            int(v)
-            for v in re.split(r"[ ,]+", n_text.strip())
-            if v.strip().isdigit()
-        ]
-        n_values = [n for n in n_values if n > 0]
-
+        n_values = parse_n_values(n_text)
         if not n_values:
             messagebox.showerror("Complexity Error", "Please enter at least one positive N value.")
             return
@@ -1528,6 +5079,43 @@ void _IDE_PRINT_RESULT() {
             messagebox.showerror("Complexity Error", "Input template must include {N} placeholder.")
             return
 
+        runs_per_n = self.get_complexity_runs()
+        try:
+            settings = self.get_benchmark_settings()
+            self.get_adaptive_stopper()
+        except ValueError as e:
+            messagebox.showerror("Benchmark Options", str(e))
+            return
+
+        self.btn_run.config(state=tk.DISABLED, text="Running...")
+        try:
+            if not self.compile_code(workspace):
+                return
+
+            try:
+                result = measure_complexity(
+                    workspace.exe_path("left"),
+                    self.get_benchmark_env(),
+                    n_values,
+                    template_text,
+                    runs_per_n,
+                    settings,
+                    self.describe_profile(),
+                    make_stopper=self.get_adaptive_stopper,
+                    on_progress=self.report_sample_progress,
+                )
+            except RunError as e:
+                self.lbl_status.config(text=e.status)
+                messagebox.showerror(e.title, str(e))
+                return
+            self.last_complexity_result = result
+            self.update_complexity_label(result.best_fit)
+            self.show_complexity_result(result)
+            self.lbl_status.config(text="Complexity Done")
+        finally:
+            self.btn_run.config(state=tk.NORMAL, text=RUN_BUTTON_TEXT)
+
+    def get_complexity_runs(self):
         try:
             runs_per_n = int(self.complexity_runs_var.get())
         except Exception:
@@ -1535,70 +5123,224 @@ void _IDE_PRINT_RESULT() {
 
         if runs_per_n < 1:
             runs_per_n = 1
+        return runs_per_n
 
-        self.btn_run.config(state=tk.DISABLED, text="Running...")
+    # --- PROFILE-GUIDED OPTIMIZATION ---
+
+    def run_pgo_thread(self, n_text, template_text):
+        self.scheduler.submit("pgo", self.run_pgo, n_text, template_text)
+
+    def run_pgo(self, workspace, n_text, template_text):
+        if not self.check_compiler():
+            return
+
+        n_values = parse_n_values(n_text)
+        if not n_values:
+            messagebox.showerror("PGO Error", "Please enter at least one positive N value.")
+            return
+
+        if "{N}" not in template_text:
+            messagebox.showerror("PGO Error", "Input template must include {N} placeholder.")
+            return
+
+        runs_per_n = self.get_complexity_runs()
+        raw_code = self.editor_left.get(1.0, tk.END)
+        try:
+            settings = self.get_benchmark_settings()
+            self.get_adaptive_stopper()
+        except ValueError as e:
+            messagebox.showerror("Benchmark Options", str(e))
+            return
+
+        self.btn_run.config(state=tk.DISABLED, text="Running PGO...")
         try:
-            if not self.compile_code():
+            if not self.compile_code(workspace):
                 return
+            plain_exe = workspace.exe_path("left")
 
-            env = os.environ.copy()
-            env["IDE_BENCHMARK"] = "1"
+            try:
+                pgo_exe, reused = self.build_pgo_executable(raw_code, n_values, template_text, settings.get("limits"))
+            except BuildError as e:
+                self.lbl_status.config(text=e.status)
+                messagebox.showerror(e.title, str(e))
+                return
 
-            times = []
-            mems = []
-            steps = []
+            env = self.get_benchmark_env()
+            profile = self.describe_profile()
+
+            rows = []
+            mode_note = ""
             for n in n_values:
-                per_times = []
-                per_mems = []
-                per_steps = []
-                for i in range(runs_per_n):
-                    self.lbl_status.config(text=f"Complexity N={n} ({i + 1}/{runs_per_n})")
-                    input_data = template_text.replace("{N}", str(n))
-                    res = subprocess.run(
-                        [self.get_temp_exe_path("left")],
-                        input=input_data,
-                        capture_output=True,
-                        text=True,
-                        env=env,
+                input_data = template_text.replace("{N}", str(n))
+                results = {}
+                for label, exe in (("plain", plain_exe), ("pgo", pgo_exe)):
+                    samples, mode_note, stop_reason = self.collect_benchmark_samples(
+                        exe,
+                        env,
+                        runs_per_n,
+                        settings,
+                        input_data=input_data,
+                        stopper=self.get_adaptive_stopper(),
+                        label=f"PGO benchmark N={n} {label}",
                     )
-
-                    if res.returncode != 0:
-                        self.lbl_status.config(text="Complexity Failed")
-                        messagebox.showerror("Runtime Error", res.stderr or res.stdout)
-                        return
-
-                    t, mem, _, step_count = self.parse_ide_metrics(res.stdout + res.stderr)
-                    if t is None:
-                        self.lbl_status.config(text="Complexity Failed")
-                        messagebox.showerror(
-                            "Complexity Error",
-                            "Could not parse timing output. Ensure the program runs correctly.",
-                        )
+                    try:
+                        results[label] = benchmark_result_from_samples(samples, profile, mode_note, stop_reason, env.get("IDE_WARMUP"))
+                    except RunError as e:
+                        self.lbl_status.config(text="PGO Failed")
+                        messagebox.showerror(e.title, str(e))
                         return
-
-                    per_times.append(t)
-                    if mem is not None:
-                        per_mems.append(mem)
-                    if step_count is not None:
-                        per_steps.append(step_count)
-
-                times.append(statistics.mean(per_times))
-                if per_mems:
-                    mems.append(statistics.mean(per_mems))
-                else:
-                    mems.append(None)
-                if per_steps:
-                    steps.append(max(per_steps))
-                else:
-                    steps.append(None)
-
-            best_fit = self.estimate_complexity(n_values, times)
-            self.update_complexity_label(best_fit)
-            self.show_complexity_result(n_values, times, mems, steps, best_fit)
-            self.lbl_status.config(text="Complexity Done")
+                rows.append((n, results))
         finally:
             self.btn_run.config(state=tk.NORMAL, text=RUN_BUTTON_TEXT)
 
+        lines = [
+            f"Profile: {profile}",
+            f"Mode: {mode_note}",
+            f"Runs per N: {runs_per_n}",
+            "Training profile: " + ("reused (source unchanged)" if reused else "regenerated"),
+            "",
+            f"{'N':>10}{'Plain median (s)':>18}{'Plain MAD':>14}{'PGO median (s)':>18}{'PGO MAD':>14}{'Speedup':>10}",
+        ]
+        notes = []
+        for n, results in rows:
+            plain, pgo = results["plain"], results["pgo"]
+            if not plain.series("time") or not pgo.series("time"):
+                lines.append(f"{n:>10}  no successful runs")
+            else:
+                plain_stats, pgo_stats = plain.stats("time"), pgo.stats("time")
+                speedup = f"{plain_stats.median / pgo_stats.median:.2f}x" if pgo_stats.median > 0 else "-"
+                lines.append(
+                    f"{n:>10}{plain_stats.median:>18.9f}{plain_stats.mad:>14.9f}"
+                    f"{pgo_stats.median:>18.9f}{pgo_stats.mad:>14.9f}{speedup:>10}"
+                )
+            for label, result in (("plain", plain), ("PGO", pgo)):
+                verdicts = [run["verdict"] for run in result.runs if run["verdict"]]
+                detail = []
+                if result.stop_reason:
+                    detail.append(f"stopped: {result.stop_reason}")
+                if verdicts:
+                    detail.append(f"verdicts: {count_verdicts(verdicts)}")
+                if result.series("cpu"):
+                    detail.append(f"CPU median {result.stats('cpu').median:.9f} s")
+                usage = format_usage([run for run in result.runs if run["user"] is not None])
+                if usage:
+                    detail.append(f"rusage: {usage}")
+                if detail:
+                    notes.append(f"N={n} {label}: " + "; ".join(detail))
+        if notes:
+            lines.append("")
+            lines.extend(notes)
+
+        self.root.after(0, lambda: self.show_text_result("PGO Comparison", "\n".join(lines)))
+        self.lbl_status.config(text="PGO Done")
+
+    def build_pgo_executable(self, raw_code, n_values, template_text, limits=None):
+        compiler = self.get_active_compiler()
+        final_code = self.inject_smart_timer(raw_code)
+        if not final_code:
+            raise BuildError("Parse Failed", "Error", "Could not parse main() function in left editor.")
+
+        clang = is_clang_compiler(compiler)
+        profdata_cmd = None
+        if clang:
+            profdata_cmd = find_llvm_profdata(compiler)
+            if not profdata_cmd:
+                raise BuildError("PGO Unavailable", "PGO Error", "Clang PGO needs llvm-profdata, which was not found.")
+
+        # Fixed paths: gcc names .gcda files after the output binary, so the
+        # instrumented and optimized builds must share them.
+        name = self.sanitize_project_name(self.project_name_var.get())
+        pgo_dir = os.path.join(PROJECTS_DIR, f"{name}.pgo")
+        profile_dir = os.path.join(pgo_dir, "profile")
+        source_path = os.path.join(pgo_dir, "pgo_source" + self.get_source_extension())
+        exe_path = os.path.join(pgo_dir, "pgo_build" + EXE_SUFFIX)
+        merged_path = os.path.join(profile_dir, "merged.profdata")
+        stamp_path = os.path.join(pgo_dir, "source.sha256")
+        os.makedirs(pgo_dir, exist_ok=True)
+
+        h = hashlib.sha256()
+        for part in (final_code, compiler, get_compiler_version(compiler), self.get_build_profile()):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        source_hash = h.hexdigest()
+
+        try:
+            with open(stamp_path, "r", encoding="utf-8") as f:
+                reused = f.read().strip() == source_hash
+        except OSError:
+            reused = False
+        if reused:
+            if clang:
+                reused = os.path.exists(merged_path)
+            else:
+                reused = any(
+                    name.endswith(".gcda") for _, _, names in os.walk(profile_dir) for name in names
+                )
+
+        with open(source_path, "w", encoding="utf-8") as f:
+            f.write(final_code)
+
+        if not reused:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            os.makedirs(profile_dir, exist_ok=True)
+            if clang:
+                gen_flags = ["-fprofile-instr-generate"]
+            else:
+                gen_flags = [f"-fprofile-generate={profile_dir}"]
+            cmd = self.build_compile_command(source_path, exe_path, extra_flags=gen_flags)
+            self.lbl_status.config(text="PGO: building instrumented binary...")
+            returncode, output = run_compiler(cmd)
+            if returncode != 0:
+                raise BuildError("Compilation Failed", "Compilation Error (PGO instrumented)", output)
+
+            env = os.environ.copy()
+            env["IDE_BENCHMARK"] = "1"
+            env["LLVM_PROFILE_FILE"] = os.path.join(profile_dir, "%p.profraw")
+            for n in n_values:
+                self.lbl_status.config(text=f"PGO: training N={n}...")
+                input_data = template_text.replace("{N}", str(n))
+                if limits:
+                    res = run_judged([exe_path], input_data, env, limits, make_benchmark_preexec(limits=limits))
+                    if res.verdict != "OK":
+                        raise BuildError("PGO Failed", "PGO Training Error", f"Training on N={n} failed: {res.verdict}\n{res.output}")
+                    continue
+                res = run_captured([exe_path], input_data, env=env, timeout=PGO_TRAINING_TIMEOUT)
+                if res.timed_out:
+                    raise BuildError(
+                        "PGO Failed",
+                        "PGO Training Error",
+                        f"Training on N={n} did not finish within {PGO_TRAINING_TIMEOUT:g} seconds.",
+                    )
+                if res.returncode != 0:
+                    raise BuildError("PGO Failed", "PGO Training Error", res.output)
+
+            if clang:
+                raw_profiles = [
+                    os.path.join(profile_dir, p) for p in os.listdir(profile_dir) if p.endswith(".profraw")
+                ]
+                res = subprocess.run(
+                    profdata_cmd + ["merge", "-o", merged_path] + raw_profiles,
+                    capture_output=True,
+                    text=True,
+                    **hidden_window_kwargs(),
+                )
+                if res.returncode != 0:
+                    raise BuildError("PGO Failed", "PGO Error", res.stderr or res.stdout)
+
+            with open(stamp_path, "w", encoding="utf-8") as f:
+                f.write(source_hash)
+
+        if clang:
+            use_flags = [f"-fprofile-instr-use={merged_path}"]
+        else:
+            use_flags = [f"-fprofile-use={profile_dir}", "-fprofile-correction", "-Wno-missing-profile"]
+        cmd = self.build_compile_command(source_path, exe_path, extra_flags=use_flags)
+        self.lbl_status.config(text="PGO: building optimized binary...")
+        returncode, output = run_compiler(cmd)
+        if returncode != 0:
+            raise BuildError("Compilation Failed", "Compilation Error (PGO optimized)", output)
+        return exe_path, reused
+
     def open_complexity_window(self):
         if self._complexity_window and self._complexity_window.winfo_exists():
             self._complexity_window.lift()
@@ -1629,43 +5371,26 @@ void _IDE_PRINT_RESULT() {
         template_text.insert(tk.END, "{N}\n")
         template_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
 
+        btn_frame = tk.Frame(win)
+        btn_frame.pack(pady=10)
+
         btn_run = tk.Button(
-            win,
+            btn_frame,
             text="Run Complexity",
             command=lambda: self.run_complexity_thread(entry_n.get(), template_text.get("1.0", tk.END)),
             font=("Segoe UI", 10, "bold"),
             width=16,
         )
-        btn_run.pack(pady=10)
-
-    def estimate_complexity(self, n_values, times):
-        if not n_values or not times or len(n_values) != len(times):
-            return None
-
-        models = {
-            "O(1)": [1.0 for _ in n_values],
-            "O(n)": [float(n) for n in n_values],
-            "O(n log n)": [float(n) * math.log2(n) if n > 1 else 0.0 for n in n_values],
-            "O(n^2)": [float(n * n) for n in n_values],
-        }
-
-        best_fit = None
-        best_sse = None
-
-        for name, values in models.items():
-            denom = sum(v * v for v in values)
-            if denom <= 0:
-                sse = float("inf")
-            else:
-                scale = sum(t * v for t, v in zip(times, values)) / denom
-                preds = [scale * v for v in values]
-                sse = sum((t - p) ** 2 for t, p in zip(times, preds))
-
-            if best_sse is None or sse < best_sse:
-                best_sse = sse
-                best_fit = name
+        btn_run.pack(side=tk.LEFT, padx=6)
 
-        return best_fit
+        btn_pgo = tk.Button(
+            btn_frame,
+            text="PGO Compare",
+            command=lambda: self.run_pgo_thread(entry_n.get(), template_text.get("1.0", tk.END)),
+            font=("Segoe UI", 10, "bold"),
+            width=16,
+        )
+        btn_pgo.pack(side=tk.LEFT, padx=6)
 
     def update_complexity_label(self, best_fit):
         if best_fit:
@@ -1687,6 +5412,8 @@ void _IDE_PRINT_RESULT() {
         height = int(canvas["height"])
         margin = 60
 
+        if not n_values:
+            return
         x_min, x_max = min(n_values), max(n_values)
         y_max = max(times) if times else 1.0
         if y_max <= 0:
@@ -1767,7 +5494,7 @@ void _IDE_PRINT_RESULT() {
             canvas.create_text(x_cursor + 18, legend_y + 6, text=label, fill=axis_color, anchor="w")
             x_cursor += 120
 
-    def show_complexity_result(self, n_values, times, mems, steps, best_fit):
+    def show_complexity_result(self, result):
         win = tk.Toplevel(self.root)
         win.title("Complexity Result")
         win.geometry("1000x600")
@@ -1785,27 +5512,16 @@ void _IDE_PRINT_RESULT() {
 
         canvas = tk.Canvas(left, width=700, height=520, bg=theme["editor_bg"], highlightthickness=0)
         canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.draw_complexity_plot(canvas, n_values, times)
+        self.draw_complexity_plot(canvas, result.n_values, result.times)
 
-        title = tk.Label(right, text=f"Estimated complexity: {best_fit or 'Unknown'}", font=("Segoe UI", 12, "bold"),
+        title = tk.Label(right, text=f"Estimated complexity: {result.best_fit or 'Unknown'}", font=("Segoe UI", 12, "bold"),
                          bg=theme["root_bg"], fg=theme["toolbar_fg"])
         title.pack(anchor="w", padx=10, pady=(10, 6))
 
         info = scrolledtext.ScrolledText(right, font=("Consolas", 10), height=20)
         info.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
 
-        lines = []
-        for i, n in enumerate(n_values):
-            row = f"N={n}: {times[i]:.9f}s"
-            if mems[i] is not None:
-                row += f", mem delta {mems[i] / (1024.0 * 1024.0):.2f} MB"
-            if steps and steps[i] is not None:
-                row += f", worst steps {steps[i]}"
-            lines.append(row)
-        header = "Timing by N:"
-        if steps and any(s is not None for s in steps):
-            header += "\n(steps shown are worst observed per N)"
-        info.insert(tk.END, header + "\n" + "\n".join(lines))
+        info.insert(tk.END, result.to_text())
         info.configure(state=tk.DISABLED)
 
     def kill_process(self):
@@ -1847,6 +5563,94 @@ void _IDE_PRINT_RESULT() {
             editor.edit_modified(False)
             self.schedule_autosave()
             self.schedule_highlight(editor)
+            self.schedule_prebuild(editor)
+
+    # --- BACKGROUND BUILDS ---
+
+    def on_prebuild_toggle(self):
+        if self.prebuild_var.get():
+            self.schedule_prebuild(self.editor_left)
+        else:
+            for side in ("left", "right"):
+                self.cancel_prebuild(side)
+
+    def schedule_prebuild(self, editor):
+        side = "right" if editor is self.editor_right else "left"
+        job = self._prebuild_jobs.get(side)
+        if job:
+            self.root.after_cancel(job)
+            self._prebuild_jobs[side] = None
+        self.cancel_prebuild(side)
+        if self.prebuild_var.get():
+            self._prebuild_jobs[side] = self.root.after(PREBUILD_DELAY_MS, lambda s=side: self.start_prebuild(s))
+
+    def cancel_prebuild(self, side):
+        with self._prebuild_lock:
+            build = self._prebuilds.pop(side, None)
+        if not build:
+            return
+        build["cancelled"] = True
+        proc = build["proc"]
+        if proc and proc.poll() is None:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+    def start_prebuild(self, side):
+        self._prebuild_jobs[side] = None
+        if side == "right" and not self.split_var.get():
+            return
+        if not self.get_active_compiler():
+            return
+
+        editor = self.editor_right if side == "right" else self.editor_left
+        build = {
+            "code": editor.get(1.0, tk.END),
+            "profile": self.get_build_profile(),
+            "proc": None,
+            "cancelled": False,
+            "started": False,
+            "done": threading.Event(),
+        }
+        with self._prebuild_lock:
+            self._prebuilds[side] = build
+        self.scheduler.submit(f"prebuild-{side}", self.prebuild_worker, side, build)
+
+    def prebuild_worker(self, workspace, side, build):
+        def on_start(proc):
+            build["proc"] = proc
+            if build["cancelled"]:
+                proc.kill()
+
+        with self._prebuild_lock:
+            build["started"] = not build["cancelled"]
+        try:
+            if build["started"]:
+                # Binaries land in the compile cache, so Run picks them up as a cache hit.
+                self.build_executable(build["code"], side, workspace, profile=build["profile"], on_start=on_start, quiet=True)
+        except BuildError:
+            pass
+        except Exception as e:
+            status = f"Background build failed ({side}): {e}"
+            self.root.after(0, lambda: self.lbl_status.config(text=status))
+        finally:
+            build["done"].set()
+            with self._prebuild_lock:
+                if self._prebuilds.get(side) is build:
+                    del self._prebuilds[side]
+
+    def wait_for_prebuild(self, raw_code, side, profile=None):
+        with self._prebuild_lock:
+            build = self._prebuilds.get(side)
+            # A prebuild still queued behind this job would never get a worker; drop it.
+            if build and not build["started"]:
+                self._prebuilds.pop(side)
+                build["cancelled"] = True
+                build = None
+        if build and build["code"] == raw_code and build["profile"] == (profile or self.get_build_profile()):
+            self.lbl_status.config(text=f"Waiting for background build ({side})...")
+            build["done"].wait()
 
     def schedule_autosave(self):
         if self._autosave_job:
@@ -1870,11 +5674,84 @@ void _IDE_PRINT_RESULT() {
             self.lbl_status.config(text=f"Auto-saved: {name}{ext}")
 
     def on_project_name_change(self, *args):
+        self.load_project_settings()
         self.schedule_autosave()
 
+    def load_project_settings(self):
+        name = self.sanitize_project_name(self.project_name_var.get())
+        settings = load_project_settings(name)
+        profile = settings.get("profile")
+        if profile in BUILD_PROFILES and profile != self.profile_var.get():
+            self.profile_var.set(profile)
+        bench = settings.get("benchmark", {})
+        if bench.get("mode") in BENCHMARK_MODES:
+            self.bench_mode_var.set(bench["mode"])
+        self.bench_nice_var.set(str(bench.get("nice", "")))
+        self.bench_no_aslr_var.set(bool(bench.get("no_aslr", False)))
+        self.bench_repeat_var.set(bool(bench.get("repeat", False)))
+        self.bench_warmup_var.set(str(bench.get("warmup", REPEAT_DEFAULT_WARMUP)))
+        self.bench_min_time_var.set(str(bench.get("min_time", REPEAT_DEFAULT_MIN_TIME)))
+        self.bench_adaptive_var.set(bool(bench.get("adaptive", False)))
+        self.bench_ci_var.set(str(bench.get("ci", ADAPTIVE_DEFAULT_CI)))
+        self.bench_min_runs_var.set(str(bench.get("min_runs", ADAPTIVE_DEFAULT_MIN_RUNS)))
+        self.bench_max_runs_var.set(str(bench.get("max_runs", ADAPTIVE_DEFAULT_MAX_RUNS)))
+        self.bench_budget_var.set(str(bench.get("budget", ADAPTIVE_DEFAULT_BUDGET)))
+        self.bench_save_output_var.set(bool(bench.get("save_output", False)))
+        self.bench_perf_var.set(bool(bench.get("perf", False)))
+        self.bench_judge_var.set(bool(bench.get("judge", False)))
+        self.bench_flush_var.set(bool(bench.get("flush", False)))
+        self.bench_subtract_overhead_var.set(bool(bench.get("subtract_overhead", False)))
+        self.bench_preload_var.set(bool(bench.get("preload", False)))
+        self.bench_time_limit_var.set(str(bench.get("time_limit", JUDGE_DEFAULT_TIME_LIMIT)))
+        self.bench_memory_limit_var.set(str(bench.get("memory_limit", JUDGE_DEFAULT_MEMORY_MB)))
+
+    def save_project_settings(self):
+        name = self.sanitize_project_name(self.project_name_var.get())
+        settings = load_project_settings(name)
+        settings["profile"] = self.get_build_profile()
+        settings["benchmark"] = {
+            "mode": self.bench_mode_var.get(),
+            "nice": self.bench_nice_var.get().strip(),
+            "no_aslr": self.bench_no_aslr_var.get(),
+            "repeat": self.bench_repeat_var.get(),
+            "warmup": self.bench_warmup_var.get().strip(),
+            "min_time": self.bench_min_time_var.get().strip(),
+            "adaptive": self.bench_adaptive_var.get(),
+            "ci": self.bench_ci_var.get().strip(),
+            "min_runs": self.bench_min_runs_var.get().strip(),
+            "max_runs": self.bench_max_runs_var.get().strip(),
+            "budget": self.bench_budget_var.get().strip(),
+            "save_output": self.bench_save_output_var.get(),
+            "perf": self.bench_perf_var.get(),
+            "judge": self.bench_judge_var.get(),
+            "flush": self.bench_flush_var.get(),
+            "subtract_overhead": self.bench_subtract_overhead_var.get(),
+            "preload": self.bench_preload_var.get(),
+            "time_limit": self.bench_time_limit_var.get().strip(),
+            "memory_limit": self.bench_memory_limit_var.get().strip(),
+        }
+        try:
+            save_project_settings(name, settings)
+        except OSError:
+            pass
+
+    def on_profile_change(self, *args):
+        self.save_project_settings()
+        self.schedule_prebuild(self.editor_left)
+        self.lbl_status.config(text=f"Build profile: {self.describe_profile()}")
+
+    def get_build_profile(self):
+        profile = self.profile_var.get()
+        return profile if profile in BUILD_PROFILES else DEFAULT_BUILD_PROFILE
+
+    def describe_profile(self, profile=None):
+        profile = profile or self.get_build_profile()
+        return f"{profile} ({' '.join(BUILD_PROFILES[profile])})"
+
     def on_language_change(self, *args):
         self.schedule_autosave()
         self.check_compiler()
+        self.schedule_prebuild(self.editor_left)
 
     def toggle_split(self):
         panes = self.editor_pane.panes()
@@ -1973,13 +5850,9 @@ void _IDE_PRINT_RESULT() {
         btn.pack(pady=(0, 10))
 
     def run_race_thread(self, input_data, runs):
-        threading.Thread(
-            target=self.run_race,
-            args=(input_data, runs),
-            daemon=True,
-        ).start()
+        self.scheduler.submit("race", self.run_race, input_data, runs)
 
-    def run_race(self, input_data, runs):
+    def run_race(self, workspace, input_data, runs):
         if not self.check_compiler():
             return
 
@@ -2001,84 +5874,61 @@ void _IDE_PRINT_RESULT() {
         self.lbl_status.config(text="Racing...")
 
         try:
-            if not self.compile_code_from_text(left_code, "left"):
-                return
-            if not self.compile_code_from_text(right_code, "right"):
+            if not self.compile_race_sides(left_code, right_code, workspace):
                 return
 
-            env = os.environ.copy()
-            env["IDE_BENCHMARK"] = "1"
-
-            left_times = []
-            right_times = []
-
-            for i in range(runs):
-                res_left = subprocess.run(
-                    [self.get_temp_exe_path("left")],
-                    input=input_data,
-                    capture_output=True,
-                    text=True,
-                    env=env,
-                )
-                if res_left.returncode != 0:
-                    messagebox.showerror("Race Error (Left)", res_left.stderr or res_left.stdout)
-                    return
-
-                t_left, _, _, _ = self.parse_ide_metrics(res_left.stdout + res_left.stderr)
-                if t_left is None:
-                    messagebox.showerror("Race Error", "Could not parse timing output for left.")
-                    return
-
-                res_right = subprocess.run(
-                    [self.get_temp_exe_path("right")],
-                    input=input_data,
-                    capture_output=True,
-                    text=True,
-                    env=env,
+            try:
+                result = measure_race(
+                    workspace.exe_path("left"),
+                    workspace.exe_path("right"),
+                    input_data,
+                    runs,
+                    self.get_benchmark_env(),
+                    self.describe_profile(),
+                    self.get_judge_limits(),
                 )
-                if res_right.returncode != 0:
-                    messagebox.showerror("Race Error (Right)", res_right.stderr or res_right.stdout)
-                    return
-
-                t_right, _, _, _ = self.parse_ide_metrics(res_right.stdout + res_right.stderr)
-                if t_right is None:
-                    messagebox.showerror("Race Error", "Could not parse timing output for right.")
-                    return
-
-                left_times.append(t_left)
-                right_times.append(t_right)
-
-            mean_left = statistics.mean(left_times)
-            mean_right = statistics.mean(right_times)
-
-            winner = "Tie"
-            ratio = None
-            if mean_left > 0 and mean_right > 0:
-                if mean_left < mean_right:
-                    winner = "Left"
-                    ratio = mean_right / mean_left
-                elif mean_right < mean_left:
-                    winner = "Right"
-                    ratio = mean_left / mean_right
-
-            msg = (
-                f"Left mean:  {mean_left:.9f} s\\n"
-                f"Right mean: {mean_right:.9f} s\\n"
-                f"Runs per side: {runs}\\n"
-            )
-
-            if winner == "Tie":
-                msg += "Result: Tie (too close to call)."
-            elif ratio is None:
-                msg += f"Winner: {winner} (too fast to compute ratio)."
-            else:
-                msg += f"Winner: {winner} side is {ratio:.2f}x faster."
+            except RunError as e:
+                messagebox.showerror(e.title, str(e))
+                return
+            except ValueError as e:
+                messagebox.showerror("Benchmark Options", str(e))
+                return
 
-            messagebox.showinfo("Race Result", msg)
+            messagebox.showinfo("Race Result", result.to_text())
         finally:
             self.btn_race.config(state=tk.NORMAL)
             self.lbl_status.config(text="Ready")
 
+    def compile_race_sides(self, left_code, right_code, workspace):
+        try:
+            self.autosave()
+        except Exception:
+            pass
+
+        def stream(side):
+            return lambda line: self.lbl_status.config(text=f"[{side}] {line[:80]}") if line.strip() else None
+
+        self.lbl_status.config(text="Compiling left + right...")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [
+                (side, pool.submit(self.build_executable, code, side, workspace, on_line=stream(side)))
+                for side, code in (("left", left_code), ("right", right_code))
+            ]
+            errors = []
+            for side, future in futures:
+                try:
+                    future.result()
+                except BuildError as e:
+                    errors.append(e)
+
+        if errors:
+            self.lbl_status.config(text=errors[0].status)
+            for e in errors:
+                messagebox.showerror(e.title, str(e))
+            return False
+        self.lbl_status.config(text="Racing...")
+        return True
+
     def sanitize_project_name(self, name):
         cleaned = re.sub(r"[^A-Za-z0-9 _-]", "", name or "")
         cleaned = cleaned.strip().replace(" ", "_")
@@ -2149,7 +5999,7 @@ void _IDE_PRINT_RESULT() {
         self.work_area.configure(bg=theme["root_bg"])
         self.snippet_frame.configure(bg=theme["toolbar_bg"])
 
-        for widget in [self.lbl_status, self.lbl_runs, self.lbl_project, self.lbl_theme, self.lbl_language, self.lbl_complexity]:
+        for widget in [self.lbl_status, self.lbl_runs, self.lbl_project, self.lbl_theme, self.lbl_language, self.lbl_profile, self.lbl_workers, self.lbl_complexity]:
             widget.configure(bg=theme["toolbar_bg"], fg=theme["toolbar_fg"])
 
         self.chk_bench.configure(
@@ -2164,6 +6014,18 @@ void _IDE_PRINT_RESULT() {
             activebackground=theme["toolbar_bg"],
             activeforeground=theme["toolbar_fg"],
         )
+        self.chk_prebuild.configure(
+            bg=theme["toolbar_bg"],
+            fg=theme["toolbar_fg"],
+            activebackground=theme["toolbar_bg"],
+            activeforeground=theme["toolbar_fg"],
+        )
+        self.chk_time_report.configure(
+            bg=theme["toolbar_bg"],
+            fg=theme["toolbar_fg"],
+            activebackground=theme["toolbar_bg"],
+            activeforeground=theme["toolbar_fg"],
+        )
 
         self.info_label.configure(bg=theme["info_bg"], fg=theme["info_fg"])
 
@@ -2191,6 +6053,30 @@ void _IDE_PRINT_RESULT() {
             activebackground=theme["toolbar_bg"],
             activeforeground=theme["toolbar_fg"],
         )
+        self.btn_testcases.configure(
+            bg=theme["toolbar_bg"],
+            fg=theme["toolbar_fg"],
+            activebackground=theme["toolbar_bg"],
+            activeforeground=theme["toolbar_fg"],
+        )
+        self.btn_compare_profiles.configure(
+            bg=theme["toolbar_bg"],
+            fg=theme["toolbar_fg"],
+            activebackground=theme["toolbar_bg"],
+            activeforeground=theme["toolbar_fg"],
+        )
+        self.btn_compile_stats.configure(
+            bg=theme["toolbar_bg"],
+            fg=theme["toolbar_fg"],
+            activebackground=theme["toolbar_bg"],
+            activeforeground=theme["toolbar_fg"],
+        )
+        self.btn_bench_options.configure(
+            bg=theme["toolbar_bg"],
+            fg=theme["toolbar_fg"],
+            activebackground=theme["toolbar_bg"],
+            activeforeground=theme["toolbar_fg"],
+        )
 
         if hasattr(self, "snippet_list"):
             self.snippet_list.configure(
@@ -2210,7 +6096,7 @@ void _IDE_PRINT_RESULT() {
                         activeforeground=theme["toolbar_fg"],
                     )
 
-        for entry in [self.entry_runs, self.entry_project]:
+        for entry in [self.entry_runs, self.entry_project, self.entry_workers]:
             entry.configure(
                 bg=theme["editor_bg"],
                 fg=theme["editor_fg"],
@@ -2233,6 +6119,14 @@ void _IDE_PRINT_RESULT() {
         )
         self.language_menu["menu"].configure(bg=theme["toolbar_bg"], fg=theme["toolbar_fg"])
 
+        self.profile_menu.configure(
+            bg=theme["toolbar_bg"],
+            fg=theme["toolbar_fg"],
+            activebackground=theme["toolbar_bg"],
+            activeforeground=theme["toolbar_fg"],
+        )
+        self.profile_menu["menu"].configure(bg=theme["toolbar_bg"], fg=theme["toolbar_fg"])
+
         for editor in [self.editor_left, self.editor_right]:
             editor.configure(
                 bg=theme["editor_bg"],
@@ -2244,49 +6138,22 @@ void _IDE_PRINT_RESULT() {
 
     # --- COMPILER SETUP ---
 
-    def detect_compilers(self):
-        self.compiler_cmd_cpp = shutil.which("g++") or shutil.which("clang++")
-        self.compiler_cmd_c = shutil.which("gcc") or shutil.which("clang")
-        self.c_compiler_is_cpp_driver = False
-        if not self.compiler_cmd_c and self.compiler_cmd_cpp:
-            self.compiler_cmd_c = self.compiler_cmd_cpp
-            self.c_compiler_is_cpp_driver = True
-
-    def try_use_bundled_compiler(self):
-        if os.name == "nt":
-            bin_names = ["g++.exe", "gcc.exe", "clang++.exe", "clang.exe"]
-        else:
-            bin_names = ["g++", "gcc", "clang++", "clang"]
-
-        for bin_dir in iter_bundled_compiler_bin_candidates():
-            if not os.path.isdir(bin_dir):
-                continue
-            if not any(os.path.exists(os.path.join(bin_dir, name)) for name in bin_names):
-                continue
-            path_parts = os.environ.get("PATH", "").split(os.pathsep)
-            if bin_dir not in path_parts:
-                os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
-            self.detect_compilers()
-            if self.get_active_compiler():
-                return True
-        return False
-
     def check_compiler(self):
-        self.detect_compilers()
+        found = resolve_compilers(self.language_var.get())
+        self.compiler_cmd_cpp = found["cpp"]
+        self.compiler_cmd_c = found["c"]
+        self.c_compiler_is_cpp_driver = found["c_is_cpp_driver"]
 
         if not self.get_active_compiler():
-            if self.try_use_bundled_compiler():
-                pass
-            else:
-                bundled = find_bundled_compiler_zip()
-                if bundled:
-                    self.lbl_status.config(text="Extracting Bundled Compiler...")
-                    threading.Thread(target=self.extract_bundled_compiler, args=(bundled,), daemon=True).start()
-                    return False
-                if os.name == "nt":
-                    self.lbl_status.config(text="Downloading Compiler...")
-                    threading.Thread(target=self.download_compiler, daemon=True).start()
-                    return False
+            bundled = find_bundled_compiler_zip()
+            if bundled and not is_extraction_complete(bundled):
+                self.lbl_status.config(text="Extracting Bundled Compiler...")
+                threading.Thread(target=self.extract_bundled_compiler, args=(bundled,), daemon=True).start()
+                return False
+            if os.name == "nt":
+                self.lbl_status.config(text="Downloading Compiler...")
+                threading.Thread(target=self.download_compiler, daemon=True).start()
+                return False
 
         active = self.get_active_compiler()
         if active:
@@ -2312,10 +6179,12 @@ void _IDE_PRINT_RESULT() {
             os.makedirs(LOCAL_COMPILER_DIR, exist_ok=True)
             if bundled:
                 shutil.copyfile(bundled, zip_p)
-            else:
-                urllib.request.urlretrieve(url, zip_p)
-            with zipfile.ZipFile(zip_p, "r") as z:
-                z.extractall(LOCAL_COMPILER_DIR)
+            elif not os.path.exists(zip_p):
+                # Keep the archive until extraction completes so a restart can resume.
+                import urllib.request
+                urllib.request.urlretrieve(url, zip_p + ".part")
+                os.replace(zip_p + ".part", zip_p)
+            extract_toolchain_zip(zip_p, LOCAL_COMPILER_DIR, on_progress=self.report_extract_progress)
             os.remove(zip_p)
             self.check_compiler()
         except Exception:
@@ -2323,14 +6192,235 @@ void _IDE_PRINT_RESULT() {
 
     def extract_bundled_compiler(self, zip_path):
         try:
-            os.makedirs(LOCAL_COMPILER_DIR, exist_ok=True)
-            with zipfile.ZipFile(zip_path, "r") as z:
-                z.extractall(LOCAL_COMPILER_DIR)
+            extract_toolchain_zip(zip_path, LOCAL_COMPILER_DIR, on_progress=self.report_extract_progress)
             self.check_compiler()
         except Exception:
             self.lbl_status.config(text="Bundled Compiler Extract Failed")
 
-if __name__ == "__main__":
+    def report_extract_progress(self, done, total, elapsed):
+        if not total:
+            return
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else 0.0
+        self.lbl_status.config(
+            text=f"Extracting compiler: {100.0 * done / total:.0f}% ({rate / (1024 * 1024):.1f} MB/s, ETA {eta:.0f}s)"
+        )
+
+# --- COMMAND LINE ---
+
+CLI_COMMANDS = ("bench", "complexity", "race")
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(
+        prog="IDE.py",
+        description="Run AlgoTimer benchmarks without the GUI. Start with no arguments for the IDE.",
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--lang", choices=["C", "C++"], help="source language (default: from the file extension)")
+    common.add_argument("--profile", choices=list(BUILD_PROFILES), default=DEFAULT_BUILD_PROFILE)
+    common.add_argument("--format", choices=["text", "json", "csv"], default="text")
+    common.add_argument("-o", "--output", help="write results to this file instead of stdout")
+    common.add_argument("--repeat", action="store_true", help="repeat main() in-process and report per-iteration times")
+    common.add_argument("--warmup", type=int, default=REPEAT_DEFAULT_WARMUP)
+    common.add_argument("--min-time", type=float, default=REPEAT_DEFAULT_MIN_TIME, help="seconds per timed batch with --repeat")
+    common.add_argument("--no-cache", action="store_true", help="always recompile")
+    common.add_argument("--perf", action="store_true", help="collect perf_event_open counters (Linux)")
+    common.add_argument("--flush", action="store_true", help="flush stdout before every input read, as interactive runs do")
+    common.add_argument("--subtract-overhead", action="store_true", help="subtract the calibrated timer overhead of input pauses")
+    common.add_argument("--preload-input", action="store_true", help="read all input into memory before timing; reads no longer pause the timer")
+    common.add_argument("--judge", action="store_true", help="enforce time/memory limits and report OK/TLE/MLE/RE per run")
+    common.add_argument("--time-limit", type=float, default=JUDGE_DEFAULT_TIME_LIMIT, help="judge CPU/algorithm time limit in seconds")
+    common.add_argument("--memory-limit", type=float, default=JUDGE_DEFAULT_MEMORY_MB, help="judge address-space limit in MB (0 = none)")
+
+    sampling = argparse.ArgumentParser(add_help=False)
+    sampling.add_argument("--mode", choices=BENCHMARK_MODES, default=DEFAULT_BENCHMARK_MODE)
+    sampling.add_argument("--nice", type=int, help="nice level for benchmark runs")
+    sampling.add_argument("--no-aslr", action="store_true", help="disable address space randomization (Linux)")
+    sampling.add_argument("--ci", type=float, help="stop adaptively once the 95%% CI is within this many percent")
+    sampling.add_argument("--min-runs", type=int, default=ADAPTIVE_DEFAULT_MIN_RUNS)
+    sampling.add_argument("--max-runs", type=int, default=ADAPTIVE_DEFAULT_MAX_RUNS)
+    sampling.add_argument("--budget", type=float, default=ADAPTIVE_DEFAULT_BUDGET, help="adaptive time budget in seconds")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    bench = commands.add_parser("bench", parents=[common, sampling], help="benchmark one program")
+    bench.add_argument("source")
+    bench.add_argument("--runs", type=int, default=BENCHMARK_DEFAULT_RUNS)
+    bench.add_argument("--input", help="file fed to stdin on every run")
+    bench.add_argument("--save-output", help="save the full output of run 1 to this file")
+
+    complexity = commands.add_parser("complexity", parents=[common, sampling], help="fit time against input size N")
+    complexity.add_argument("source")
+    complexity.add_argument("--n", required=True, help="sizes, e.g. 1e3,1e4,1e5")
+    complexity.add_argument("--template", help="stdin template file containing {N} (default: just N)")
+    complexity.add_argument("--runs", type=int, default=COMPLEXITY_DEFAULT_RUNS, help="runs per N")
+
+    race = commands.add_parser("race", parents=[common], help="race two programs on the same input")
+    race.add_argument("left")
+    race.add_argument("right")
+    race.add_argument("--runs", type=int, default=RACE_DEFAULT_RUNS)
+    race.add_argument("--input", help="file fed to stdin on every run")
+    return parser
+
+def read_text_file(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def cli_compile(args, workspace, sources):
+    """Build each (side, path) in `sources`; returns the profile description."""
+    lang = args.lang or ("C" if sources[0][1].lower().endswith(".c") else "C++")
+    compilers = resolve_compilers(lang)
+    compiler = active_compiler(compilers, lang)
+    if not compiler:
+        raise BuildError("No Compiler", "Compiler Error", "No compiler found (install gcc/clang or bundle into compiler/bin).")
+    cache = CompileCache(COMPILE_CACHE_DIR)
+    for side, path in sources:
+        compile_program(
+            read_text_file(path),
+            lang,
+            side,
+            workspace,
+            compiler,
+            args.profile,
+            c_is_cpp_driver=compilers["c_is_cpp_driver"],
+            cache=cache,
+            use_cache=not args.no_cache,
+            # A headless run exits right after; a background PCH build would be orphaned.
+            pch_wait=True,
+        )
+    return f"{args.profile} ({' '.join(BUILD_PROFILES[args.profile])})"
+
+def cli_env(args):
+    return make_benchmark_env(args.repeat, args.warmup, args.min_time, args.perf, args.flush, args.subtract_overhead, args.preload_input)
+
+def cli_limits(args):
+    return make_judge_limits(args.time_limit, args.memory_limit) if args.judge else None
+
+def cli_settings(args):
+    settings = make_benchmark_settings(args.mode, args.nice, args.no_aslr, cli_limits(args))
+    if args.ci is None:
+        return settings, None
+    return settings, lambda: make_adaptive_stopper(args.ci, args.min_runs, args.max_runs, args.budget)
+
+def cli_bench(args, workspace):
+    input_data = read_text_file(args.input) if args.input else ""
+    settings, make_stopper = cli_settings(args)
+    profile = cli_compile(args, workspace, [("left", args.source)])
+    env = cli_env(args)
+    samples, mode_note, stop_reason = collect_benchmark_samples(
+        workspace.exe_path("left"),
+        env,
+        max(1, args.runs),
+        settings,
+        input_data=input_data,
+        stopper=make_stopper() if make_stopper else None,
+        spill_path=args.save_output,
+    )
+    result = benchmark_result_from_samples(samples, profile, mode_note, stop_reason, env.get("IDE_WARMUP"))
+    result.output_path = args.save_output
+    return result
+
+def cli_complexity(args, workspace):
+    n_values = parse_n_values(args.n)
+    if not n_values:
+        raise ValueError("Please enter at least one positive N value.")
+    template_text = read_text_file(args.template) if args.template else "{N}\n"
+    if "{N}" not in template_text:
+        raise ValueError("Input template must include {N} placeholder.")
+    settings, make_stopper = cli_settings(args)
+    profile = cli_compile(args, workspace, [("left", args.source)])
+    return measure_complexity(
+        workspace.exe_path("left"),
+        cli_env(args),
+        n_values,
+        template_text,
+        max(1, args.runs),
+        settings,
+        profile,
+        make_stopper=make_stopper,
+    )
+
+def cli_race(args, workspace):
+    input_data = read_text_file(args.input) if args.input else ""
+    profile = cli_compile(args, workspace, [("left", args.left), ("right", args.right)])
+    return measure_race(
+        workspace.exe_path("left"),
+        workspace.exe_path("right"),
+        input_data,
+        max(1, args.runs),
+        cli_env(args),
+        profile,
+        cli_limits(args),
+    )
+
+def format_cli_csv(command, result):
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    if command == "bench":
+        keys = ["run", "core", "verdict", "time", "cpu", "mem", "steps", "transitions", "overhead"] + RUSAGE_FIELDS + PERF_FIELDS + ["iters", "output_bytes", "output_sha256"]
+        writer.writerow(keys)
+        for run in result.runs:
+            writer.writerow([run.get(key) for key in keys])
+    elif command == "complexity":
+        writer.writerow(["n", "runs", "median", "mean", "mad", "ci_low", "ci_high", "stop_reason", "verdicts"])
+        for point in result.points:
+            st = point.time_stats
+            verdicts = count_verdicts(point.verdicts)
+            writer.writerow([point.n, st.count, st.median, st.mean, st.mad, st.ci_low, st.ci_high, point.note, verdicts])
+    else:
+        writer.writerow(["run", "left", "right"])
+        for i, (left, right) in enumerate(zip(result.left.samples, result.right.samples), 1):
+            writer.writerow([i, left, right])
+    return out.getvalue()
+
+def format_cli_result(args, result):
+    if args.format == "json":
+        data = {"command": args.command}
+        data.update(result.to_dict())
+        return json.dumps(data, indent=2) + "\n"
+    if args.format == "csv":
+        return format_cli_csv(args.command, result)
+    text = result.to_text()
+    if args.command == "complexity":
+        text = f"Estimated complexity: {result.best_fit or 'Unknown'}\n" + text
+    return text + "\n"
+
+def run_cli(argv):
+    args = build_cli_parser().parse_args(argv)
+    handler = {"bench": cli_bench, "complexity": cli_complexity, "race": cli_race}[args.command]
+    scheduler = JobScheduler(JOBS_DIR, workers=1)
+    workspace = scheduler.create_workspace(args.command)
+    try:
+        result = handler(args, workspace)
+    except (BuildError, RunError) as e:
+        print(f"{e.title}:\n{e}", file=sys.stderr)
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        workspace.cleanup()
+        try:
+            os.rmdir(scheduler.root)
+        except OSError:
+            pass
+
+    output = format_cli_result(args, result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+    return 0
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in CLI_COMMANDS + ("-h", "--help"):
+        return run_cli(argv)
+    load_tk()
     root = tk.Tk()
-    app = AlgoTimerIDE(root)
+    AlgoTimerIDE(root)
     root.mainloop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
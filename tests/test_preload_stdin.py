@@ -0,0 +1,68 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+IDE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "IDE.py")
+
+# Exits 3 if any iteration parses the input wrongly, which the benchmark
+# reports as a runtime error.
+UNSYNCED_CIN = r"""
+#include <bits/stdc++.h>
+using namespace std;
+int main() {
+    ios::sync_with_stdio(false);
+    cin.tie(nullptr);
+    int n;
+    cin >> n;
+    long long sum = 0;
+    for (int i = 0; i < n; i++) {
+        int x;
+        cin >> x;
+        sum += x;
+    }
+    string word;
+    cin >> word;
+    cout << sum << " " << word << "\n";
+    return (sum == 45 && word == "end") ? 0 : 3;
+}
+"""
+
+
+@unittest.skipUnless(shutil.which("g++"), "g++ not available")
+class PreloadStdinTest(unittest.TestCase):
+    def setUp(self):
+        # The CLI keeps its caches next to IDE.py, so run a private copy.
+        self.work = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work, ignore_errors=True)
+        self.ide = shutil.copy(IDE_PATH, self.work)
+        self.source = os.path.join(self.work, "chk.cpp")
+        self.input = os.path.join(self.work, "chk.in")
+        self.output = os.path.join(self.work, "out.txt")
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write(UNSYNCED_CIN)
+        with open(self.input, "w", encoding="utf-8") as f:
+            f.write("10\n0 1 2 3 4 5 6 7 8 9\nend\n")
+
+    def bench(self, *flags):
+        cmd = [sys.executable, self.ide, "bench", self.source, "--input", self.input,
+               "--runs", "2", "--save-output", self.output] + list(flags)
+        res = subprocess.run(cmd, capture_output=True, text=True, cwd=self.work)
+        self.assertEqual(res.returncode, 0, res.stdout + res.stderr)
+        with open(self.output, encoding="utf-8") as f:
+            self.assertTrue(f.read().startswith("45 end\n"))
+
+    def test_unsynced_cin_preloaded(self):
+        self.bench("--preload-input")
+
+    def test_unsynced_cin_preloaded_with_repeat(self):
+        self.bench("--preload-input", "--repeat", "--min-time", "0.01")
+
+    def test_unsynced_cin_with_repeat(self):
+        self.bench("--repeat", "--min-time", "0.01")
+
+
+if __name__ == "__main__":
+    unittest.main()